@@ -1,13 +1,55 @@
 from __future__ import annotations
+import asyncio
 import logging
+import time
+from collections import deque
+from collections.abc import Callable
 from datetime import timedelta
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform, CONF_HOST, CONF_PORT, CONF_TIMEOUT
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.exceptions import ConfigEntryNotReady
-from .avalon_api import AsyncAvalonAPI
-from .const import DOMAIN, CONF_UPDATE_INTERVAL
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from .avalon_api import AsyncAvalonAPI, BATCH_COMMANDS, DERIVED_COMMANDS, forget_host
+from .const import (
+    DOMAIN,
+    CONF_CHANGE_DRIVEN_UPDATES,
+    CONF_COMMAND_INTERVAL,
+    CONF_HISTORY_WINDOW,
+    CONF_HOSTS,
+    CONF_MAX_CONCURRENT,
+    CONF_MODE,
+    CONF_PROXY_BIND,
+    CONF_PROXY_MAX_AGE,
+    CONF_PROXY_PORT,
+    CONF_UPDATE_INTERVAL,
+    CONF_WEB_PASSWORD,
+    CONTROL_SECTIONS,
+    DEFAULT_CHANGE_DRIVEN_UPDATES,
+    DEFAULT_COMMAND_INTERVALS,
+    DEFAULT_HISTORY_WINDOW,
+    DEFAULT_HUB_HISTORY_WINDOW,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_PORT,
+    DEFAULT_PROXY_BIND,
+    DEFAULT_PROXY_MAX_AGE,
+    DEFAULT_PROXY_PORT,
+    DEFAULT_TIMEOUT,
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_WEB_PASSWORD,
+    DERIVED_SECTIONS,
+    MODE_HUB,
+)
+from .derived import DerivedMetrics
+from .exporter import async_register_exporter
+from .fleet import FleetScheduler, expand_hosts
+from .metrics import HISTOGRAM_SIZE, RollingHistogram
+from .proxy import CGMinerProxy
+from .services import async_register_services
+from .timeseries import TimeSeries
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,26 +65,267 @@ PLATFORMS: list[Platform] = [
 class AvalonMinerCoordinator(DataUpdateCoordinator[dict]):
     """Data coordinator für Avalon Nano 3S"""
 
-    def __init__(self, hass: HomeAssistant, api: AsyncAvalonAPI, update_interval: timedelta) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: AsyncAvalonAPI,
+        update_interval: timedelta,
+        command_intervals: dict[str, int] | None = None,
+        change_driven: bool = DEFAULT_CHANGE_DRIVEN_UPDATES,
+        unique_prefix: str | None = None,
+        use_timer: bool = True,
+        history_window: int = 0,
+    ) -> None:
         super().__init__(
             hass,
             _LOGGER,
-            name="Avalon Nano 3S",
-            update_interval=update_interval,
+            config_entry=entry,
+            name=f"Avalon Nano 3S {api.host}" if unique_prefix else "Avalon Nano 3S",
+            # Im Hub-Modus ruft der gemeinsame FleetScheduler async_refresh auf
+            update_interval=update_interval if use_timer else None,
         )
         self.api = api
+        # Präfix der unique_ids dieses Miners (Hub: "<entry_id>_<host>")
+        self.unique_prefix = unique_prefix or entry.entry_id
+        # Sections mit mindestens einer aktiven Entity (None = noch nicht geplant -> alle)
+        self.wanted_sections: set[str] | None = None
+        # Sekunden je Befehl, 0 = nur beim Start / nach Reboot
+        self.command_intervals = {**DEFAULT_COMMAND_INTERVALS, **(command_intervals or {})}
+        # estats kommt aus der stats-Antwort, ein eigenes stats-Intervall hätte keine Wirkung
+        self.command_intervals["stats"] = self.command_intervals["estats"]
+        # Ein Poll darf nie länger dauern als das Intervall
+        self.poll_deadline = update_interval.total_seconds()
+        # Section -> Loop-Zeit des letzten erfolgreichen Abrufs
+        self._section_updated: dict[str, float] = {}
+        # Sections, die im letzten Poll nicht fertig wurden -> Alter in s (None = nie geladen)
+        self.stale_sections: dict[str, float | None] = {}
+        # Befehle, die im nächsten Tick unabhängig vom Intervall geholt werden (z.B. nach Reboot)
+        self._forced: set[str] = set()
+        # Sections, die sich im letzten Poll geändert haben (Inhalt oder stale-Status);
+        # Entities anderer Sections müssen ihren State nicht neu schreiben
+        self.changed_sections: set[str] = set(BATCH_COMMANDS)
+        # Entities registrieren ihren Pfad in data als Kontext, z.B. ("summary", "SUMMARY", "MHS av").
+        # Nach einem Poll werden nur Kontexte benachrichtigt, unter denen sich etwas geändert hat.
+        self.change_driven = change_driven
+        # Pfade mit geänderten Werten (exakt) / Pfade, unter denen alles neu ist (Präfix); None = alle
+        self._changed_paths: set[tuple] | None = None
+        self._changed_roots: set[tuple] = set()
+        # Steuer-Entity -> Ergebnis der letzten Rücklesung (verified, latency)
+        self.read_backs: dict[str, dict] = {}
+        # Poll und Rücklesung nacheinander: sonst überschreibt ein vorher gestarteter Poll
+        # die gerade bestätigte Section mit älteren Daten
+        self._fetch_lock = asyncio.Lock()
+        # Dauer erfolgreicher Polls / Erfolg der letzten Polls (für p95 und Fehlerquote)
+        self.poll_latency = RollingHistogram()
+        self._poll_results: deque[bool] = deque(maxlen=HISTOGRAM_SIZE)
+        # Verlauf (Hashrate, Temperaturen, Lüfter, Leistung, Shares) im Speicher, None = aus
+        self.history = TimeSeries(history_window, self.poll_deadline) if history_window else None
+        # Effizienz, effektive Hashrate, Reject-/Stale-Rate, Uptime (EWMA je Poll)
+        self.derived = DerivedMetrics()
+
+    def poll_failure_rate(self) -> float | None:
+        """Anteil fehlgeschlagener Polls (%) über die letzten Polls"""
+        results = self._poll_results
+        return round(100 * results.count(False) / len(results), 1) if results else None
+
+    def poll_stats(self) -> dict:
+        """Poll-Latenz (ms) und Fehlerquote (%) über die letzten Polls"""
+        return {
+            "latency_ms": self.poll_latency.summary(1000),
+            "polls": len(self._poll_results),
+            "failure_rate": self.poll_failure_rate(),
+        }
+
+    def _due_commands(self, now: float) -> list[str]:
+        """Befehle, deren Intervall in diesem Tick abläuft"""
+        # halber Tick Toleranz, damit z.B. 60 s bei 10 s Ticks nicht auf 70 s rutschen
+        slack = self.poll_deadline / 2
+        due = []
+        for cmd in BATCH_COMMANDS:
+            if self.wanted_sections is not None and cmd not in self.wanted_sections:
+                continue
+            last = self._section_updated.get(cmd)
+            interval = self.command_intervals.get(cmd, 0)
+            if (
+                last is None
+                or cmd in self._forced
+                or (interval > 0 and now - last + slack >= interval)
+            ):
+                due.append(cmd)
+        # Die Quelle abgeleiteter Befehle (stats für estats) kommt ohne eigenen Round-Trip mit
+        for cmd, source in DERIVED_COMMANDS.items():
+            if cmd in due and source not in due and (
+                self.wanted_sections is None or source in self.wanted_sections
+            ):
+                due.append(source)
+        return due
+
+    @callback
+    def async_plan_commands(self) -> None:
+        """Aus der Entity-Registry ableiten, welche Sections noch gebraucht werden.
+
+        Hat der Miner noch keine Entities in der Registry (z.B. im Hub beim
+        ersten Start offline), wird alles gepollt: erst die Daten des ersten
+        Polls legen die Entities an. summary bleibt immer im Plan, sonst
+        würde ein Neustart des Miners (``_check_reboot``) nicht erkannt.
+        """
+        registry = er.async_get(self.hass)
+        prefix = f"{self.unique_prefix}_"
+        wanted: set[str] | None = {"summary"}
+        registered = False
+        for reg_entry in er.async_entries_for_config_entry(registry, self.config_entry.entry_id):
+            if not reg_entry.unique_id.startswith(prefix):
+                continue
+            registered = True
+            if reg_entry.disabled_by is not None:
+                continue
+            suffix = reg_entry.unique_id[len(prefix):]
+            if suffix in DERIVED_SECTIONS:
+                wanted.update(DERIVED_SECTIONS[suffix])
+                continue
+            section = CONTROL_SECTIONS.get(suffix)
+            if section is None:
+                # Sensoren: "<entry_id>_<api_type>_<section>_<key>"
+                section = next((cmd for cmd in BATCH_COMMANDS if suffix.startswith(f"{cmd}_")), None)
+            if section is not None:
+                wanted.add(section)
+        if not registered:
+            wanted = None
+
+        if wanted != self.wanted_sections:
+            _LOGGER.debug("Polling sections: %s", ", ".join(sorted(wanted)) if wanted is not None else "all")
+            # Neu benötigte Sections sofort im nächsten Tick holen
+            if self.wanted_sections is not None and wanted is not None:
+                self._forced.update(wanted - self.wanted_sections)
+            self.wanted_sections = wanted
+
+    def _diff(self, old: dict, new: dict, changed: set[str], stale: set[str]) -> None:
+        """Geänderte Pfade zwischen zwei Snapshots für async_update_listeners bestimmen"""
+        paths: set[tuple] = set()
+        roots: set[tuple] = {(cmd,) for cmd in stale}
+        for cmd in changed - stale:
+            old_cmd, new_cmd = old.get(cmd) or {}, new.get(cmd) or {}
+            paths.add((cmd,))
+            for section in old_cmd.keys() | new_cmd.keys():
+                old_sec, new_sec = old_cmd.get(section), new_cmd.get(section)
+                if old_sec == new_sec:
+                    continue
+                paths.add((cmd, section))
+                if not (isinstance(old_sec, dict) and isinstance(new_sec, dict)):
+                    roots.add((cmd, section))
+                    continue
+                for key in old_sec.keys() | new_sec.keys():
+                    if old_sec.get(key) != new_sec.get(key):
+                        paths.add((cmd, section, key))
+        self._changed_paths = paths
+        self._changed_roots = roots
+
+    def _context_changed(self, context: tuple) -> bool:
+        if context in self._changed_paths:
+            return True
+        return any(context[:depth] in self._changed_roots for depth in range(1, len(context) + 1))
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Nur Entities benachrichtigen, deren Daten sich geändert haben (siehe _diff)"""
+        if self._changed_paths is None or not self.last_update_success:
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            # Entities ohne Kontext (Buttons) lesen keine Daten
+            if context is not None and self._context_changed(context):
+                update_callback()
+
+    def _check_reboot(self, old: dict, new: dict) -> None:
+        """Elapsed läuft rückwärts -> Miner neu gestartet, alles neu holen"""
+        try:
+            old_elapsed = old["summary"]["SUMMARY"]["Elapsed"]
+            new_elapsed = new["summary"]["SUMMARY"]["Elapsed"]
+        except (KeyError, TypeError):
+            return
+        if isinstance(old_elapsed, int) and isinstance(new_elapsed, int) and new_elapsed < old_elapsed:
+            _LOGGER.debug("Elapsed reset (%s -> %s), refetching all sections", old_elapsed, new_elapsed)
+            self._forced.update(BATCH_COMMANDS)
+
+    async def _async_read_section(self, section: str, control: str) -> dict | None:
+        """Eine Section lesen und in ``data`` übernehmen; None, wenn sie nicht kam"""
+        loop = asyncio.get_running_loop()
+        try:
+            fresh = await self.api.batch([section], deadline=loop.time() + self.poll_deadline)
+        except Exception as err:
+            _LOGGER.debug("Read-back of %s for %s failed: %s", section, control, err)
+            return None
+        if section not in fresh:
+            return None
+
+        now = loop.time()
+        old = self.data or {}
+        data = {**old, **fresh}
+        changed = {cmd for cmd, parsed in fresh.items() if parsed is not old.get(cmd)}
+        # war die Section stale, ändern sich auch die Poll-Attribute
+        stale = {cmd for cmd in fresh if cmd in self.stale_sections}
+        self.stale_sections = {cmd: age for cmd, age in self.stale_sections.items() if cmd not in fresh}
+        for cmd in fresh:
+            self._section_updated[cmd] = now
+        if self.last_update_success and self.change_driven:
+            self.changed_sections = changed | stale
+            self._diff(old, data, changed | stale, stale)
+        else:
+            self.changed_sections = set(BATCH_COMMANDS)
+            self._changed_paths = None
+        self.async_set_updated_data(data)
+        return data
+
+    async def async_read_back(
+        self,
+        control: str,
+        verify: Callable[[dict], bool] | None = None,
+        started: float | None = None,
+    ) -> bool:
+        """Nach einem Steuerbefehl nur die Section des Controls neu lesen (statt Full-Refresh).
+
+        Die Section wird in ``data`` übernommen und nur betroffene Entities
+        benachrichtigt. ``verify`` prüft auf den neuen Daten, ob der Befehl
+        gegriffen hat (ohne: erfolgreiches Lesen genügt). Ergebnis und Latenz
+        seit ``started`` (Loop-Zeit, Standard: jetzt) landen in ``read_backs``.
+        Ein laufender Poll wird vorher abgewartet, damit er das Ergebnis nicht
+        mit älteren Daten überschreibt.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time() if started is None else started
+        section = CONTROL_SECTIONS[control]
+        async with self._fetch_lock:
+            data = await self._async_read_section(section, control)
+
+        verified = False
+        if data is not None:
+            try:
+                verified = verify(data) if verify is not None else True
+            except (KeyError, TypeError, ValueError, AttributeError):
+                verified = False
+
+        latency = round(loop.time() - started, 3)
+        self.read_backs[control] = {"verified": verified, "confirm_latency": latency}
+        _LOGGER.debug("Read-back %s (%s): verified=%s after %.3fs", control, section, verified, latency)
+        return verified
 
     async def _async_update_data(self) -> dict | None:
         """Fetch data from API – minimales Logging, HA-konform"""
+        # Läuft gerade eine Rücklesung, erst danach pollen (und auf deren Daten aufsetzen)
+        async with self._fetch_lock:
+            return await self._async_poll()
+
+    async def _async_poll(self) -> dict | None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        due = self._due_commands(start)
         try:
-            return {
-                "version": await self.api.version(),
-                "summary": await self.api.summary(),
-                "stats": await self.api.stats(),
-                "estats": await self.api.estats(),
-                "devs": await self.api.devs(),
-                "pools": await self.api.pools(),
-            }
+            # Ein Round-Trip für alle fälligen Sections (Fallback auf Einzel-Requests in der API)
+            fresh = await self.api.batch(
+                due,
+                deadline=loop.time() + self.poll_deadline,
+            )
         except Exception as err:
             # Danach nur debug (kein Spam)
             if self.last_update_success:
@@ -50,10 +333,233 @@ class AvalonMinerCoordinator(DataUpdateCoordinator[dict]):
             else:
                 _LOGGER.debug("Update failed: %s", err)
 
+            self._poll_results.append(False)
             raise UpdateFailed(err) from err
 
+        # Teilergebnis: fertige Sections übernehmen, den Rest mit Alter als stale markieren
+        now = loop.time()
+        self._poll_results.append(True)
+        self.poll_latency.add(now - start)
+        old = self.data or {}
+        data = dict(old)
+        # Die API liefert für unveränderte Antworten dasselbe Objekt wie zuvor
+        changed = {cmd for cmd, parsed in fresh.items() if parsed is not old.get(cmd)}
+        for cmd, parsed in fresh.items():
+            data[cmd] = parsed
+            self._section_updated[cmd] = now
+        self._forced.difference_update(fresh)
+
+        previous_stale = self.stale_sections
+        self.stale_sections = {
+            cmd: (round(now - self._section_updated[cmd], 1) if cmd in self._section_updated else None)
+            for cmd in due
+            if cmd not in fresh
+        }
+        stale_changed = set(previous_stale) | set(self.stale_sections)
+        changed |= stale_changed
+        # Nach einem Fehler (Entities waren unavailable) alles neu schreiben
+        if self.last_update_success and self.change_driven:
+            self.changed_sections = changed
+            self._diff(old, data, changed, stale_changed)
+        else:
+            self.changed_sections = set(BATCH_COMMANDS)
+            self._changed_paths = None
+        # Diagnose-Sensoren (Verbindung, Poll-Latenz, Fehlerquote), abgeleitete Werte und Verlauf ändern sich mit jedem Poll
+        self._changed_roots.add(("connection",))
+        self._changed_roots.add(("metrics",))
+        self.derived.update(now, data, fresh)
+        self._changed_roots.add(("derived",))
+        if self.history is not None:
+            self.history.record(time.time(), data, fresh)
+            self._changed_roots.add(("history",))
+        if self.stale_sections:
+            _LOGGER.debug("Poll deadline hit, stale sections: %s", self.stale_sections)
+
+        if "summary" in fresh:
+            self._check_reboot(old, data)
+
+        return data
+
+
+def entry_miners(hass: HomeAssistant, entry: ConfigEntry) -> list[dict]:
+    """Miner eines Entries (je api, coordinator, device_info, unique_prefix): einer oder alle Hosts des Hubs"""
+    data = hass.data[DOMAIN][entry.entry_id]
+    return list(data["miners"].values()) if "miners" in data else [data]
+
+
+@callback
+def async_add_miner_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    create: Callable[[dict], list[Entity]],
+) -> None:
+    """Entities je Miner anlegen.
+
+    Miner ohne Daten (im Hub beim Start nicht erreichbar) bekommen ihre
+    Entities, sobald der erste Poll erfolgreich war.
+    """
+    for miner in entry_miners(hass, entry):
+        coordinator: AvalonMinerCoordinator = miner["coordinator"]
+        if coordinator.data:
+            async_add_entities(create(miner))
+            continue
+
+        def _wait_for_data(miner: dict = miner, coordinator: AvalonMinerCoordinator = coordinator) -> None:
+            @callback
+            def _first_data() -> None:
+                if coordinator.data:
+                    unsub()
+                    async_add_entities(create(miner))
+
+            unsub = coordinator.async_add_listener(_first_data)
+            entry.async_on_unload(unsub)
+
+        _wait_for_data()
+
+
+def _command_intervals(entry: ConfigEntry) -> dict[str, int]:
+    return {
+        cmd: entry.options[CONF_COMMAND_INTERVAL.format(cmd)]
+        for cmd in DEFAULT_COMMAND_INTERVALS
+        if CONF_COMMAND_INTERVAL.format(cmd) in entry.options
+    }
+
+
+@callback
+def _async_track_registry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Benötigte Sections aus der Entity-Registry ableiten und bei Änderungen neu planen"""
+    coordinators = [miner["coordinator"] for miner in entry_miners(hass, entry)]
+    for coordinator in coordinators:
+        coordinator.async_plan_commands()
+
+    @callback
+    def _async_registry_updated(event: Event) -> None:
+        if event.data["action"] == "update" and "disabled_by" not in event.data.get("changes", {}):
+            return
+        for coordinator in coordinators:
+            coordinator.async_plan_commands()
+
+    entry.async_on_unload(
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, _async_registry_updated)
+    )
+
+
+async def _async_start_proxies(hass: HomeAssistant, entry: ConfigEntry, miners: list[dict]) -> None:
+    """Optionaler CGMiner-Proxy je Miner (Hub: Port + Index des Hosts); Port belegt -> nur Fehler im Log"""
+    port = entry.options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT)
+    if not port:
+        return
+    bind = entry.options.get(CONF_PROXY_BIND, DEFAULT_PROXY_BIND)
+    max_age = entry.options.get(CONF_PROXY_MAX_AGE, DEFAULT_PROXY_MAX_AGE)
+    for index, miner in enumerate(miners):
+        coordinator: AvalonMinerCoordinator = miner["coordinator"]
+
+        @callback
+        def _on_write(coordinator: AvalonMinerCoordinator = coordinator) -> None:
+            # Steuerbefehl eines anderen Tools -> HA-Zustand nachziehen
+            hass.async_create_task(coordinator.async_request_refresh())
+
+        proxy = CGMinerProxy(miner["api"], max_age, _on_write)
+        try:
+            await proxy.start(bind, port + index)
+        except OSError as err:
+            _LOGGER.error("Cannot start API proxy for %s on %s:%s: %s", miner["api"].host, bind, port + index, err)
+            continue
+        miner["proxy"] = proxy
+        entry.async_on_unload(proxy.close)
+
+
+async def _async_setup_hub(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Hub-Modus: viele Miner in einem Entry, gepollt von einem gemeinsamen FleetScheduler"""
+    config = {**entry.data, **entry.options}
+    try:
+        hosts = expand_hosts(config[CONF_HOSTS])
+    except ValueError as err:
+        _LOGGER.error("Invalid host list: %s", err)
+        return False
+
+    interval = config.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    scheduler = FleetScheduler(interval, config.get(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT))
+    command_intervals = _command_intervals(entry)
+    change_driven = entry.options.get(CONF_CHANGE_DRIVEN_UPDATES, DEFAULT_CHANGE_DRIVEN_UPDATES)
+
+    hub_identifier = (DOMAIN, f"hub_{entry.entry_id}")
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={hub_identifier},
+        name=entry.title,
+        manufacturer="Canaan",
+        model="Nano 3S Fleet",
+    )
+
+    miners: dict[str, dict] = {}
+    for host in hosts:
+        api = AsyncAvalonAPI(
+            host,
+            config.get(CONF_PORT, DEFAULT_PORT),
+            config.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+            web_password=config.get(CONF_WEB_PASSWORD, DEFAULT_WEB_PASSWORD),
+        )
+        unique_prefix = f"{entry.entry_id}_{host}"
+        coordinator = AvalonMinerCoordinator(
+            hass,
+            entry,
+            api,
+            timedelta(seconds=interval),
+            command_intervals,
+            change_driven,
+            unique_prefix=unique_prefix,
+            use_timer=False,
+            history_window=entry.options.get(CONF_HISTORY_WINDOW, DEFAULT_HUB_HISTORY_WINDOW),
+        )
+        miners[host] = {
+            "api": api,
+            "coordinator": coordinator,
+            "unique_prefix": unique_prefix,
+            "device_info": {
+                "identifiers": {(DOMAIN, host)},
+                "name": f"Avalon Nano 3S {host}",
+                "manufacturer": "Canaan",
+                "model": "Nano 3S",
+                "via_device": hub_identifier,
+            },
+        }
+        scheduler.add(host, coordinator.async_refresh)
+
+    # Erste Runde für alle Miner (mit globalem Limit), damit die Plattformen Entities anlegen können
+    limit = asyncio.Semaphore(scheduler.max_concurrent)
+
+    async def _first_refresh(coordinator: AvalonMinerCoordinator) -> None:
+        async with limit:
+            await coordinator.async_refresh()
+
+    await asyncio.gather(*(_first_refresh(miner["coordinator"]) for miner in miners.values()))
+    if not any(miner["coordinator"].data for miner in miners.values()):
+        raise ConfigEntryNotReady(f"None of {len(miners)} miners answered")
+
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        "miners": miners,
+        "scheduler": scheduler,
+        "hub_device_info": {"identifiers": {hub_identifier}},
+    }
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    _async_track_registry(hass, entry)
+    await _async_start_proxies(hass, entry, list(miners.values()))
+
+    entry.async_create_background_task(hass, scheduler.async_run(), f"{DOMAIN} fleet scheduler")
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    # OpenMetrics-Endpunkt für alle Miner (aus den Snapshots, ohne eigene Anfragen)
+    async_register_exporter(hass)
+    async_register_services(hass)
+
+    if entry.data.get(CONF_MODE) == MODE_HUB:
+        return await _async_setup_hub(hass, entry)
+
     update_interval_sec = entry.options.get(
         CONF_UPDATE_INTERVAL,
         entry.data.get(CONF_UPDATE_INTERVAL, 10),
@@ -67,8 +573,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     coordinator = AvalonMinerCoordinator(
         hass,
+        entry,
         api,
         timedelta(seconds=update_interval_sec),
+        _command_intervals(entry),
+        entry.options.get(CONF_CHANGE_DRIVEN_UPDATES, DEFAULT_CHANGE_DRIVEN_UPDATES),
+        history_window=entry.options.get(CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW),
     )
 
     try:
@@ -88,14 +598,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "api": api,
         "coordinator": coordinator,
         "device_info": device_info,
+        "unique_prefix": entry.entry_id,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Erst jetzt stehen alle Entities in der Registry -> nur noch Benötigtes pollen
+    _async_track_registry(hass, entry)
+    await _async_start_proxies(hass, entry, [hass.data[DOMAIN][entry.entry_id]])
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
+        miners = entry_miners(hass, entry)
         hass.data[DOMAIN].pop(entry.entry_id)
+        # Queues, Breaker, Messwerte und Antwort-Cache des Hosts freigeben,
+        # außer ein anderer Entry fragt denselben Miner noch ab
+        in_use = {
+            (miner["api"].host, miner["api"].port)
+            for other in hass.config_entries.async_entries(DOMAIN)
+            if other.entry_id in hass.data[DOMAIN]
+            for miner in entry_miners(hass, other)
+        }
+        for miner in miners:
+            key = (miner["api"].host, miner["api"].port)
+            if key not in in_use:
+                forget_host(*key)
     return unload_ok
@@ -1,12 +1,548 @@
 from __future__ import annotations
 import asyncio
+import contextlib
+import heapq
+import json
 import re
 import logging
-from typing import Dict, Any, Optional
-from .const import DEFAULT_PORT, DEFAULT_TIMEOUT, DEFAULT_WEB_USER, DEFAULT_WEB_PASSWORD
+import random
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .const import (
+    BREAKER_BASE_BACKOFF,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_JITTER,
+    BREAKER_MAX_BACKOFF,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_PORT,
+    DEFAULT_TIMEOUT,
+    DEFAULT_TRANSPORT,
+    DEFAULT_WEB_USER,
+    DEFAULT_WEB_PASSWORD,
+    TOTAL_TIMEOUT_FACTOR,
+    TRANSPORT_AUTO,
+    TRANSPORT_JSON,
+    TRANSPORT_TEXT,
+)
+from .metrics import HostMetrics
 
 _LOGGER = logging.getLogger(__name__)
 
+# Lese-Befehle, die die Plattformen nutzen und die gebündelt werden dürfen
+BATCH_COMMANDS = ("version", "summary", "stats", "estats", "devs", "pools")
+# Befehl -> Befehl, aus dessen Antwort er abgeleitet wird (kein eigener Round-Trip):
+# estats liefert denselben MM-ID-Block wie stats
+DERIVED_COMMANDS = {"estats": "stats"}
+
+# Antwort-Ende laut CGMiner-API und Obergrenze für eine Antwort
+RESPONSE_TERMINATOR = b"\x00"
+MAX_RESPONSE_SIZE = 256 * 1024
+
+# Beginn einer Einzelantwort innerhalb einer gejointen Antwort
+_STATUS_START = re.compile(r"(?:^|(?<=\|))STATUS=")
+
+# (host, port) -> versteht die Firmware gejointe Befehle ("summary+stats")?
+_JOIN_SUPPORT: Dict[Tuple[str, int], bool] = {}
+# (host, port) -> antwortet die Firmware auf {"command": ...} mit JSON?
+_JSON_SUPPORT: Dict[Tuple[str, int], bool] = {}
+# (host, port) -> CircuitBreaker, gemeinsam für alle API-Instanzen eines Miners
+_BREAKERS: Dict[Tuple[str, int], "CircuitBreaker"] = {}
+# (host, port) -> HostQueue: alle Verbindungen zu einem Miner laufen über eine Warteschlange
+_HOST_QUEUES: Dict[Tuple[str, int], "HostQueue"] = {}
+# (host, port) -> Messwerte je Befehl (Latenzen, Größe, Parse-Zeit, Fehler)
+_METRICS: Dict[Tuple[str, int], HostMetrics] = {}
+
+# Prioritäten der Host-Warteschlange (kleiner = früher): Steuerbefehle,
+# schnelle Telemetrie, langsame Metadaten
+PRIORITY_CONTROL = 0
+PRIORITY_FAST = 1
+PRIORITY_SLOW = 2
+_COMMAND_PRIORITY = {"summary": PRIORITY_FAST, "stats": PRIORITY_FAST, "estats": PRIORITY_FAST}
+
+# "Key[Wert]"-Felder im MM-ID-Block der stats-Antwort ("Temp[45] Fan1[1200] ...")
+_MM_FIELD = re.compile(r"(\w+)\[([^\]]*)\]")
+_TEMPERATURE_KEYS = frozenset({"ITemp", "OTemp", "TMax", "TAvg", "TarT", "MTmax", "MTavg"})
+
+# (host, port, cmd) -> (Hash der Antwort ohne STATUS-Block, geparste Struktur); LRU über alle Miner.
+# Aufgenommen wird eine Antwort erst, wenn sie sich einmal wiederholt hat: summary/stats ändern
+# sich mit jedem Poll und würden sonst pools/devs/version einer großen Flotte verdrängen.
+_REPLY_CACHE: "OrderedDict[Tuple[str, int, str], Tuple[int, Dict[str, Any]]]" = OrderedDict()
+REPLY_CACHE_SIZE = 2048
+# (host, port, cmd) -> Hash der letzten Antwort (nur int, entscheidet über die Aufnahme in _REPLY_CACHE)
+_REPLY_DIGESTS: Dict[Tuple[str, int, str], int] = {}
+
+# Bekannter CGMiner-Fehler: fehlendes Komma zwischen Objekten in STATS-Listen
+_JSON_MISSING_COMMA = re.compile(r"\}\s*\{")
+
+# Zahlen wie CGMiner sie ausgibt: "12", "-3", "1.50", "1.5e+05"; Exponent nur mit Punkt,
+# damit Hex-Strings wie DNA "0132e5" Text bleiben
+_NUMBER = re.compile(r"([+-]?\d+)|[+-]?(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+# CGMiner escapet , | = und \ im Textmodus mit Backslash -> vor dem Splitten durch
+# Platzhalter ersetzen und erst in Keys/Werten wiederherstellen
+_ESCAPES = {",": "\x01", "|": "\x02", "=": "\x03"}
+_UNESCAPE = (("\x01", ","), ("\x02", "|"), ("\x03", "="), ("\x04", "\\"))
+
+# Erstes Zeichen, ab dem ein Wert überhaupt eine Zahl sein kann
+_NUMERIC_START = frozenset("+-.0123456789")
+
+# Obergrenze gemerkter Sections pro Host
+_MAX_SECTIONS = 64
+
+
+def _mask_escapes(data: str) -> str:
+    """Escapete Zeichen (``\\,`` ``\\|`` ``\\=`` ``\\\\``) durch Platzhalter ersetzen.
+
+    Ein Durchgang über die Stücke zwischen den Backslashes statt eines
+    ``replace`` je Escape über die ganze Antwort.
+    """
+    pieces = data.split("\\")
+    out = [pieces[0]]
+    index, count = 1, len(pieces)
+    while index < count:
+        piece = pieces[index]
+        if not piece:
+            if index + 1 == count:
+                # einzelner Backslash am Ende bleibt stehen
+                out.append("\\")
+                break
+            # escapeter Backslash: das Stück danach folgt direkt
+            out.append("\x04")
+            out.append(pieces[index + 1])
+            index += 2
+            continue
+        placeholder = _ESCAPES.get(piece[0])
+        out.append(placeholder + piece[1:] if placeholder else "\\" + piece)
+        index += 1
+    return "".join(out)
+
+
+def _unescape(text: str) -> str:
+    """Platzhalter aus ``_mask_escapes`` zurückwandeln (nur die, die vorkommen)"""
+    for placeholder, char in _UNESCAPE:
+        if placeholder in text:
+            text = text.replace(placeholder, char)
+    return text
+
+
+def _coerce(value: str) -> Any:
+    """'12' / '-3' -> int, '1.50' / '-1.5' / '1.5e+05' -> float, sonst unverändert (Wert bereits gestrippt)"""
+    first = value[:1]
+    if first not in _NUMERIC_START:
+        return value
+    if first.isdecimal():
+        if value.isdecimal():
+            return int(value)
+        if "." not in value:
+            # Hex-IDs, "25061101_97e23a6"
+            return value
+        if value.replace(".", "", 1).isdecimal():
+            return float(value)
+        if "e" not in value and "E" not in value:
+            # Versionen wie "4.11.1"
+            return value
+    match = _NUMBER.fullmatch(value)
+    if match is None:
+        return value
+    return int(value) if match.group(1) is not None else float(value)
+
+
+class _SectionCache:
+    """Gemerktes Layout einer Section (Schlüssel: erstes Token, z.B. "SUMMARY" oder "POOL=0").
+
+    Der erste Poll zerlegt die Section in einem Durchgang (langsamer Pfad).
+    Ab dem zweiten Poll geht es positionsweise mit internierten Keys (schneller
+    Pfad): unveränderte Tokens kosten einen String-Vergleich, bei geänderten
+    wird nur der Präfix ``key=`` der Position geprüft und der Wert
+    umgewandelt. Ändert sich das Layout (andere Token-Anzahl, anderer Key),
+    läuft die Section wieder über den langsamen Pfad.
+
+    Das gelieferte Dict wird nie nachträglich verändert (jeder Poll baut ein
+    neues) und darf auch vom Aufrufer nicht verändert werden.
+    """
+
+    __slots__ = ("part", "name", "tokens", "layout", "values")
+
+    def __init__(self) -> None:
+        self.part: Optional[str] = None
+        self.name: Optional[str] = None
+        self.tokens: List[str] = []
+        # je Position ("key=" wie im Token, dessen Länge, internierter Key); ("\x00", 0, None)
+        # für Tokens ohne "="; erst beim ersten schnellen Pfad aus den Tokens gebaut
+        self.layout: Optional[List[Tuple[str, int, Optional[str]]]] = None
+        self.values: Dict[str, Any] = {}
+
+    def parse(self, part: str, is_status: bool, escaped: bool) -> Tuple[Optional[str], Dict[str, Any]]:
+        if part != self.part:
+            tokens = part.split(",")
+            if len(tokens) != len(self.tokens) or not self._fast(tokens, escaped):
+                self._slow(tokens, is_status, escaped)
+            self.part = part
+        return self.name, self.values
+
+    def _build_layout(self) -> List[Tuple[str, int, Optional[str]]]:
+        """Layout aus den Tokens des letzten Polls; leer, wenn ein Key doppelt vorkommt"""
+        layout = []
+        for token in self.tokens:
+            prefix, sep, _ = token.partition("=")
+            if not sep:
+                layout.append(("\x00", 0, None))
+                continue
+            layout.append((prefix + sep, len(prefix) + 1, sys.intern(_unescape(prefix).strip())))
+        # doppelte Keys: positionsweises Überschreiben wäre falsch -> immer langsamer Pfad
+        keys = [key for _, _, key in layout if key is not None]
+        if len(set(keys)) != len(keys):
+            return []
+        # ab jetzt bleibt die Section über Polls (und Miner) bei denselben internierten Keys
+        self.values = {sys.intern(key): value for key, value in self.values.items()}
+        return layout
+
+    def _fast(self, tokens: List[str], escaped: bool) -> bool:
+        layout = self.layout
+        if layout is None:
+            layout = self.layout = self._build_layout()
+        if not layout:
+            return False
+        values = dict(self.values)
+        for token, before, (prefix, size, key) in zip(tokens, self.tokens, layout):
+            if token == before:
+                continue
+            # Tokens ohne "=" (Section-Name) ändern sich nicht; sonst gilt das Layout nicht mehr
+            if not token.startswith(prefix):
+                return False
+            value = token[size:]
+            if value.isdecimal():
+                values[key] = int(value)
+            elif value.replace(".", "", 1).isdecimal():
+                values[key] = float(value)
+            else:
+                if escaped and not value.isprintable():
+                    value = _unescape(value)
+                values[key] = _coerce(value.strip())
+        self.tokens, self.values = tokens, values
+        return True
+
+    def _slow(self, tokens: List[str], is_status: bool, escaped: bool) -> None:
+        values: Dict[str, Any] = {}
+        name: Optional[str] = "STATUS" if is_status else None
+        rest = tokens
+        if not is_status:
+            first_key, sep, first_val = tokens[0].partition("=")
+            if not sep:
+                name = tokens[0].strip()
+            elif first_key == "POOL":
+                # POOL-Nummer bleibt wie bisher Text
+                name = "POOL"
+                values["POOL"] = _unescape(first_val).strip()
+                rest = tokens[1:]
+
+        for token in rest:
+            key, sep, value = token.partition("=")
+            if not sep:
+                continue
+            if escaped and not token.isprintable():
+                # Platzhalter escapeter Zeichen zurückwandeln
+                key, value = _unescape(key), _unescape(value)
+            key = key.strip()
+            if value.isdecimal():
+                values[key] = int(value)
+            elif value.replace(".", "", 1).isdecimal():
+                values[key] = float(value)
+            else:
+                values[key] = _coerce(value.strip())
+
+        if not name and values:
+            name = next(iter(values))
+        self.name, self.tokens, self.values, self.layout = name, tokens, values, None
+
+
+def _parse_text(data: Optional[str], caches: Dict[str, _SectionCache]) -> Dict[str, Any]:
+    """Parser für CGMiner-Textantworten (``STATUS=...|SECTION,key=val,...|``).
+
+    Je Section wird das Layout in ``caches`` gemerkt (siehe
+    ``_SectionCache``): folgende Polls parsen positionsweise nur noch
+    geänderte Tokens und verwenden die internierten Keys wieder. Zahlen inkl. negativer Werte
+    und Exponent werden erkannt, escapete Trennzeichen (``\\,``) bleiben
+    im Wert.
+    """
+    if not data or "|" not in data:
+        return {}
+    sections: Dict[str, Any] = {}
+
+    unescape = "\\" in data
+    if unescape:
+        data = _mask_escapes(data)
+
+    for index, part in enumerate(data.split("|")):
+        part = part.strip()
+        if not part:
+            continue
+        if index:
+            comma = part.find(",")
+            header = part[:comma] if comma >= 0 else part
+        else:
+            # STATUS-Block (S oder E, gleiches Layout) getrennt merken; "|" kommt in keinem Teil vor
+            header = "|"
+        cache = caches.get(header)
+        if cache is None:
+            if len(caches) >= _MAX_SECTIONS:
+                caches.clear()
+            cache = caches[header] = _SectionCache()
+        escaped = unescape and ("\x01" in part or "\x02" in part or "\x03" in part or "\x04" in part)
+        section_name, values = cache.parse(part, index == 0, escaped)
+
+        if not section_name:
+            continue
+        if section_name in sections:
+            if isinstance(sections[section_name], list):
+                sections[section_name].append(values)
+            else:
+                sections[section_name] = [sections[section_name], values]
+        else:
+            sections[section_name] = values
+    return sections
+
+
+def _decode_json(raw: str) -> Optional[Dict[str, Any]]:
+    """JSON-Antwort dekodieren; None, wenn die Firmware Text geantwortet hat"""
+    if not raw.startswith("{"):
+        return None
+    try:
+        reply = json.loads(raw, strict=False)
+    except ValueError:
+        try:
+            reply = json.loads(_JSON_MISSING_COMMA.sub("},{", raw), strict=False)
+        except ValueError:
+            return None
+    return reply if isinstance(reply, dict) else None
+
+
+def _reply_body(raw: str) -> str:
+    """Antwort ohne STATUS-Block - dessen "When" ändert sich jede Sekunde"""
+    if raw.startswith("{"):
+        return raw[raw.find("}]") + 2:]
+    return raw.partition("|")[2]
+
+
+def _sections_from_json(reply: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-Antwort in dieselbe Struktur bringen, die ``_parse_generic`` für Text liefert.
+
+    Im Text heißen Sections mit führender ID nach ihrem ersten Key
+    ("POOL=0,..." -> "POOL", "STATS=0,..." -> "STATS"), alle anderen nach
+    dem Listen-Namen ("SUMMARY", "VERSION"). Booleans kommen wie im Text
+    als "true"/"false", die POOL-Nummer als String.
+    """
+    sections: Dict[str, Any] = {}
+    for list_name, items in reply.items():
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            if any(isinstance(value, bool) for value in item.values()):
+                item = {
+                    key: ("true" if value else "false") if isinstance(value, bool) else value
+                    for key, value in item.items()
+                }
+            name = list_name
+            if list_name != "STATUS" and item:
+                first_key = next(iter(item))
+                first_val = item[first_key]
+                # ID-Sections: "POOL", "STATS", "ASC", ... (nicht "Elapsed" im SUMMARY)
+                if first_key.isupper() and type(first_val) is int:
+                    name = first_key
+                    if first_key == "POOL":
+                        item["POOL"] = str(first_val)
+            if name in sections:
+                if isinstance(sections[name], list):
+                    sections[name].append(item)
+                else:
+                    sections[name] = [sections[name], item]
+            else:
+                sections[name] = item
+    return sections
+
+
+def _command_label(message: str) -> str:
+    """Befehlsname für die Messwerte: ``summary+stats`` aus Text, ``{"command": ...}`` oder ``ascset|...``"""
+    if message.startswith("{"):
+        try:
+            return str(json.loads(message).get("command", "json"))
+        except ValueError:
+            return "json"
+    return message.partition("|")[0]
+
+
+def forget_host(host: str, port: int) -> None:
+    """Alle Einträge eines Miners aus den Registries entfernen (nach dem Entladen seines Entries)"""
+    key = (host, port)
+    for registry in (_JOIN_SUPPORT, _JSON_SUPPORT, _BREAKERS, _HOST_QUEUES, _METRICS):
+        registry.pop(key, None)
+    for cache in (_REPLY_CACHE, _REPLY_DIGESTS):
+        for cache_key in [cache_key for cache_key in cache if cache_key[:2] == key]:
+            del cache[cache_key]
+
+
+class MinerUnavailable(ConnectionError):
+    """Circuit Breaker ist offen: Miner wird bis zur nächsten Probe nicht kontaktiert"""
+
+
+class CircuitBreaker:
+    """Schutz vor Verbindungsversuchen zu unerreichbaren Minern.
+
+    - closed: Befehle gehen durch; nach ``threshold`` fehlgeschlagenen
+      Befehlen in Folge -> open
+    - open: Befehle scheitern sofort mit ``MinerUnavailable``, bis der
+      Backoff (exponentiell, mit Jitter) abgelaufen ist
+    - half_open: genau ein Befehl geht als Probe (ohne Retries) durch;
+      Erfolg -> closed, Fehler -> wieder open mit doppeltem Backoff
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base_backoff: float = BREAKER_BASE_BACKOFF,
+        max_backoff: float = BREAKER_MAX_BACKOFF,
+        jitter: float = BREAKER_JITTER,
+    ) -> None:
+        self.threshold = max(1, threshold)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.failures = 0
+        self.trips = 0
+        self.backoff = 0.0
+        self._open_until = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.threshold:
+            return self.CLOSED
+        if self._probing or time.monotonic() >= self._open_until:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def time_to_next_probe(self) -> float:
+        if self.failures < self.threshold:
+            return 0.0
+        return max(0.0, self._open_until - time.monotonic())
+
+    def acquire(self) -> bool:
+        """Vor einem Befehl: True, wenn er die Probe ist; MinerUnavailable, wenn offen"""
+        state = self.state
+        if state == self.CLOSED:
+            return False
+        if state == self.OPEN or self._probing:
+            raise MinerUnavailable(f"Circuit open, next probe in {self.time_to_next_probe():.0f}s")
+        self._probing = True
+        return True
+
+    def release(self) -> None:
+        """Probe ohne Ergebnis (abgebrochen) -> nächster Befehl darf proben"""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.trips = 0
+        self.backoff = 0.0
+        self._probing = False
+
+    def record_failure(self) -> bool:
+        """Fehlgeschlagener Befehl; True, wenn der Breaker dadurch (erneut) öffnet"""
+        probe, self._probing = self._probing, False
+        self.failures += 1
+        if self.failures < self.threshold:
+            return False
+        if not probe and time.monotonic() < self._open_until:
+            # schon offen (parallel gestartete Befehle) -> Backoff nicht weiter erhöhen
+            return False
+        self.trips += 1
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.trips - 1))
+        self.backoff = backoff * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._open_until = time.monotonic() + self.backoff
+        return True
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "time_to_next_probe": round(self.time_to_next_probe(), 1),
+            "consecutive_failures": self.failures,
+            "backoff": round(self.backoff, 1),
+        }
+
+
+class HostQueue:
+    """Verbindungs-Slots zu einem Miner, vergeben nach Priorität.
+
+    Wartende werden nach Priorität und dann in Ankunftsreihenfolge bedient.
+    Lese-Befehle nutzen alle ``limit`` Slots, solange kein Steuerbefehl
+    wartet; wartet einer, bekommt er den nächsten frei werdenden Slot und
+    neue Lese-Befehle stellen sich hinter ihn. Laufende Round-Trips werden
+    nicht abgebrochen, ein Steuerbefehl wartet also höchstens auf den
+    schnellsten laufenden Poll.
+    """
+
+    def __init__(self, limit: int = DEFAULT_MAX_CONNECTIONS) -> None:
+        self.limit = max(1, limit)
+        self.active = 0
+        # (Priorität, Sequenz, Future)
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = 0
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _can_run(self) -> bool:
+        # Vorrang wartender Steuerbefehle regeln slot() und _wake() über die Reihenfolge der Warteschlange
+        return self.active < self.limit
+
+    def _wake(self) -> None:
+        waiters = self._waiters
+        while waiters:
+            _, _, future = waiters[0]
+            if future.done():
+                heapq.heappop(waiters)
+                continue
+            if not self._can_run():
+                break
+            heapq.heappop(waiters)
+            # Slot wird direkt übergeben, der Wartende muss nicht erneut konkurrieren
+            self.active += 1
+            future.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int):
+        if self._can_run() and not any(
+            p <= priority and not future.done() for p, _, future in self._waiters
+        ):
+            self.active += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._seq += 1
+            heapq.heappush(self._waiters, (priority, self._seq, future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # Slot war schon übergeben -> freigeben
+                    self.active -= 1
+                    self._wake()
+                raise
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._wake()
+
+
 class AsyncAvalonAPI:
     def __init__(
         self,
@@ -14,122 +550,175 @@ class AsyncAvalonAPI:
         port: int = DEFAULT_PORT,
         timeout: int = DEFAULT_TIMEOUT,
         retries: int = 2,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
         web_user: str = DEFAULT_WEB_USER,
         web_password: str = DEFAULT_WEB_PASSWORD,
+        transport: str = DEFAULT_TRANSPORT,
+        connect_timeout: Optional[float] = None,
+        first_byte_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
     ) -> None:
+        if transport not in (TRANSPORT_TEXT, TRANSPORT_JSON, TRANSPORT_AUTO):
+            raise ValueError(f"Unknown transport: {transport}")
         self.host = host
         self.port = port
         self.timeout = timeout
+        # Deadlines je Befehl: Verbindungsaufbau, erstes Antwort-Byte, gesamter Round-Trip
+        self.connect_timeout = timeout if connect_timeout is None else connect_timeout
+        self.first_byte_timeout = timeout if first_byte_timeout is None else first_byte_timeout
+        self.total_timeout = timeout * TOTAL_TIMEOUT_FACTOR if total_timeout is None else total_timeout
+        # Timeouts je Phase, zeigt, wo die Latenz entsteht
+        self.timeouts: Dict[str, int] = {"connect": 0, "first_byte": 0, "total": 0}
         self.retries = retries
         self.web_user = web_user
         self.web_password = web_password
+        # Lese-Befehle per Text, JSON oder automatisch je Firmware (siehe _fetch)
+        self.transport = transport
+        # Obergrenze gleichzeitiger Verbindungen zu diesem Miner, Steuerbefehle zuerst
+        self.queue = _HOST_QUEUES.setdefault((host, port), HostQueue(max_connections))
+        # Unerreichbarer Miner -> nur noch eine Probe je Backoff-Fenster
+        self.breaker = _BREAKERS.setdefault((host, port), CircuitBreaker())
+        self.metrics = _METRICS.setdefault((host, port), HostMetrics())
+        # Erstes Token einer Section -> gemerkter Stand für den Fast-Path
+        self._sections: Dict[str, _SectionCache] = {}
+        # Abgeleiteter Befehl -> (Quell-Objekt, Ergebnis), siehe _derive
+        self._derived: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        # Befehl -> (monotonic, Rohantwort) der letzten Lese-Antworten; nur mit Proxy (None = aus)
+        self.replies: Optional[Dict[str, Tuple[float, Any]]] = None
 
+    async def _send_raw(self, message: str, priority: int = PRIORITY_CONTROL) -> Optional[str]:
+        """Send raw command and return response – no response logging.
 
-    async def _send_raw(self, message: str) -> Optional[str]:
-        """Send raw command and return response – no response logging"""
-        last_exception = None
-        for attempt in range(self.retries + 1):
+        Lese-Befehle übergeben ihre Priorität (siehe ``_fetch``), alles
+        andere läuft als Steuerbefehl vor den Polls.
+
+        Läuft über den Circuit Breaker des Hosts: ist er offen, wird ohne
+        Verbindungsversuch ``MinerUnavailable`` geworfen; die Probe im
+        Zustand half_open läuft ohne Retries.
+        """
+        label = _command_label(message)
+        breaker = self.breaker
+        try:
+            probe = breaker.acquire()
+        except MinerUnavailable:
+            self.metrics.record_result(label, 0, "circuit_open")
+            raise
+        try:
+            raw = await self._send_attempts(message, label, priority, 1 if probe else self.retries + 1)
+        finally:
+            if probe:
+                breaker.release()
+        if raw is not None:
+            if breaker.trips:
+                _LOGGER.info("Miner %s reachable again", self.host)
+            breaker.record_success()
+        return raw
+
+    async def _phase(self, phase: str, awaitable: Any, timeout: Optional[float], end: float) -> Any:
+        """``awaitable`` mit Phasen-Timeout, höchstens bis ``end`` (Loop-Zeit); Timeouts werden gezählt"""
+        remaining = max(0.0, end - asyncio.get_running_loop().time())
+        binding = phase if timeout is not None and timeout < remaining else "total"
+        try:
+            return await asyncio.wait_for(awaitable, timeout=remaining if binding == "total" else timeout)
+        except asyncio.TimeoutError:
+            self.timeouts[binding] += 1
+            raise asyncio.TimeoutError(f"{binding} timeout ({phase}) for {self.host}") from None
+
+    async def _exchange(self, message: str, label: str) -> bytes:
+        """Ein Round-Trip mit Deadlines für Connect, erstes Byte und gesamt.
+
+        Bei Timeout oder Fehler wird der Socket hart abgebrochen (abort),
+        ein hängender Miner kann den Poll also nicht länger blockieren
+        als ``total_timeout``.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        end = start + self.total_timeout
+        reader, writer = await self._phase(
+            "connect",
+            asyncio.open_connection(self.host, self.port, limit=MAX_RESPONSE_SIZE),
+            self.connect_timeout,
+            end,
+        )
+        connected = loop.time()
+        first_byte = connected
+        done = False
+        try:
+            writer.write(message.encode("utf-8"))
+            await self._phase("total", writer.drain(), None, end)
+            # CGMiner schließt jede Antwort mit NUL ab -> nicht auf das Socket-Ende warten
+            raw = b""
             try:
-                reader, writer = await asyncio.wait_for(
-                    asyncio.open_connection(self.host, self.port),
-                    timeout=self.timeout,
-                )
-                writer.write(message.encode("utf-8"))
-                await writer.drain()
-                raw = b""
-                while True:
-                    chunk = await reader.read(4096)
-                    if not chunk:
-                        break
-                    raw += chunk
+                raw = await self._phase("first_byte", reader.readexactly(1), self.first_byte_timeout, end)
+                first_byte = loop.time()
+                if raw != RESPONSE_TERMINATOR:
+                    raw += await self._phase("total", reader.readuntil(RESPONSE_TERMINATOR), None, end)
+            except asyncio.IncompleteReadError as err:
+                # Firmware ohne Terminator: Verbindung wurde nach der Antwort geschlossen
+                raw += err.partial
+                if not raw:
+                    # ohne ein einziges Byte geschlossen -> Fehler (Retry, Circuit Breaker), keine leere Antwort
+                    raise ConnectionError(f"Connection closed without reply by {self.host}") from err
+            except asyncio.LimitOverrunError as err:
+                raise ValueError(
+                    f"Response exceeds {MAX_RESPONSE_SIZE} bytes"
+                ) from err
+            done = True
+            self.metrics.record_exchange(label, connected - start, first_byte - connected, loop.time() - start, len(raw))
+        finally:
+            if done:
                 writer.close()
-                await writer.wait_closed()
-                decoded = raw.decode("utf-8", errors="ignore").strip()
-                return decoded
+            else:
+                writer.transport.abort()
+        try:
+            # Antwort ist da -> Schließen im Restbudget, aber nicht als Timeout zählen
+            await asyncio.wait_for(writer.wait_closed(), timeout=max(0.0, end - loop.time()))
+        except (asyncio.TimeoutError, OSError):
+            # ein hängendes Schließen kostet nur den Socket
+            writer.transport.abort()
+        return raw
+
+    async def _send_attempts(self, message: str, label: str, priority: int, attempts: int) -> Optional[str]:
+        last_exception = None
+        for attempt in range(attempts):
+            try:
+                async with self.queue.slot(priority):
+                    raw = await self._exchange(message, label)
+                self.metrics.record_result(label, attempt)
+                return raw.rstrip(RESPONSE_TERMINATOR).decode("utf-8", errors="ignore").strip()
             except Exception as e:
                 last_exception = e
-                if attempt < self.retries:
+                if isinstance(e, ValueError):
+                    # Miner antwortet, nur nicht verwertbar -> kein Fall für den Breaker
+                    break
+                if attempt < attempts - 1:
                     await asyncio.sleep(0.5)
+        else:
+            self.metrics.record_result(label, attempts - 1, type(last_exception).__name__)
+            if self.breaker.record_failure():
+                # Nur beim Öffnen warnen, danach läuft alles über den Backoff
+                log = _LOGGER.warning if self.breaker.trips == 1 else _LOGGER.debug
+                log("Connection failed for command '%s' after %d attempts: %s (next probe in %.0fs)",
+                    message, attempts, last_exception, self.breaker.backoff)
+            else:
+                _LOGGER.debug("Connection failed for command '%s' after %d attempts: %s",
+                              message, attempts, last_exception)
+            return None
 
-        if last_exception:
-            _LOGGER.warning("Connection failed for command '%s' after %d attempts: %s",
-                            message, self.retries + 1, last_exception)
+        self.metrics.record_result(label, attempt, type(last_exception).__name__)
+        _LOGGER.warning("Invalid response for command '%s': %s", message, last_exception)
         return None
 
     def _parse_generic(self, data: Optional[str]) -> Dict[str, Any]:
-        """Improved, robust parser for CGMiner API responses"""
-        if not data or "|" not in data:
-            return {}
-        sections: Dict[str, Any] = {}
-        parts = data.split("|")
-        # First part = STATUS
-        status_part = parts[0].strip()
-        if status_part:
-            status_values = {}
-            for token in status_part.split(","):
-                token = token.strip()
-                if "=" in token:
-                    k, v = token.split("=", 1)
-                    k = k.strip()
-                    v = v.strip()
-                    try:
-                        if v.isdigit():
-                            status_values[k] = int(v)
-                        elif '.' in v and v.replace('.', '', 1).isdigit():
-                            status_values[k] = float(v)
-                        else:
-                            status_values[k] = v
-                    except Exception:
-                        status_values[k] = v
-            sections["STATUS"] = status_values
-        # Remaining sections
-        for part in parts[1:]:
-            part = part.strip()
-            if not part:
-                continue
-            values = {}
-            section_name = None
-            tokens = part.split(",")
-            first_token = tokens[0].strip()
-            if "=" in first_token:
-                name_key, name_val = first_token.split("=", 1)
-                if name_key == "POOL":
-                    section_name = "POOL"
-                    values["POOL"] = name_val.strip()
-                    tokens = tokens[1:]
-            else:
-                section_name = first_token
-            for token in tokens:
-                token = token.strip()
-                if "=" not in token:
-                    continue
-                k, v = token.split("=", 1)
-                k = k.strip()
-                v = v.strip()
-                try:
-                    if v.isdigit():
-                        values[k] = int(v)
-                    elif '.' in v and v.replace('.', '', 1).isdigit():
-                        values[k] = float(v)
-                    else:
-                        values[k] = v
-                except Exception:
-                    values[k] = v
-            if not section_name and values:
-                section_name = next(iter(values))
-            if section_name:
-                if section_name in sections:
-                    if isinstance(sections[section_name], list):
-                        sections[section_name].append(values)
-                    else:
-                        sections[section_name] = [sections[section_name], values]
-                else:
-                    sections[section_name] = values
-        return sections
+        """Textantwort parsen, mit dem gemerkten Section-Layout dieser Instanz (siehe ``_parse_text``)"""
+        return _parse_text(data, self._sections)
 
     async def _command(self, cmd: str, param: Optional[str] = None) -> Dict[str, Any]:
         raw_cmd = cmd if param is None else f"{cmd}|{param}"
-        raw = await self._send_raw(raw_cmd)
+        try:
+            raw = await self._send_raw(raw_cmd)
+        except MinerUnavailable as err:
+            return {"success": False, "error": "circuit_open", "message": str(err), "raw": None}
         if not raw:
             return {"success": False, "message": "No response from miner", "raw": None}
 
@@ -146,21 +735,7 @@ class AsyncAvalonAPI:
             "parsed": parsed
         }
 
-    async def version(self) -> Dict[str, Any]:
-        return (await self._command("version"))["parsed"]
-
-    async def summary(self) -> Dict[str, Any]:
-        return (await self._command("summary"))["parsed"]
-
-    async def stats(self) -> Dict[str, Any]:
-        return (await self._command("stats"))["parsed"]
-
-    async def devs(self) -> Dict[str, Any]:
-        return (await self._command("devs"))["parsed"]
-
-    async def pools(self) -> Dict[str, Any]:
-        result = await self._command("pools")
-        data = result["parsed"]
+    def _parse_pools(self, data: Dict[str, Any]) -> Dict[str, Any]:
         pools_dict = {}
         pool_list = data.get("POOL", [])
         if isinstance(pool_list, dict):
@@ -169,16 +744,21 @@ class AsyncAvalonAPI:
             pools_dict[f"p{i}"] = pool
         return pools_dict
 
-    async def estats(self) -> Dict[str, Any]:
-        raw = await self._send_raw("estats")
-        if not raw or "|" not in raw:
+    def _parse_estats(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """``Key[Wert]``-Felder der geparsten stats-Antwort (``MM ID0`` u.ä.) in Temperaturen, Lüfter, PS, LED aufteilen"""
+        if not stats:
             return {}
-        data_part = raw.split("|", 1)[1].strip()
+        blobs = []
+        for name, section in stats.items():
+            if name == "STATUS":
+                continue
+            for values in section if isinstance(section, list) else (section,):
+                blobs.extend(value for value in values.values() if isinstance(value, str) and "[" in value)
+
         estats: Dict[str, Any] = {"temperatures": {}, "fans": {}, "PS": {}, "led": {}, "misc": {}}
-        pattern = re.compile(r"(\w+)\[([^\]]*)\]")
-        for match in pattern.finditer(data_part):
+        for match in _MM_FIELD.finditer(" ".join(blobs)):
             key, val = match.group(1), match.group(2).strip()
-            if key in {"ITemp", "OTemp", "TMax", "TAvg", "TarT", "MTmax", "MTavg"}:
+            if key in _TEMPERATURE_KEYS:
                 try:
                     estats["temperatures"][key] = float(val)
                 except Exception:
@@ -236,6 +816,239 @@ class AsyncAvalonAPI:
                 estats["misc"][key] = val
         return estats
 
+    def _parse_reply(self, cmd: str, reply: Any) -> Dict[str, Any]:
+        """Antwort eines Lese-Befehls (Text, JSON-Text oder dekodiertes JSON) in die Form bringen, die die Plattformen nutzen"""
+        if isinstance(reply, str) and reply.startswith("{"):
+            decoded = _decode_json(reply)
+            if decoded is None:
+                raise ValueError(f"Invalid JSON reply from miner for '{cmd}'")
+            reply = decoded
+        data = _sections_from_json(reply) if isinstance(reply, dict) else self._parse_generic(reply)
+        if cmd == "pools":
+            return self._parse_pools(data)
+        return data
+
+    def _parse_cached(self, cmd: str, reply: Any) -> Dict[str, Any]:
+        """Wie ``_parse_reply``; ist die Antwort (ohne STATUS) unverändert, kommt das zuvor geparste Objekt zurück.
+
+        Aufrufer erkennen eine unveränderte Section daran, dass dasselbe
+        Objekt wie beim letzten Mal geliefert wird - es darf daher nicht
+        verändert werden. Gemerkt wird eine Antwort erst bei ihrer ersten
+        Wiederholung, ab dem dritten gleichen Poll kommt also dasselbe Objekt.
+        """
+        start = time.perf_counter()
+        if self.replies is not None:
+            self.replies[cmd] = (time.monotonic(), reply)
+        if not isinstance(reply, str):
+            parsed = self._parse_reply(cmd, reply)
+            self.metrics.record_parse(cmd, time.perf_counter() - start)
+            return parsed
+        key = (self.host, self.port, cmd)
+        digest = hash(_reply_body(reply))
+        cached = _REPLY_CACHE.get(key)
+        if cached is not None and cached[0] == digest:
+            _REPLY_CACHE.move_to_end(key)
+            self.metrics.record_parse(cmd, time.perf_counter() - start)
+            return cached[1]
+        parsed = self._parse_reply(cmd, reply)
+        previous = _REPLY_DIGESTS.get(key)
+        _REPLY_DIGESTS[key] = digest
+        if previous == digest:
+            # zweimal dieselbe Antwort -> ab jetzt lohnt sich der Eintrag
+            _REPLY_CACHE[key] = (digest, parsed)
+            _REPLY_CACHE.move_to_end(key)
+            if len(_REPLY_CACHE) > REPLY_CACHE_SIZE:
+                _REPLY_CACHE.popitem(last=False)
+        elif cached is not None:
+            # Antwort hat sich geändert -> Platz für Befehle freigeben, die sich wiederholen
+            del _REPLY_CACHE[key]
+        self.metrics.record_parse(cmd, time.perf_counter() - start)
+        return parsed
+
+    def _derive(self, commands: Iterable[str], fetched: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Ergebnisse für ``commands`` aus den tatsächlich gesendeten Befehlen zusammenstellen"""
+        results: Dict[str, Dict[str, Any]] = {}
+        for cmd in commands:
+            source = DERIVED_COMMANDS.get(cmd)
+            if source is None:
+                if cmd in fetched:
+                    results[cmd] = fetched[cmd]
+            elif source in fetched:
+                # Quelle unverändert (gleiches Objekt) -> auch das abgeleitete Ergebnis wiederverwenden
+                cached = self._derived.get(cmd)
+                if cached is None or cached[0] is not fetched[source]:
+                    cached = self._derived[cmd] = (fetched[source], self._parse_estats(fetched[source]))
+                results[cmd] = cached[1]
+        return results
+
+    def _use_json(self) -> bool:
+        if self.transport == TRANSPORT_AUTO:
+            return _JSON_SUPPORT.get((self.host, self.port), True)
+        return self.transport == TRANSPORT_JSON
+
+    async def _fetch(self, command: str) -> Any:
+        """Lese-Befehl senden; Rohantwort (JSON oder Text), None ohne Antwort.
+
+        Im Modus "auto" wird zuerst JSON versucht; antwortet die Firmware
+        nicht mit JSON, wird das pro Host gemerkt und auf Text gewechselt.
+        Dekodiert wird erst in ``_parse_reply``. Gejointe Befehle laufen mit
+        der höchsten Priorität ihrer Teile.
+        """
+        priority = min(_COMMAND_PRIORITY.get(cmd, PRIORITY_SLOW) for cmd in command.split("+"))
+        if self._use_json():
+            raw = await self._send_raw(json.dumps({"command": command}), priority)
+            if not raw:
+                return None
+            key = (self.host, self.port)
+            if raw.startswith("{"):
+                _JSON_SUPPORT[key] = True
+                return raw
+            if self.transport == TRANSPORT_JSON:
+                raise ValueError(f"No JSON reply from miner for '{command}'")
+            if key not in _JSON_SUPPORT:
+                _LOGGER.debug("JSON API not supported by %s, using text protocol", self.host)
+            _JSON_SUPPORT[key] = False
+        return await self._send_raw(command, priority)
+
+    async def _read(self, cmd: str) -> Dict[str, Any]:
+        wire = DERIVED_COMMANDS.get(cmd, cmd)
+        reply = await self._fetch(wire)
+        if not reply:
+            raise ConnectionError(f"No response from miner for '{wire}'")
+        return self._derive([cmd], {wire: self._parse_cached(wire, reply)})[cmd]
+
+    @staticmethod
+    def _split_joined(reply: str, commands: List[str]) -> Optional[List[Any]]:
+        """Joined reply in die Einzelantworten zerlegen.
+
+        JSON: ``{"summary": [{...}], "stats": [{...}]}``; Text: je eine
+        Antwort pro STATUS-Block.
+        """
+        if reply.startswith("{"):
+            reply = _decode_json(reply)
+            if reply is None:
+                return None
+            parts = [reply.get(cmd) for cmd in commands]
+            if not all(isinstance(part, list) and part and isinstance(part[0], dict) for part in parts):
+                return None
+            return [part[0] for part in parts]
+        raw, count = reply, len(commands)
+        starts = [m.start() for m in _STATUS_START.finditer(raw)]
+        if len(starts) != count:
+            return None
+        starts.append(len(raw))
+        return [raw[starts[i]:starts[i + 1]] for i in range(count)]
+
+    async def _read_joined(self, wire: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Gejointer Lese-Request (``summary+stats``); None, wenn die Firmware ihn nicht versteht"""
+        key = (self.host, self.port)
+        joined = "+".join(wire)
+        reply = await self._fetch(joined)
+        if not reply:
+            raise ConnectionError(f"No response from miner for '{joined}'")
+        parts = self._split_joined(reply, wire)
+        if parts is None:
+            if key not in _JOIN_SUPPORT:
+                _LOGGER.debug("Joined commands not supported by %s, using single requests", self.host)
+            _JOIN_SUPPORT[key] = False
+            return None
+        _JOIN_SUPPORT[key] = True
+        return {cmd: self._parse_cached(cmd, part) for cmd, part in zip(wire, parts)}
+
+    async def batch(
+        self, commands: Iterable[str], deadline: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Mehrere Lese-Befehle in einem Request (``summary+stats+pools``).
+
+        Gibt ``{cmd: parsed}`` zurück, mit denselben Strukturen wie die
+        Einzelmethoden. Lehnt die Firmware gejointe Befehle ab, wird auf
+        parallele Einzel-Requests zurückgefallen und das pro Host gemerkt.
+        ``deadline`` (Loop-Zeit) begrenzt den gesamten Aufruf; fehlt dann ein
+        Teil, enthält das Ergebnis nur die fertigen Befehle. Mit Deadline
+        werden schnelle Telemetrie (summary, stats) und langsame Metadaten
+        getrennt gejoint, damit eine langsame Antwort die schnellen Sections
+        nicht mit über die Deadline zieht. Befehle aus ``DERIVED_COMMANDS``
+        (estats) werden nicht gesendet, sondern aus der Antwort ihrer Quelle
+        (stats) abgeleitet.
+        """
+        commands = list(dict.fromkeys(commands))
+        unknown = [cmd for cmd in commands if cmd not in BATCH_COMMANDS]
+        if unknown:
+            raise ValueError(f"Commands not batchable: {', '.join(unknown)}")
+        if not commands:
+            return {}
+        wire = list(dict.fromkeys(DERIVED_COMMANDS.get(cmd, cmd) for cmd in commands))
+
+        if deadline is None:
+            groups = [wire]
+        else:
+            fast = [cmd for cmd in wire if _COMMAND_PRIORITY.get(cmd, PRIORITY_SLOW) < PRIORITY_SLOW]
+            groups = [group for group in (fast, [cmd for cmd in wire if cmd not in fast]) if group]
+
+        key = (self.host, self.port)
+        # Task -> Befehle, die er liefert
+        tasks: Dict[asyncio.Future, List[str]] = {}
+
+        def _start_single(group: List[str]) -> None:
+            for cmd in group:
+                tasks[asyncio.ensure_future(self._read(cmd))] = [cmd]
+
+        for group in groups:
+            if len(group) > 1 and _JOIN_SUPPORT.get(key, True):
+                tasks[asyncio.ensure_future(self._read_joined(group))] = group
+            else:
+                _start_single(group)
+
+        loop = asyncio.get_running_loop()
+        results: Dict[str, Dict[str, Any]] = {}
+        last_error: Optional[BaseException] = None
+        try:
+            while tasks:
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait(tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Deadline: was fertig ist, wird geliefert, der Rest ist stale
+                    break
+                for task in done:
+                    group = tasks.pop(task)
+                    err = task.exception()
+                    if err is not None:
+                        last_error = err
+                    elif len(group) == 1:
+                        results[group[0]] = task.result()
+                    elif task.result() is None:
+                        # Join abgelehnt -> Einzel-Requests im verbleibenden Budget
+                        _start_single(group)
+                    else:
+                        results.update(task.result())
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if not results:
+            if tasks:
+                raise asyncio.TimeoutError(f"No command finished before the deadline ({self.host})")
+            raise last_error or ConnectionError(f"No response from miner ({self.host})")
+        return self._derive(commands, results)
+
+    async def version(self) -> Dict[str, Any]:
+        return await self._read("version")
+
+    async def summary(self) -> Dict[str, Any]:
+        return await self._read("summary")
+
+    async def stats(self) -> Dict[str, Any]:
+        return await self._read("stats")
+
+    async def devs(self) -> Dict[str, Any]:
+        return await self._read("devs")
+
+    async def pools(self) -> Dict[str, Any]:
+        return await self._read("pools")
+
+    async def estats(self) -> Dict[str, Any]:
+        return await self._read("estats")
+
     async def set_workmode(self, level: int) -> Dict[str, Any]:
         return await self._command("ascset", f"0,workmode,set,{level}")
         
@@ -265,7 +1078,10 @@ class AsyncAvalonAPI:
         web_pass = self.web_password
         param = f"{web_user},{web_pass},{pool_num},{url},{user},{password}"
         raw_cmd = f"setpool|{param}"
-        raw_result = await self._send_raw(raw_cmd)
+        try:
+            raw_result = await self._send_raw(raw_cmd)
+        except MinerUnavailable as err:
+            return {"success": False, "error": "circuit_open", "message": str(err), "raw": None}
         if not raw_result:
             return {"success": False, "message": "No response from miner", "raw": None}
 
@@ -290,7 +1106,10 @@ class AsyncAvalonAPI:
         
     async def switch_pool(self, pool_index: int) -> Dict[str, Any]:
         """Runtime switch without reboot"""
-        raw = await self._send_raw(f"switchpool|{pool_index}")
+        try:
+            raw = await self._send_raw(f"switchpool|{pool_index}")
+        except MinerUnavailable as err:
+            return {"success": False, "error": "circuit_open", "message": str(err), "raw": None}
         if not raw:
             return {"success": False, "message": "No response", "raw": None}
     
@@ -2,10 +2,9 @@
 from __future__ import annotations
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from . import AvalonMinerCoordinator
+from . import AvalonMinerCoordinator, async_add_miner_entities
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .avalon_api import AsyncAvalonAPI
 from .const import DOMAIN
@@ -14,20 +13,21 @@ import logging
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
-    data = hass.data[DOMAIN][entry.entry_id]
-    coordinator: AvalonMinerCoordinator = data["coordinator"]
-    api: AsyncAvalonAPI = data["api"]
-    entities = [
-        AvalonRebootButton(coordinator, entry, api),
-        AvalonFanAutoButton(coordinator, entry, api),
-    ]
-    async_add_entities(entities)
+    def create_buttons(miner: dict) -> list:
+        coordinator: AvalonMinerCoordinator = miner["coordinator"]
+        api: AsyncAvalonAPI = miner["api"]
+        return [
+            AvalonRebootButton(coordinator, miner, api),
+            AvalonFanAutoButton(coordinator, miner, api),
+        ]
+
+    async_add_miner_entities(hass, entry, async_add_entities, create_buttons)
 
 class AvalonBaseButton(CoordinatorEntity, ButtonEntity):
     def __init__(
         self,
         coordinator: AvalonMinerCoordinator,
-        entry: ConfigEntry,
+        miner: dict,
         api: AsyncAvalonAPI,
         translation_key: str,
     ) -> None:
@@ -36,18 +36,13 @@ class AvalonBaseButton(CoordinatorEntity, ButtonEntity):
         self.api = api
         self._attr_translation_key = translation_key
         self._attr_has_entity_name = True
-        self._attr_unique_id = f"{entry.entry_id}_{translation_key}"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.data[CONF_HOST])},
-            "name": "Avalon Nano 3S",        # Device-Name muss hier gesetzt werden
-            "manufacturer": "Canaan",
-            "model": "Nano 3S",
-        }
+        self._attr_unique_id = f"{miner['unique_prefix']}_{translation_key}"
+        self._attr_device_info = miner["device_info"]
 
 
 class AvalonRebootButton(AvalonBaseButton):
-    def __init__(self, coordinator: AvalonMinerCoordinator, entry: ConfigEntry, api: AsyncAvalonAPI):
-        super().__init__(coordinator, entry, api, translation_key="reboot")
+    def __init__(self, coordinator: AvalonMinerCoordinator, miner: dict, api: AsyncAvalonAPI):
+        super().__init__(coordinator, miner, api, translation_key="reboot")
 
     async def async_press(self) -> None:
         try:
@@ -63,12 +58,12 @@ class AvalonFanAutoButton(AvalonBaseButton):
     def __init__(
         self,
         coordinator: AvalonMinerCoordinator,
-        entry: ConfigEntry,
+        miner: dict,
         api: AsyncAvalonAPI,
     ):
         super().__init__(
             coordinator,
-            entry,
+            miner,
             api,
             translation_key="fan_auto",
         )
@@ -92,4 +87,10 @@ class AvalonFanAutoButton(AvalonBaseButton):
             )
 
         finally:
-            await self.coordinator.async_request_refresh()
+            # Nur estats zurücklesen statt Full-Refresh
+            await self.coordinator.async_read_back("fan_auto")
+            self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.read_backs.get("fan_auto")
@@ -0,0 +1,83 @@
+"""Schreibzugriffe bündeln: bei schnellen Änderungen (Slider, Farbwähler) nur den letzten Wert senden."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from .const import DOMAIN, WRITE_COALESCE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class CoalescingWriter:
+    """Letzter Wunschzustand gewinnt.
+
+    ``submit`` merkt sich nur den Wert; nach ``delay`` Sekunden wird der
+    dann aktuelle Wert mit ``send`` geschrieben. Kommt während des Sendens
+    ein neuer Wert, folgt genau ein weiterer Befehl. Danach gibt es einen
+    einzigen ``refresh(value, started)`` mit dem zuletzt gesendeten Wert und
+    der Loop-Zeit, zu der dieser Befehl losging. Solange ``pending`` gilt, sollen Entities ihren
+    optimistischen Zustand behalten statt der (alten) Coordinator-Daten.
+
+    Der Schreib-Task läuft als Background-Task des Config-Entries
+    (``entry.async_create_background_task``) und endet spätestens mit dem
+    Entladen des Entries.
+    """
+
+    def __init__(
+        self,
+        hass: Any,
+        entry: Any,
+        send: Callable[[Any], Awaitable[Any]],
+        refresh: Callable[[Any, float], Awaitable[Any]],
+        delay: float = WRITE_COALESCE_DELAY,
+        name: str = "write",
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._name = f"{DOMAIN} coalesced {name}"
+        self._send = send
+        self._refresh = refresh
+        self.delay = delay
+        self._value: Any = _UNSET
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> bool:
+        return self._task is not None
+
+    def submit(self, value: Any) -> None:
+        self._value = value
+        if self._task is None:
+            self._task = self._entry.async_create_background_task(self._hass, self._run(), self._name)
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._value = _UNSET
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        sent = _UNSET
+        try:
+            await asyncio.sleep(self.delay)
+            while self._value is not _UNSET:
+                sent, self._value = self._value, _UNSET
+                started = loop.time()
+                try:
+                    result = await self._send(sent)
+                except Exception as err:
+                    _LOGGER.error("Write failed: %s", err)
+                    continue
+                if isinstance(result, dict) and not result.get("success", False):
+                    _LOGGER.error("Write failed: %s", result.get("message"))
+        finally:
+            self._task = None
+        # Erst nach dem Schreiben (und ohne pending) die Daten übernehmen; auch nach
+        # einem Fehler, damit der optimistische Zustand nicht stehen bleibt
+        if sent is not _UNSET:
+            await self._refresh(sent, started)
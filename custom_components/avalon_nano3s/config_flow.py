@@ -7,6 +7,8 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig
 from .avalon_api import AsyncAvalonAPI
+from .discovery import async_discover
+from .fleet import expand_hosts
 from .const import (
     DOMAIN,
     CONF_HOST,
@@ -14,6 +16,27 @@ from .const import (
     CONF_TIMEOUT,
     CONF_UPDATE_INTERVAL,
     CONF_WEB_PASSWORD,
+    CONF_COMMAND_INTERVAL,
+    CONF_HISTORY_WINDOW,
+    CONF_HOSTS,
+    CONF_MAX_CONCURRENT,
+    CONF_MODE,
+    CONF_NETWORKS,
+    MODE_HUB,
+    DEFAULT_MAX_CONCURRENT,
+    CONF_CHANGE_DRIVEN_UPDATES,
+    CONF_RECORD_POLL_ATTRIBUTES,
+    CONF_PROXY_BIND,
+    CONF_PROXY_MAX_AGE,
+    CONF_PROXY_PORT,
+    DEFAULT_CHANGE_DRIVEN_UPDATES,
+    DEFAULT_COMMAND_INTERVALS,
+    DEFAULT_HISTORY_WINDOW,
+    DEFAULT_HUB_HISTORY_WINDOW,
+    DEFAULT_RECORD_POLL_ATTRIBUTES,
+    DEFAULT_PROXY_BIND,
+    DEFAULT_PROXY_MAX_AGE,
+    DEFAULT_PROXY_PORT,
     FALLBACK_POOLS,
     DEFAULT_PORT,
     DEFAULT_TIMEOUT,
@@ -31,11 +54,41 @@ BASE_SCHEMA = vol.Schema({
     vol.Optional(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): cv.positive_int,
 })
 
+# Schema für den Fleet-Hub: viele Miner (IPs, Hostnamen, CIDR) in einem Entry
+HUB_SCHEMA = vol.Schema({
+    vol.Required(CONF_HOSTS): str,
+    vol.Optional(CONF_WEB_PASSWORD, default=DEFAULT_WEB_PASSWORD): str,
+    vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+    vol.Optional(CONF_TIMEOUT, default=DEFAULT_TIMEOUT): cv.positive_int,
+    vol.Optional(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): cv.positive_int,
+    vol.Optional(CONF_MAX_CONCURRENT, default=DEFAULT_MAX_CONCURRENT): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=1024)
+    ),
+})
+
+
+def _validate_hosts(text: str) -> tuple[list[str], str | None]:
+    """Host-Liste prüfen -> (Hosts, Fehlerschlüssel oder None)"""
+    try:
+        hosts = expand_hosts(text)
+    except ValueError:
+        return [], "invalid_hosts"
+    return hosts, None if hosts else "invalid_hosts"
+
+
 class AvalonNano3SConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Basis-Konfiguration für Avalon Nano 3S"""
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._port = DEFAULT_PORT
+        self._discovered: dict[str, dict[str, Any]] = {}
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Einzelner Miner oder Fleet-Hub"""
+        return self.async_show_menu(step_id="user", menu_options=["miner", "hub", "discovery"])
+
+    async def async_step_miner(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         errors = {}
 
         if user_input is not None:
@@ -55,11 +108,137 @@ class AvalonNano3SConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(title=user_input[CONF_HOST], data=user_input)
 
         return self.async_show_form(
-            step_id="user",
+            step_id="miner",
             data_schema=BASE_SCHEMA,
             errors=errors
         )
 
+    async def async_step_hub(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Fleet-Hub: alle Miner teilen sich einen Scheduler"""
+        errors = {}
+
+        if user_input is not None:
+            hosts, error = _validate_hosts(user_input[CONF_HOSTS])
+            if error:
+                errors[CONF_HOSTS] = error
+
+            if not user_input.get(CONF_WEB_PASSWORD, "admin").strip():
+                errors[CONF_WEB_PASSWORD] = "empty_password"
+
+            interval = user_input.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+            if not 1 <= interval <= 3600:
+                errors[CONF_UPDATE_INTERVAL] = "invalid_hub_interval"
+
+            if not errors:
+                # Host-Liste normalisiert speichern (CIDR bleibt CIDR)
+                hosts_text = " ".join(user_input[CONF_HOSTS].replace(",", " ").split())
+                await self.async_set_unique_id(f"hub_{hosts_text.replace('.', '_')}")
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=f"Avalon Fleet ({len(hosts)})",
+                    data={**user_input, CONF_HOSTS: hosts_text, CONF_MODE: MODE_HUB},
+                )
+
+        return self.async_show_form(
+            step_id="hub",
+            data_schema=self.add_suggested_values_to_schema(HUB_SCHEMA, user_input),
+            errors=errors
+        )
+
+    async def async_step_discovery(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Netzwerksuche: CIDR-Bereiche nach Nano 3S absuchen"""
+        errors = {}
+
+        if user_input is not None:
+            self._port = user_input.get(CONF_PORT, DEFAULT_PORT)
+            try:
+                found = await async_discover(user_input[CONF_NETWORKS], self._port)
+            except ValueError:
+                errors[CONF_NETWORKS] = "invalid_hosts"
+            else:
+                configured = self._configured_hosts()
+                self._discovered = {host: version for host, version in found.items() if host not in configured}
+                if self._discovered:
+                    return await self.async_step_discovery_select()
+                errors["base"] = "no_new_miners" if found else "no_miners_found"
+
+        schema = vol.Schema({
+            vol.Required(CONF_NETWORKS): str,
+            vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+        })
+        return self.async_show_form(
+            step_id="discovery",
+            data_schema=self.add_suggested_values_to_schema(schema, user_input),
+            errors=errors
+        )
+
+    async def async_step_discovery_select(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Gefundene Miner auswählen: einer -> Einzel-Entry, mehrere -> Fleet-Hub"""
+        errors = {}
+
+        if user_input is not None:
+            hosts = user_input[CONF_HOSTS]
+            if not hosts:
+                errors[CONF_HOSTS] = "invalid_hosts"
+            elif not user_input.get(CONF_WEB_PASSWORD, "admin").strip():
+                errors[CONF_WEB_PASSWORD] = "empty_password"
+            else:
+                data = {
+                    CONF_WEB_PASSWORD: user_input[CONF_WEB_PASSWORD],
+                    CONF_PORT: self._port,
+                    CONF_TIMEOUT: DEFAULT_TIMEOUT,
+                    CONF_UPDATE_INTERVAL: user_input[CONF_UPDATE_INTERVAL],
+                }
+                if len(hosts) == 1:
+                    await self.async_set_unique_id(hosts[0].replace(".", "_"))
+                    self._abort_if_unique_id_configured()
+                    return self.async_create_entry(title=hosts[0], data={**data, CONF_HOST: hosts[0]})
+
+                hosts_text = " ".join(hosts)
+                await self.async_set_unique_id(f"hub_{hosts_text.replace('.', '_')}")
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=f"Avalon Fleet ({len(hosts)})",
+                    data={
+                        **data,
+                        CONF_HOSTS: hosts_text,
+                        CONF_MAX_CONCURRENT: DEFAULT_MAX_CONCURRENT,
+                        CONF_MODE: MODE_HUB,
+                    },
+                )
+
+        options = {
+            host: f"{host} ({version.get('MODEL', '?')}, {version.get('MAC', '?')})"
+            for host, version in self._discovered.items()
+        }
+        schema = vol.Schema({
+            vol.Required(CONF_HOSTS, default=list(options)): cv.multi_select(options),
+            vol.Optional(CONF_WEB_PASSWORD, default=DEFAULT_WEB_PASSWORD): str,
+            vol.Optional(CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=3600)
+            ),
+        })
+        return self.async_show_form(
+            step_id="discovery_select",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders={"count": str(len(options))},
+        )
+
+    def _configured_hosts(self) -> set[str]:
+        """Hosts, die schon als Einzel-Entry oder in einem Hub eingerichtet sind"""
+        hosts: set[str] = set()
+        for entry in self._async_current_entries(include_ignore=False):
+            config = {**entry.data, **entry.options}
+            if config.get(CONF_MODE) == MODE_HUB:
+                try:
+                    hosts.update(expand_hosts(config.get(CONF_HOSTS, "")))
+                except ValueError:
+                    continue
+            elif CONF_HOST in config:
+                hosts.add(config[CONF_HOST])
+        return hosts
+
     @staticmethod
     def async_get_options_flow(config_entry):
         return AvalonNano3SOptionsFlowHandler(config_entry)
@@ -69,6 +248,12 @@ class AvalonNano3SOptionsFlowHandler(config_entries.OptionsFlow):
     """Options-Flow mit allen Funktionen: Intervall, Web-Passwort, Pools"""
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         self._config_entry = config_entry
+        self._hub = config_entry.data.get(CONF_MODE) == MODE_HUB
+        self._pool_index = None
+        if self._hub:
+            # Pools sind je Miner -> im Hub nicht über die Optionen
+            self._api = None
+            return
         self._api = AsyncAvalonAPI(
             host=config_entry.data[CONF_HOST],
             port=config_entry.data[CONF_PORT],
@@ -78,7 +263,6 @@ class AvalonNano3SOptionsFlowHandler(config_entries.OptionsFlow):
                 config_entry.data.get(CONF_WEB_PASSWORD, "admin")
             ),
         )
-        self._pool_index = None
 
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Startseite: Auswahl, was geändert werden soll"""
@@ -86,22 +270,41 @@ class AvalonNano3SOptionsFlowHandler(config_entries.OptionsFlow):
             action = user_input.get("action")
             if action == "interval":
                 return await self.async_step_interval()
+            if action == "command_intervals":
+                return await self.async_step_command_intervals()
+            if action == "entity_updates":
+                return await self.async_step_entity_updates()
+            if action == "proxy":
+                return await self.async_step_proxy()
+            if action == "history":
+                return await self.async_step_history()
             if action == "web_password":
                 return await self.async_step_web_password()
+            if action == "hosts":
+                return await self.async_step_hosts()
             if action in ("pool1", "pool2", "pool3"):
                 self._pool_index = int(action[-1])
                 return await self.async_step_pool()
 
+        if self._hub:
+            actions = ["hosts", "interval", "command_intervals", "entity_updates", "history", "proxy", "web_password"]
+        else:
+            actions = [
+                "interval",
+                "command_intervals",
+                "entity_updates",
+                "history",
+                "proxy",
+                "web_password",          # ← Zweite Position nach Intervall
+                "pool1",
+                "pool2",
+                "pool3",
+            ]
+
         schema = vol.Schema({
             vol.Required("action"): SelectSelector(
                 SelectSelectorConfig(
-                    options=[
-                        "interval",
-                        "web_password",          # ← Zweite Position nach Intervall
-                        "pool1",
-                        "pool2",
-                        "pool3",
-                    ],
+                    options=actions,
                     translation_key="action_selector"
                 )
             )
@@ -120,9 +323,15 @@ class AvalonNano3SOptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             try:
                 interval = int(user_input.get(CONF_UPDATE_INTERVAL, current))
-                if 1 <= interval <= 60:
-                    return self.async_create_entry(title="", data={CONF_UPDATE_INTERVAL: interval})
-                errors[CONF_UPDATE_INTERVAL] = "invalid_interval"
+                # Hub verteilt die Polls über das Intervall -> gleicher Bereich wie beim Einrichten
+                maximum = 3600 if self._hub else 60
+                if 1 <= interval <= maximum:
+                    # übrige Optionen (Befehls-Intervalle, Hosts usw.) behalten
+                    new_options = dict(self._config_entry.options)
+                    new_options[CONF_UPDATE_INTERVAL] = interval
+                    self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+                    return self.async_create_entry(title="", data=new_options)
+                errors[CONF_UPDATE_INTERVAL] = "invalid_hub_interval" if self._hub else "invalid_interval"
             except ValueError:
                 errors[CONF_UPDATE_INTERVAL] = "invalid_number"
 
@@ -132,6 +341,117 @@ class AvalonNano3SOptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(step_id="interval", data_schema=schema, errors=errors)
 
+    async def async_step_hosts(self, user_input=None) -> FlowResult:
+        """Fleet-Hub: Host-Liste und gleichzeitige Abfragen ändern"""
+        errors = {}
+        config = {**self._config_entry.data, **self._config_entry.options}
+
+        if user_input is not None:
+            _, error = _validate_hosts(user_input[CONF_HOSTS])
+            if error:
+                errors[CONF_HOSTS] = error
+            else:
+                new_options = dict(self._config_entry.options)
+                new_options[CONF_HOSTS] = " ".join(user_input[CONF_HOSTS].replace(",", " ").split())
+                new_options[CONF_MAX_CONCURRENT] = user_input[CONF_MAX_CONCURRENT]
+                self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+                return self.async_create_entry(title="", data=new_options)
+
+        schema = vol.Schema({
+            vol.Required(CONF_HOSTS, default=config.get(CONF_HOSTS, "")): str,
+            vol.Required(
+                CONF_MAX_CONCURRENT,
+                default=config.get(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1024)),
+        })
+
+        return self.async_show_form(step_id="hosts", data_schema=schema, errors=errors)
+
+    async def async_step_command_intervals(self, user_input=None) -> FlowResult:
+        """Abfrage-Intervall je Befehl ändern (0 = nur beim Start / nach Reboot)"""
+        if user_input is not None:
+            new_options = dict(self._config_entry.options)
+            for cmd in DEFAULT_COMMAND_INTERVALS:
+                new_options[CONF_COMMAND_INTERVAL.format(cmd)] = user_input[CONF_COMMAND_INTERVAL.format(cmd)]
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+            return self.async_create_entry(title="", data=new_options)
+
+        schema = vol.Schema({
+            vol.Required(
+                CONF_COMMAND_INTERVAL.format(cmd),
+                default=self._config_entry.options.get(CONF_COMMAND_INTERVAL.format(cmd), default),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600))
+            for cmd, default in DEFAULT_COMMAND_INTERVALS.items()
+        })
+
+        return self.async_show_form(step_id="command_intervals", data_schema=schema)
+
+    async def async_step_entity_updates(self, user_input=None) -> FlowResult:
+        """Schreiben der Entity-States: nur bei Änderung, Poll-Attribute im Recorder"""
+        if user_input is not None:
+            new_options = dict(self._config_entry.options)
+            new_options.update(user_input)
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+            return self.async_create_entry(title="", data=new_options)
+
+        options = self._config_entry.options
+        schema = vol.Schema({
+            vol.Required(
+                CONF_CHANGE_DRIVEN_UPDATES,
+                default=options.get(CONF_CHANGE_DRIVEN_UPDATES, DEFAULT_CHANGE_DRIVEN_UPDATES),
+            ): bool,
+            vol.Required(
+                CONF_RECORD_POLL_ATTRIBUTES,
+                default=options.get(CONF_RECORD_POLL_ATTRIBUTES, DEFAULT_RECORD_POLL_ATTRIBUTES),
+            ): bool,
+        })
+
+        return self.async_show_form(step_id="entity_updates", data_schema=schema)
+
+    async def async_step_history(self, user_input=None) -> FlowResult:
+        """Verlauf im Speicher: Fenster der Rohwerte in Sekunden (0 = aus)"""
+        if user_input is not None:
+            new_options = dict(self._config_entry.options)
+            new_options.update(user_input)
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+            return self.async_create_entry(title="", data=new_options)
+
+        default = DEFAULT_HUB_HISTORY_WINDOW if self._hub else DEFAULT_HISTORY_WINDOW
+        schema = vol.Schema({
+            vol.Required(
+                CONF_HISTORY_WINDOW,
+                default=self._config_entry.options.get(CONF_HISTORY_WINDOW, default),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+        })
+
+        return self.async_show_form(step_id="history", data_schema=schema)
+
+    async def async_step_proxy(self, user_input=None) -> FlowResult:
+        """Lokaler CGMiner-Proxy für andere Tools: Port (0 = aus), Bind-Adresse, maximales Alter der Antworten"""
+        if user_input is not None:
+            new_options = dict(self._config_entry.options)
+            new_options.update(user_input)
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+            return self.async_create_entry(title="", data=new_options)
+
+        options = self._config_entry.options
+        schema = vol.Schema({
+            vol.Required(
+                CONF_PROXY_PORT,
+                default=options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+            vol.Required(
+                CONF_PROXY_BIND,
+                default=options.get(CONF_PROXY_BIND, DEFAULT_PROXY_BIND),
+            ): str,
+            vol.Required(
+                CONF_PROXY_MAX_AGE,
+                default=options.get(CONF_PROXY_MAX_AGE, DEFAULT_PROXY_MAX_AGE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+        })
+
+        return self.async_show_form(step_id="proxy", data_schema=schema)
+
     async def async_step_web_password(self, user_input=None) -> FlowResult:
         """Web-Passwort ändern (nicht Pool-Passwörter!)"""
         errors = {}
@@ -204,6 +524,8 @@ class AvalonNano3SOptionsFlowHandler(config_entries.OptionsFlow):
                             description_placeholders={"pool_num": str(idx)}
                         )
                     errors["base"] = "reboot_failed"
+                elif result.get("error") == "circuit_open":
+                    errors["base"] = "miner_unavailable"
                 else:
                     errors["base"] = "unknown"
     
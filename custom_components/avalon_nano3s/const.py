@@ -10,12 +10,107 @@ CONF_TIMEOUT = "timeout"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_WEB_PASSWORD = "web_password"
 
+# Hub-Modus: ein Config-Entry für viele Miner
+CONF_MODE = "mode"
+MODE_HUB = "hub"
+CONF_HOSTS = "hosts"
+CONF_MAX_CONCURRENT = "max_concurrent"
+
+# Nur Entities schreiben, deren Wert sich geändert hat
+CONF_CHANGE_DRIVEN_UPDATES = "change_driven_updates"
+# last_polled / stale_seconds im Recorder speichern
+CONF_RECORD_POLL_ATTRIBUTES = "record_poll_attributes"
+
+# Lokaler CGMiner-Proxy: Port (0 = aus; Hub: Port + Index des Hosts), Bind-Adresse,
+# maximales Alter (s) der Antworten, die aus dem letzten Poll beantwortet werden
+CONF_PROXY_PORT = "proxy_port"
+CONF_PROXY_BIND = "proxy_bind"
+CONF_PROXY_MAX_AGE = "proxy_max_age"
+
+# Verlauf im Speicher: Sekunden Rohwerte je Miner (0 = aus); 1h/24h/7d-Ansichten kommen immer dazu
+CONF_HISTORY_WINDOW = "history_window"
+
+# Per-Command Intervalle, gespeichert als "interval_<cmd>" in den Options
+CONF_COMMAND_INTERVAL = "interval_{}"
+
 # Default values
 DEFAULT_PORT = 4028
 DEFAULT_TIMEOUT = 5
+# Gesamt-Deadline je Befehl als Vielfaches von timeout (Connect und erstes Byte je timeout)
+TOTAL_TIMEOUT_FACTOR = 2
 DEFAULT_UPDATE_INTERVAL = 10
 DEFAULT_WEB_PASSWORD = "admin"
 DEFAULT_WEB_USER = "admin"
+DEFAULT_CHANGE_DRIVEN_UPDATES = True
+DEFAULT_RECORD_POLL_ATTRIBUTES = False
+DEFAULT_PROXY_PORT = 0
+DEFAULT_HISTORY_WINDOW = 3600
+# Hub: Verlauf kostet ~75 kB je Miner, daher standardmäßig aus
+DEFAULT_HUB_HISTORY_WINDOW = 0
+DEFAULT_PROXY_BIND = "127.0.0.1"
+DEFAULT_PROXY_MAX_AGE = 30
+# Sekunden je Lese-Befehl; 0 = nur beim Start und nach einem Reboot.
+# Werte unter dem Update-Intervall bedeuten "jeden Tick".
+# stats fehlt absichtlich: estats wird daraus abgeleitet, stats folgt daher dem estats-Intervall.
+DEFAULT_COMMAND_INTERVALS = {
+    "summary": DEFAULT_UPDATE_INTERVAL,
+    "estats": DEFAULT_UPDATE_INTERVAL,
+    "devs": 60,
+    "pools": 60,
+    "version": 0,
+}
+# Steuer-Entities (unique_id ohne "<entry_id>_") -> API-Section, aus der sie lesen
+CONTROL_SECTIONS = {
+    "workmode": "estats",
+    "led_effect": "estats",
+    "led": "estats",
+    "fan_speed": "estats",
+    "fan_auto": "estats",
+    "pool_select": "pools",
+}
+# Abgeleitete Sensoren (unique_id ohne "<entry_id>_") -> Sections, die dafür gepollt werden müssen
+DERIVED_SECTIONS = {
+    "hashrate_1h_avg": ("summary",),
+    "power_24h_avg": ("estats",),
+    "temperature_max_24h": ("estats",),
+    "efficiency": ("summary", "estats"),
+    "hashrate_effective": ("summary", "pools"),
+    "hashrate_effective_ratio": ("summary", "pools"),
+    "reject_rate": ("summary",),
+    "stale_rate": ("summary",),
+    "uptime_fraction": ("summary",),
+}
+# API-Transport: CGMiner-Text ("STATUS=...|"), JSON ({"command": ...}) oder
+# "auto" (JSON versuchen, bei Textantwort pro Firmware auf Text zurückfallen)
+TRANSPORT_TEXT = "text"
+TRANSPORT_JSON = "json"
+TRANSPORT_AUTO = "auto"
+DEFAULT_TRANSPORT = TRANSPORT_AUTO
+# Gleichzeitige API-Verbindungen pro Miner (CGMiner ist quasi single-threaded)
+DEFAULT_MAX_CONNECTIONS = 2
+# Circuit Breaker je Miner: nach so vielen fehlgeschlagenen Befehlen (inkl. Retries)
+# keine Verbindungen mehr bis zur nächsten Probe; Backoff verdoppelt sich bis zum Maximum
+BREAKER_FAILURE_THRESHOLD = 2
+BREAKER_BASE_BACKOFF = 5
+BREAKER_MAX_BACKOFF = 300
+BREAKER_JITTER = 0.2
+
+# Hub: gleichzeitige Polls über alle Miner, Obergrenze Hosts (z.B. aus einem CIDR)
+DEFAULT_MAX_CONCURRENT = 32
+MAX_HUB_HOSTS = 4096
+# Zufälliger Versatz je Poll als Anteil des Intervalls
+DEFAULT_POLL_JITTER = 0.1
+
+# Netzwerksuche: Port-Scan mit kurzem Connect-Timeout, Bestätigung per "version"
+CONF_NETWORKS = "networks"
+DISCOVERY_CONCURRENCY = 256
+DISCOVERY_CONNECT_TIMEOUT = 0.5
+DISCOVERY_PROBE_TIMEOUT = 2
+# MODEL aus "version" (Kleinschreibung), das als Nano 3S erkannt wird
+SUPPORTED_MODELS = ("nano3s",)
+
+# Slider/Farbwähler: Änderungen innerhalb dieses Fensters (s) werden zu einem Befehl zusammengefasst
+WRITE_COALESCE_DELAY = 0.4
 
 # Fallback pools – zentral
 FALLBACK_POOLS = {
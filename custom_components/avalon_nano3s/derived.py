@@ -0,0 +1,178 @@
+"""Abgeleitete Kennzahlen je Miner, bei jedem Poll inkrementell fortgeschrieben (EWMA, O(1) Zustand)."""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Arbeit eines Diff1-Shares in Hashes
+DIFF1_HASHES = 2 ** 32
+POOL_IDS = ("p1", "p2", "p3")
+
+# Zeitkonstanten der Glättung (s)
+TAU_POWER = 600
+TAU_HASHRATE = 600
+# Shares kommen nur alle paar Sekunden -> lange Glättung, sonst rauscht die effektive Hashrate
+TAU_SHARES = 3600
+TAU_UPTIME = 86400
+
+
+class Ewma:
+    """Exponentiell gleitender Mittelwert für unregelmäßige Abstände: alpha = 1 - exp(-dt / tau)"""
+
+    __slots__ = ("tau", "value")
+
+    def __init__(self, tau: float) -> None:
+        self.tau = tau
+        self.value: Optional[float] = None
+
+    def add(self, sample: float, dt: float) -> None:
+        if self.value is None:
+            self.value = sample
+        elif dt > 0:
+            self.value += (1 - math.exp(-dt / self.tau)) * (sample - self.value)
+
+
+def _number(data: Any, *path: str) -> Optional[float]:
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    if isinstance(data, bool) or data is None:
+        return None
+    try:
+        return float(data)
+    except (TypeError, ValueError):
+        return None
+
+
+def _delta(current: float, previous: Optional[float], restarted: bool) -> Optional[float]:
+    """Zuwachs eines Zählers; nach Neustart oder Rücksprung zählt der ganze neue Stand"""
+    if previous is None:
+        return None
+    if restarted or current < previous:
+        return current
+    return current - previous
+
+
+class DerivedMetrics:
+    """Effizienz, effektive Hashrate, Reject-/Stale-Rate und Uptime aus aufeinanderfolgenden Snapshots.
+
+    - Effizienz (J/TH) aus geglätteter Leistung (PS_Power) und gemeldeter
+      Hashrate (MHS 5s)
+    - effektive Hashrate aus dem Zuwachs der Diff1 Shares aller Pools:
+      ``ΔDiff1 · 2^32 / Δt``
+    - Reject-/Stale-Rate je Minute aus den Zählern in summary
+    - Uptime-Anteil: wie weit Elapsed im Vergleich zur Wanduhr vorankam
+    - läuft Elapsed rückwärts (Neustart), zählen die neuen Zählerstände als
+      Zuwachs seit dem Start und die Zeit davor als Ausfall
+    """
+
+    def __init__(self) -> None:
+        self.power = Ewma(TAU_POWER)
+        self.hashrate = Ewma(TAU_HASHRATE)
+        self.effective = Ewma(TAU_SHARES)
+        self.rejects = Ewma(TAU_SHARES)
+        self.stales = Ewma(TAU_SHARES)
+        self.uptime = Ewma(TAU_UPTIME)
+        self.restarts = 0
+        # Zeitpunkt (Loop-Zeit) und Stand der letzten Samples je Quelle
+        self._summary: Optional[Tuple[float, float, Optional[float], Optional[float]]] = None
+        self._diff1: Optional[Tuple[float, float]] = None
+        self._estats_at: Optional[float] = None
+        self._restarted_at: Optional[float] = None
+
+    def update(self, now: float, data: Dict[str, Any], fresh: Iterable[str]) -> None:
+        """Snapshot nach einem Poll einarbeiten; nur Sections aus ``fresh`` liefern neue Samples"""
+        fresh = set(fresh)
+        if "summary" in fresh:
+            self._update_summary(now, data.get("summary"))
+        if "estats" in fresh:
+            power = _number(data.get("estats"), "PS", "PS_Power")
+            if power is not None:
+                self.power.add(power, now - self._estats_at if self._estats_at is not None else 0.0)
+                self._estats_at = now
+        if "pools" in fresh:
+            self._update_pools(now, data.get("pools"))
+
+    def _update_summary(self, now: float, summary: Any) -> None:
+        elapsed = _number(summary, "SUMMARY", "Elapsed")
+        if elapsed is None:
+            return
+        rejected = _number(summary, "SUMMARY", "Rejected")
+        stale = _number(summary, "SUMMARY", "Stale")
+        reported = _number(summary, "SUMMARY", "MHS 5s")
+        previous = self._summary
+        self._summary = (now, elapsed, rejected, stale)
+        if previous is None:
+            if reported is not None:
+                self.hashrate.add(reported * 1e6, 0.0)
+            return
+
+        dt = now - previous[0]
+        if dt <= 0:
+            return
+        restarted = elapsed < previous[1]
+        if restarted:
+            self.restarts += 1
+            self._restarted_at = now
+        # Anteil des Intervalls, in dem CGMiner lief
+        ran = elapsed if restarted else elapsed - previous[1]
+        self.uptime.add(min(1.0, max(0.0, ran / dt)), dt)
+        if reported is not None:
+            self.hashrate.add(reported * 1e6, dt)
+        for ewma, current, before in ((self.rejects, rejected, previous[2]), (self.stales, stale, previous[3])):
+            if current is None:
+                continue
+            delta = _delta(current, before, restarted)
+            if delta is not None:
+                ewma.add(delta * 60 / dt, dt)
+
+    def _update_pools(self, now: float, pools: Any) -> None:
+        if not isinstance(pools, dict):
+            return
+        values = [_number(pools.get(pool_id), "Diff1 Shares") for pool_id in POOL_IDS]
+        present = [value for value in values if value is not None]
+        if not present:
+            return
+        diff1 = sum(present)
+        previous = self._diff1
+        self._diff1 = (now, diff1)
+        if previous is None:
+            return
+        dt = now - previous[0]
+        if dt <= 0:
+            return
+        # Neustart seit dem letzten Pool-Sample -> Zähler beginnen bei 0
+        restarted = self._restarted_at is not None and self._restarted_at > previous[0]
+        delta = _delta(diff1, previous[1], restarted)
+        if delta is not None:
+            self.effective.add(delta * DIFF1_HASHES / dt, dt)
+
+    @property
+    def efficiency(self) -> Optional[float]:
+        """J/TH = W / (TH/s)"""
+        if self.power.value is None or not self.hashrate.value:
+            return None
+        return self.power.value / (self.hashrate.value / 1e12)
+
+    @property
+    def effective_ratio(self) -> Optional[float]:
+        """Effektive / gemeldete Hashrate in %"""
+        if self.effective.value is None or not self.hashrate.value:
+            return None
+        return 100 * self.effective.value / self.hashrate.value
+
+    def as_dict(self) -> Dict[str, Any]:
+        def _round(value: Optional[float], digits: int) -> Optional[float]:
+            return round(value, digits) if value is not None else None
+
+        return {
+            "efficiency_j_per_th": _round(self.efficiency, 2),
+            "hashrate_reported_ths": _round(self.hashrate.value and self.hashrate.value / 1e12, 3),
+            "hashrate_effective_ths": _round(self.effective.value and self.effective.value / 1e12, 3),
+            "hashrate_effective_ratio": _round(self.effective_ratio, 1),
+            "reject_rate_per_min": _round(self.rejects.value, 3),
+            "stale_rate_per_min": _round(self.stales.value, 3),
+            "uptime_fraction": _round(self.uptime.value and 100 * self.uptime.value, 2),
+            "restarts": self.restarts,
+        }
@@ -0,0 +1,55 @@
+"""Diagnose-Download: Verbindung, Latenzen je Befehl und Poll-Statistik je Miner."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import entry_miners
+from .const import CONF_WEB_PASSWORD, DOMAIN
+
+TO_REDACT = {
+    CONF_WEB_PASSWORD,
+    *(f"pool{idx}_{field}" for idx in (1, 2, 3) for field in ("user", "password")),
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    data = hass.data[DOMAIN][entry.entry_id]
+    miners = {}
+    for miner in entry_miners(hass, entry):
+        api = miner["api"]
+        coordinator = miner["coordinator"]
+        miners[f"{api.host}:{api.port}"] = {
+            "last_update_success": coordinator.last_update_success,
+            "polls": coordinator.poll_stats(),
+            "stale_sections": coordinator.stale_sections,
+            "wanted_sections": sorted(coordinator.wanted_sections) if coordinator.wanted_sections is not None else None,
+            "read_backs": coordinator.read_backs,
+            "connection": api.breaker.as_dict(),
+            "timeouts": {**api.timeouts},
+            "queue": {"active": api.queue.active, "waiting": api.queue.waiting, "limit": api.queue.limit},
+            # Netzwerk-Werte je gesendetem (ggf. gejointem) Befehl, Parse-Zeit je Abschnitt
+            "commands": api.metrics.as_dict(),
+            "derived": coordinator.derived.as_dict(),
+        }
+        if coordinator.history is not None:
+            miners[f"{api.host}:{api.port}"]["history"] = {
+                "samples": coordinator.history.raw.count,
+                "bytes": coordinator.history.nbytes,
+            }
+        if "proxy" in miner:
+            miners[f"{api.host}:{api.port}"]["proxy"] = miner["proxy"].as_dict()
+
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "miners": miners,
+    }
+    if "scheduler" in data:
+        diagnostics["scheduler"] = data["scheduler"].metrics()
+    return diagnostics
@@ -0,0 +1,97 @@
+"""Netzwerksuche: CIDR-Bereiche nach CGMiner-APIs (TCP 4028) absuchen."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from .avalon_api import MAX_RESPONSE_SIZE, RESPONSE_TERMINATOR, _parse_text
+from .const import (
+    DEFAULT_PORT,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_CONNECT_TIMEOUT,
+    DISCOVERY_PROBE_TIMEOUT,
+    SUPPORTED_MODELS,
+)
+from .fleet import expand_hosts
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def _port_open(host: str, port: int, timeout: float) -> bool:
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def _query(host: str, port: int, command: str) -> str:
+    """Ein Befehl, eine Verbindung; danach wird der Socket ohne Abschied verworfen"""
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_RESPONSE_SIZE)
+    try:
+        writer.write(command.encode("utf-8"))
+        await writer.drain()
+        try:
+            raw = await reader.readuntil(RESPONSE_TERMINATOR)
+        except asyncio.IncompleteReadError as err:
+            # Firmware ohne Terminator: Verbindung wurde nach der Antwort geschlossen
+            raw = err.partial
+    finally:
+        writer.transport.abort()
+    return raw.rstrip(RESPONSE_TERMINATOR).decode("utf-8", errors="ignore").strip()
+
+
+async def probe_miner(host: str, port: int = DEFAULT_PORT, timeout: float = DISCOVERY_PROBE_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """``version`` abfragen; VERSION-Section bei einem unterstützten MODEL, sonst None.
+
+    Einmalige Anfrage ohne ``AsyncAvalonAPI``: gescannte Hosts hinterlassen
+    keine HostQueue, keinen Circuit Breaker, keine Messwerte und keinen
+    Transport-Eintrag in den Registries der API.
+    """
+    try:
+        reply = await asyncio.wait_for(_query(host, port, "version"), timeout=timeout)
+        version = _parse_text(reply, {}).get("VERSION", {})
+    except Exception as err:  # keine CGMiner-API hinter dem offenen Port
+        _LOGGER.debug("Version probe of %s failed: %s", host, err)
+        return None
+    if not isinstance(version, dict):
+        return None
+    if str(version.get("MODEL", "")).lower() not in SUPPORTED_MODELS:
+        _LOGGER.debug("Skipping %s: model %s not supported", host, version.get("MODEL"))
+        return None
+    return version
+
+
+async def async_discover(
+    networks: str,
+    port: int = DEFAULT_PORT,
+    max_concurrent: int = DISCOVERY_CONCURRENCY,
+    connect_timeout: float = DISCOVERY_CONNECT_TIMEOUT,
+    probe_timeout: float = DISCOVERY_PROBE_TIMEOUT,
+) -> Dict[str, Dict[str, Any]]:
+    """Alle Hosts der Netze scannen -> {Host: VERSION-Section} der gefundenen Nano 3S.
+
+    Erst nur TCP-Connect mit kurzem Timeout (höchstens ``max_concurrent``
+    gleichzeitig), danach ``version`` nur für Hosts mit offenem Port.
+    ``networks`` wie beim Hub (IPs, Hostnamen, CIDR); ValueError bei
+    ungültiger Eingabe.
+    """
+    hosts = expand_hosts(networks)
+    limit = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def _check(host: str) -> Optional[Dict[str, Any]]:
+        async with limit:
+            if not await _port_open(host, port, connect_timeout):
+                return None
+        return await probe_miner(host, port, probe_timeout)
+
+    results: List[Optional[Dict[str, Any]]] = await asyncio.gather(*(_check(host) for host in hosts))
+    found = {host: version for host, version in zip(hosts, results) if version is not None}
+    _LOGGER.debug("Discovery: %d of %d hosts are supported miners", len(found), len(hosts))
+    return found
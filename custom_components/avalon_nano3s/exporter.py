@@ -0,0 +1,48 @@
+"""OpenMetrics-Endpunkt ``/api/avalon_nano3s/metrics`` für alle konfigurierten Miner.
+
+Gerendert wird aus den Coordinator-Snapshots; ein Scrape löst keine
+Miner-Anfrage aus. Authentifizierung wie jede HA-API (Long-Lived Token als
+Bearer im Prometheus-Scrape-Job).
+"""
+from __future__ import annotations
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .openmetrics import CONTENT_TYPE, OpenMetricsRenderer
+
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+_VIEW_REGISTERED = f"{DOMAIN}_metrics_view"
+
+
+class AvalonMetricsView(HomeAssistantView):
+    """Alle Miner aller geladenen Entries als OpenMetrics-Text"""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._renderer = OpenMetricsRenderer()
+
+    def _coordinators(self):
+        # wie entry_miners: Hub-Entries halten "miners", Einzel-Entries den Miner selbst
+        for data in self.hass.data.get(DOMAIN, {}).values():
+            for miner in data["miners"].values() if "miners" in data else (data,):
+                yield miner["coordinator"]
+
+    async def get(self, request: web.Request) -> web.Response:
+        body = self._renderer.render(self._coordinators())
+        return web.Response(body=body.encode(), headers={"Content-Type": CONTENT_TYPE})
+
+
+@callback
+def async_register_exporter(hass: HomeAssistant) -> None:
+    """View einmal je HA-Instanz registrieren (Views lassen sich nicht entfernen; ohne Entries bleibt die Seite leer)"""
+    if hass.data.get(_VIEW_REGISTERED):
+        return
+    hass.http.register_view(AvalonMetricsView(hass))
+    hass.data[_VIEW_REGISTERED] = True
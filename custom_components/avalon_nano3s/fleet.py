@@ -0,0 +1,168 @@
+"""Fleet-Hub: ein gemeinsamer Scheduler für viele Miner in einem Config-Entry."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import ipaddress
+import logging
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from .const import DEFAULT_MAX_CONCURRENT, DEFAULT_POLL_JITTER, MAX_HUB_HOSTS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Zeitfenster für Miner/s
+_RATE_WINDOW = 60.0
+
+
+def expand_hosts(text: str, limit: int = MAX_HUB_HOSTS) -> List[str]:
+    """Host-Liste aus IPs, Hostnamen und CIDR-Netzen (getrennt durch Komma, Leerzeichen oder Zeilen).
+
+    Reihenfolge bleibt erhalten, Duplikate fallen weg. ValueError bei
+    ungültigem Netz oder mehr als ``limit`` Hosts.
+    """
+    hosts: Dict[str, None] = {}
+    for token in text.replace(",", " ").split():
+        if "/" in token:
+            network = ipaddress.ip_network(token, strict=False)
+            if network.num_addresses > limit + 2:
+                raise ValueError(f"Network {token} has more than {limit} hosts")
+            # /32 bzw. /31 haben keine Netz-/Broadcast-Adresse
+            addresses = network.hosts() if network.num_addresses > 2 else iter(network)
+            for address in addresses:
+                hosts[str(address)] = None
+        else:
+            hosts[token] = None
+        if len(hosts) > limit:
+            raise ValueError(f"More than {limit} hosts")
+    return list(hosts)
+
+
+class FleetScheduler:
+    """Pollt alle Miner eines Hubs über eine gemeinsame Warteschlange.
+
+    - feste Phase je Host, gleichmäßig über das Intervall verteilt, plus
+      zufälliger Jitter je Poll, damit nicht alle Miner gleichzeitig dran sind
+    - höchstens ``max_concurrent`` Polls gleichzeitig (global)
+    - Round-Robin: fällige Hosts werden nach Fälligkeit, bei Gleichstand in
+      Einreihungs-Reihenfolge bedient; verpasste Slots werden übersprungen
+      statt nachgeholt, so dass kein Host die Warteschlange blockiert
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        jitter: float = DEFAULT_POLL_JITTER,
+    ) -> None:
+        self.interval = interval
+        self.max_concurrent = max(1, max_concurrent)
+        self.jitter = max(0.0, jitter) * interval
+        self._polls: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        # (fällig, Sequenz, Host, Phase)
+        self._queue: List[Tuple[float, int, str, float]] = []
+        self._seq = 0
+        # laufender Poll -> (Host, Phase)
+        self._running: Dict[asyncio.Task, Tuple[str, float]] = {}
+        self._wakeup = asyncio.Event()
+        self._listeners: List[Callable[[], None]] = []
+        self._last_publish = 0.0
+        self._started: Optional[float] = None
+        # Metriken
+        self.queue_depth = 0
+        self.lateness: Deque[float] = deque(maxlen=256)
+        self._completed: Deque[float] = deque()
+        self.skipped = 0
+
+    def add(self, host: str, poll: Callable[[], Awaitable[Any]]) -> None:
+        self._polls[host] = poll
+
+    @property
+    def hosts(self) -> List[str]:
+        return list(self._polls)
+
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Callback nach jedem Intervall mit neuen Metriken; gibt Unsubscribe zurück"""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    def metrics(self) -> Dict[str, Any]:
+        lateness = list(self.lateness)
+        now = asyncio.get_running_loop().time()
+        while self._completed and now - self._completed[0] > _RATE_WINDOW:
+            self._completed.popleft()
+        window = min(_RATE_WINDOW, now - self._started) if self._started is not None else 0.0
+        return {
+            "miners": len(self._polls),
+            "running": len(self._running),
+            "queue_depth": self.queue_depth,
+            "lateness_avg": round(sum(lateness) / len(lateness), 3) if lateness else 0.0,
+            "lateness_max": round(max(lateness), 3) if lateness else 0.0,
+            "miners_per_second": round(len(self._completed) / window, 2) if window > 0 else 0.0,
+            "skipped_polls": self.skipped,
+        }
+
+    def _enqueue(self, host: str, phase: float) -> None:
+        self._seq += 1
+        due = phase + (random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        heapq.heappush(self._queue, (due, self._seq, host, phase))
+
+    async def _poll(self, host: str) -> None:
+        try:
+            await self._polls[host]()
+        except Exception as err:  # Fehler landen schon im Coordinator; Scheduler läuft weiter
+            _LOGGER.debug("Poll of %s failed: %s", host, err)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        host, phase = self._running.pop(task)
+        now = asyncio.get_running_loop().time()
+        self._completed.append(now)
+        phase += self.interval
+        if phase <= now:
+            # Poll hat länger als ein Intervall gewartet/gedauert -> verpasste Slots auslassen
+            missed = int((now - phase) // self.interval) + 1
+            self.skipped += missed
+            phase += missed * self.interval
+        self._enqueue(host, phase)
+        self._wakeup.set()
+
+    async def async_run(self) -> None:
+        """Scheduler-Schleife (läuft bis zum Abbruch des Tasks)"""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        hosts = list(self._polls)
+        for index, host in enumerate(hosts):
+            self._enqueue(host, start + self.interval * index / len(hosts))
+        self._last_publish = self._started = start
+        try:
+            while True:
+                now = loop.time()
+                while self._queue and self._queue[0][0] <= now and len(self._running) < self.max_concurrent:
+                    due, _, host, phase = heapq.heappop(self._queue)
+                    self.lateness.append(now - due)
+                    task = asyncio.ensure_future(self._poll(host))
+                    self._running[task] = (host, phase)
+                    task.add_done_callback(self._on_done)
+
+                if now - self._last_publish >= self.interval:
+                    self._last_publish = now
+                    # fällige, aber mangels freier Slots wartende Polls
+                    self.queue_depth = sum(1 for item in self._queue if item[0] <= now)
+                    for update_callback in list(self._listeners):
+                        update_callback()
+
+                self._wakeup.clear()
+                if self._queue and len(self._running) < self.max_concurrent:
+                    timeout: Optional[float] = max(0.0, self._queue[0][0] - now)
+                else:
+                    timeout = self.interval
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(timeout, self.interval))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in list(self._running):
+                task.remove_done_callback(self._on_done)
+                task.cancel()
@@ -4,24 +4,20 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from .const import DOMAIN
+from . import async_add_miner_entities
+from .coalesce import CoalescingWriter
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    data = hass.data[DOMAIN][entry.entry_id]
-
-    coordinator = data["coordinator"]
-    api = data["api"]
-    device_info = data["device_info"]
-
-    async_add_entities(
-        [
-            AvalonLedLight(coordinator, api, entry.entry_id, device_info),
+    def create_lights(miner: dict) -> list:
+        return [
+            AvalonLedLight(miner["coordinator"], miner["api"], miner["unique_prefix"], miner["device_info"]),
         ]
-    )
+
+    async_add_miner_entities(hass, entry, async_add_entities, create_lights)
 
 
 # =========================
@@ -42,7 +38,8 @@ class AvalonLedLight(CoordinatorEntity, LightEntity):
         entry_id: str,
         device_info: dict,
     ):
-        super().__init__(coordinator)
+        # Nur bei Änderungen an estats["led"] aktualisieren
+        super().__init__(coordinator, context=("estats", "led"))
         self.api = api
         
         self._attr_unique_id = f"{entry_id}_led"
@@ -56,6 +53,35 @@ class AvalonLedLight(CoordinatorEntity, LightEntity):
         # Basisfarbe für Palette
         self._base_rgb_color = (255, 255, 255)
 
+        # Slider/Farbwähler erzeugen viele Aufrufe -> nur der letzte set_led geht raus
+        self._writer = CoalescingWriter(
+            coordinator.hass,
+            coordinator.config_entry,
+            lambda args: self.api.set_led(*args),
+            self._async_read_back,
+            name="led",
+        )
+
+    async def _async_read_back(self, args, started: float) -> None:
+        """Nur estats zurücklesen und prüfen, ob Effekt und Helligkeit übernommen wurden"""
+        effect, percent = args[0], args[1]
+
+        def verify(data):
+            user = data["estats"]["led"]["LEDUser"]
+            return user["Effect"] == effect and (effect == 0 or user["Brightness"] == percent)
+
+        await self.coordinator.async_read_back("led", verify, started)
+        # Zustand aus den zurückgelesenen Daten übernehmen (auch wenn unverändert)
+        self._handle_coordinator_update()
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.read_backs.get("led")
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._writer.cancel()
+        await super().async_will_remove_from_hass()
+
     # =========================
     # Firmware-kompatible RGB-Berechnung
     # =========================
@@ -83,10 +109,17 @@ class AvalonLedLight(CoordinatorEntity, LightEntity):
     # Coordinator Update
     # =========================
     def _handle_coordinator_update(self) -> None:
+        if self._writer.pending:
+            # Schreiben läuft noch -> optimistischen Zustand behalten
+            self.async_write_ha_state()
+            return
+
         led = self.coordinator.data.get("estats", {}).get("led", {})
         user = led.get("LEDUser", {})
 
         if not isinstance(user, dict):
+            # nur Verfügbarkeit übernehmen
+            self.async_write_ha_state()
             return
 
         effect = user.get("Effect", 0)
@@ -136,7 +169,7 @@ class AvalonLedLight(CoordinatorEntity, LightEntity):
 
             self._attr_rgb_color = (r, g, b)
 
-            await self.api.set_led(1, percent, 50, r, g, b)
+            self._writer.submit((1, percent, 50, r, g, b))
 
             self.async_write_ha_state()
             return
@@ -151,7 +184,7 @@ class AvalonLedLight(CoordinatorEntity, LightEntity):
             self._base_rgb_color, self._attr_brightness
         )
 
-        await self.api.set_led(1, percent, 50, r, g, b)
+        self._writer.submit((1, percent, 50, r, g, b))
 
         self._attr_is_on = True
         self._attr_rgb_color = (r, g, b)
@@ -162,7 +195,7 @@ class AvalonLedLight(CoordinatorEntity, LightEntity):
     # Ausschalten
     # =========================
     async def async_turn_off(self, **kwargs):
-        await self.api.set_led(0, 5, 50, 0, 0, 0)
+        self._writer.submit((0, 5, 50, 0, 0, 0))
 
         self._attr_is_on = False
         self._attr_brightness = 0
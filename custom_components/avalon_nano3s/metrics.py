@@ -0,0 +1,124 @@
+"""Rollierende Messwerte je Miner und Befehl (Netzwerk-, Miner- und Parse-Zeit, Größe, Fehler)."""
+from __future__ import annotations
+
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+
+# Letzte Messwerte je Histogramm
+HISTOGRAM_SIZE = 256
+
+
+class RollingHistogram:
+    """Die letzten ``size`` Messwerte; Perzentile werden erst beim Auslesen berechnet"""
+
+    __slots__ = ("_values", "_sorted")
+
+    def __init__(self, size: int = HISTOGRAM_SIZE) -> None:
+        self._values: Deque[float] = deque(maxlen=size)
+        # sortierte Kopie, bis zum nächsten add gültig
+        self._sorted: Optional[List[float]] = None
+
+    def add(self, value: float) -> None:
+        self._values.append(value)
+        self._sorted = None
+
+    def _ordered(self) -> List[float]:
+        if self._sorted is None:
+            self._sorted = sorted(self._values)
+        return self._sorted
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self._values:
+            return None
+        ordered = self._ordered()
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    def summary(self, scale: float = 1.0, digits: int = 3) -> Dict[str, Any]:
+        """count, avg, p50, p95, max (Werte mit ``scale`` multipliziert, z.B. 1000 für ms)"""
+        if not self._values:
+            return {"count": 0}
+        ordered = self._ordered()
+        last = len(ordered) - 1
+        return {
+            "count": len(ordered),
+            "avg": round(sum(ordered) / len(ordered) * scale, digits),
+            "p50": round(ordered[int(round(0.5 * last))] * scale, digits),
+            "p95": round(ordered[int(round(0.95 * last))] * scale, digits),
+            "max": round(ordered[last] * scale, digits),
+        }
+
+
+class CommandStats:
+    """Messwerte eines Befehls (bzw. gejointen Befehls) an einen Miner"""
+
+    __slots__ = ("connect", "first_byte", "total", "size", "parse", "retries", "requests", "failures")
+
+    def __init__(self) -> None:
+        self.connect = RollingHistogram()
+        self.first_byte = RollingHistogram()
+        self.total = RollingHistogram()
+        self.size = RollingHistogram()
+        self.parse = RollingHistogram()
+        self.retries = RollingHistogram()
+        self.requests = 0
+        # Fehlergrund (Exception-Name, "circuit_open") -> Anzahl
+        self.failures: Counter = Counter()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Zusammenfassung; Netzwerk-Werte stehen beim gesendeten (ggf. gejointen) Befehl, Parse-Zeit je Abschnitt"""
+        data: Dict[str, Any] = {}
+        if self.requests:
+            data["requests"] = self.requests
+            data["failures"] = dict(self.failures)
+        for key, histogram, scale, digits in (
+            ("connect_ms", self.connect, 1000, 3),
+            ("first_byte_ms", self.first_byte, 1000, 3),
+            ("total_ms", self.total, 1000, 3),
+            ("bytes", self.size, 1, 0),
+            ("parse_ms", self.parse, 1000, 3),
+            ("retries", self.retries, 1, 2),
+        ):
+            if len(histogram):
+                data[key] = histogram.summary(scale, digits)
+        return data
+
+
+class HostMetrics:
+    """Messwerte aller Befehle eines Miners, gemeinsam für alle API-Instanzen des Hosts"""
+
+    def __init__(self) -> None:
+        self.commands: Dict[str, CommandStats] = {}
+
+    def command(self, label: str) -> CommandStats:
+        stats = self.commands.get(label)
+        if stats is None:
+            stats = self.commands[label] = CommandStats()
+        return stats
+
+    def record_exchange(self, label: str, connect: float, first_byte: float, total: float, size: int) -> None:
+        stats = self.command(label)
+        stats.connect.add(connect)
+        stats.first_byte.add(first_byte)
+        stats.total.add(total)
+        stats.size.add(size)
+
+    def record_result(self, label: str, retries: int, failure: Optional[str] = None) -> None:
+        stats = self.command(label)
+        stats.requests += 1
+        stats.retries.add(retries)
+        if failure is not None:
+            stats.failures[failure] += 1
+
+    def record_parse(self, label: str, seconds: float) -> None:
+        self.command(label).parse.add(seconds)
+
+    def parse_p95(self) -> Optional[float]:
+        """Langsamstes p95 der Parse-Zeit über alle Befehle (s)"""
+        values = [stats.parse.percentile(0.95) for stats in self.commands.values() if len(stats.parse)]
+        return max(values) if values else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {label: stats.as_dict() for label, stats in self.commands.items()}
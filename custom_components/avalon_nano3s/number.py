@@ -11,9 +11,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import AvalonMinerCoordinator
+from . import AvalonMinerCoordinator, async_add_miner_entities
 from .avalon_api import AsyncAvalonAPI
-from .const import DOMAIN
+from .coalesce import CoalescingWriter
 
 
 async def async_setup_entry(
@@ -22,22 +22,17 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
 
-    data = hass.data[DOMAIN][entry.entry_id]
-
-    coordinator: AvalonMinerCoordinator = data["coordinator"]
-    api: AsyncAvalonAPI = data["api"]
-    device_info = data["device_info"]
-
-    async_add_entities(
-        [
+    def create_numbers(miner: dict) -> list:
+        return [
             AvalonFanSpeedNumber(
-                coordinator,
-                api,
-                entry.entry_id,
-                device_info,
+                miner["coordinator"],
+                miner["api"],
+                miner["unique_prefix"],
+                miner["device_info"],
             )
         ]
-    )
+
+    async_add_miner_entities(hass, entry, async_add_entities, create_numbers)
 
 
 class AvalonFanSpeedNumber(CoordinatorEntity, NumberEntity):
@@ -58,7 +53,7 @@ class AvalonFanSpeedNumber(CoordinatorEntity, NumberEntity):
         entry_id: str,
         device_info: dict,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("estats", "fans"))
 
         self.api = api
         self._fan_speed = None
@@ -66,6 +61,28 @@ class AvalonFanSpeedNumber(CoordinatorEntity, NumberEntity):
         self._attr_unique_id = f"{entry_id}_fan_speed"
         self._attr_device_info = device_info
 
+        # Slider: nur der letzte Wert wird gesendet, danach estats zurücklesen
+        self._writer = CoalescingWriter(
+            coordinator.hass, coordinator.config_entry, api.set_fan_speed, self._async_read_back, name="fan speed"
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._writer.cancel()
+        await super().async_will_remove_from_hass()
+
+    async def _async_read_back(self, value: int, started: float) -> None:
+        verified = await self.coordinator.async_read_back(
+            "fan_speed", lambda data: int(data["estats"]["fans"]["FanR"]) == value, started
+        )
+        if not verified:
+            # Miner hat den Wert nicht übernommen -> gemeldeten Wert anzeigen
+            self._fan_speed = None
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.read_backs.get("fan_speed")
+
     @property
     def native_value(self):
         if self._fan_speed is not None:
@@ -79,11 +96,7 @@ class AvalonFanSpeedNumber(CoordinatorEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         value = int(value)
 
-        await self.api.set_fan_speed(value)
-
-        # Optimistisches Update
+        # Optimistisches Update, Befehl und Refresh gebündelt im Hintergrund
         self._fan_speed = value
+        self._writer.submit(value)
         self.async_write_ha_state()
-
-        # Miner später abfragen
-        await self.coordinator.async_request_refresh()
@@ -0,0 +1,265 @@
+"""OpenMetrics-Text aus den Coordinator-Snapshots aller Miner (ohne zusätzliche Miner-Anfragen).
+
+Label-Sätze und Sample-Präfixe werden je Miner einmal gebaut und
+wiederverwendet. Die API liefert für unveränderte Antworten dasselbe
+Objekt wie zuvor; die Zeilen einer Section werden deshalb nur neu
+gerendert, wenn sich ihr Objekt in ``coordinator.data`` geändert hat.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Einzelwerte: Metrik -> (Typ, Hilfe, Pfad in coordinator.data, Faktor)
+SCALAR_METRICS: Dict[str, Tuple[str, str, Tuple[str, ...], float]] = {
+    "avalon_hashrate_average_hashes_per_second": (
+        "gauge", "Average hashrate since start", ("summary", "SUMMARY", "MHS av"), 1e6,
+    ),
+    "avalon_hashrate_5s_hashes_per_second": (
+        "gauge", "Hashrate over the last 5 seconds", ("summary", "SUMMARY", "MHS 5s"), 1e6,
+    ),
+    "avalon_uptime_seconds": ("gauge", "CGMiner uptime", ("summary", "SUMMARY", "Elapsed"), 1),
+    "avalon_shares_accepted": ("counter", "Accepted shares", ("summary", "SUMMARY", "Accepted"), 1),
+    "avalon_shares_rejected": ("counter", "Rejected shares", ("summary", "SUMMARY", "Rejected"), 1),
+    "avalon_shares_stale": ("counter", "Stale shares", ("summary", "SUMMARY", "Stale"), 1),
+    "avalon_hardware_errors": ("counter", "Hardware errors", ("summary", "SUMMARY", "Hardware Errors"), 1),
+    "avalon_difficulty_accepted": (
+        "counter", "Accepted difficulty", ("summary", "SUMMARY", "Difficulty Accepted"), 1,
+    ),
+    "avalon_power_watts": ("gauge", "Power supply output power", ("estats", "PS", "PS_Power"), 1),
+    "avalon_fan_speed_percent": ("gauge", "Fan speed setting", ("estats", "fans", "FanR"), 1),
+    "avalon_workmode": ("gauge", "Work mode (0 low, 1 medium, 2 high)", ("estats", "WORKMODE"), 1),
+}
+
+# Werte eines Abschnitts, ein Sample je Schlüssel: Metrik -> (Typ, Hilfe, Pfad, Label, ausgelassene Schlüssel)
+KEYED_METRICS: Dict[str, Tuple[str, str, Tuple[str, ...], str, frozenset]] = {
+    "avalon_temperature_celsius": ("gauge", "Temperatures", ("estats", "temperatures"), "sensor", frozenset()),
+    "avalon_fan_rpm": ("gauge", "Fan speed", ("estats", "fans"), "fan", frozenset({"FanR"})),
+    # Status/Reserved sind Flags, keine Messwerte; PS_Power steht schon in avalon_power_watts
+    "avalon_ps": (
+        "gauge", "Power supply readings", ("estats", "PS"), "field",
+        frozenset({"PS_Status", "PS_Reserved", "PS_Power"}),
+    ),
+}
+
+
+def _flag(expected: str) -> Callable[[Any], int]:
+    return lambda value: int(str(value).lower() == expected)
+
+
+# Je Pool (Labels pool, url): Metrik -> (Typ, Hilfe, Schlüssel, Umwandlung)
+POOL_METRICS: Dict[str, Tuple[str, str, str, Optional[Callable[[Any], Any]]]] = {
+    "avalon_pool_active": ("gauge", "Pool is the active stratum connection", "Stratum Active", _flag("true")),
+    "avalon_pool_alive": ("gauge", "Pool is alive", "Status", _flag("alive")),
+    "avalon_pool_shares_accepted": ("counter", "Accepted shares per pool", "Accepted", None),
+    "avalon_pool_shares_rejected": ("counter", "Rejected shares per pool", "Rejected", None),
+    "avalon_pool_shares_stale": ("counter", "Stale shares per pool", "Stale", None),
+    "avalon_pool_difficulty": ("gauge", "Current stratum difficulty", "Stratum Difficulty", None),
+    "avalon_pool_last_share_timestamp_seconds": ("gauge", "Time of the last share", "Last Share Time", None),
+}
+POOL_IDS = ("p1", "p2", "p3")
+
+# Poll-Zustand der Integration
+POLL_METRICS: Dict[str, Tuple[str, str]] = {
+    "avalon_up": ("gauge", "Last poll succeeded"),
+    # Quantile über ein rollierendes Fenster: summary ohne _count/_sum (die wären keine Counter)
+    "avalon_poll_latency_seconds": ("summary", "Poll latency quantiles over the last polls"),
+    "avalon_poll_failure_ratio": ("gauge", "Share of failed polls over the last polls"),
+    "avalon_stale_sections": ("gauge", "Sections that missed the last poll deadline"),
+}
+POLL_QUANTILES = (0.5, 0.95)
+
+_FAMILIES: Dict[str, Tuple[str, str]] = {
+    **{name: spec[:2] for name, spec in SCALAR_METRICS.items()},
+    **{name: spec[:2] for name, spec in KEYED_METRICS.items()},
+    **{name: spec[:2] for name, spec in POOL_METRICS.items()},
+    **POLL_METRICS,
+}
+# Kopfzeilen je Familie
+_HEADERS = {name: f"# TYPE {name} {kind}\n# HELP {name} {text}\n" for name, (kind, text) in _FAMILIES.items()}
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name: str) -> str:
+    """Sample-Name: Counter bekommen ``_total``"""
+    return f"{name}_total" if _FAMILIES[name][0] == "counter" else name
+
+
+def _number(value: Any) -> Optional[str]:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    return None
+
+
+def _lookup(data: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+class _MinerLabels:
+    """Vorgefertigte Sample-Präfixe eines Miners, z.B. ``avalon_up{host="…",port="4028"} ``"""
+
+    __slots__ = ("base", "scalar", "quantiles", "keyed", "pools", "sections")
+
+    def __init__(self, host: str, port: int) -> None:
+        self.base = f'host="{_escape(host)}",port="{port}"'
+        self.scalar = {name: f"{_sample(name)}{{{self.base}}} " for name in (*SCALAR_METRICS, *POLL_METRICS)}
+        self.quantiles = {
+            quantile: f'avalon_poll_latency_seconds{{{self.base},quantile="{quantile}"}} '
+            for quantile in POLL_QUANTILES
+        }
+        # (Metrik, Schlüssel) -> Präfix
+        self.keyed: Dict[Tuple[str, str], str] = {}
+        # (Pool, URL) -> Metrik -> Präfix
+        self.pools: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # Section -> (gerendertes Objekt, Metrik -> Zeilen)
+        self.sections: Dict[str, Tuple[Any, Dict[str, List[str]]]] = {}
+
+    def key(self, name: str, key: str) -> str:
+        prefix = self.keyed.get((name, key))
+        if prefix is None:
+            label = KEYED_METRICS[name][3]
+            prefix = self.keyed[(name, key)] = f'{name}{{{self.base},{label}="{_escape(key)}"}} '
+        return prefix
+
+    def pool(self, pool_id: str, url: str) -> Dict[str, str]:
+        prefixes = self.pools.get((pool_id, url))
+        if prefixes is None:
+            # URL-Wechsel: alten Satz dieses Pools verwerfen
+            for stale in [item for item in self.pools if item[0] == pool_id]:
+                del self.pools[stale]
+            labels = f'{self.base},pool="{pool_id}",url="{_escape(url)}"'
+            prefixes = self.pools[(pool_id, url)] = {name: f"{_sample(name)}{{{labels}}} " for name in POOL_METRICS}
+        return prefixes
+
+
+class OpenMetricsRenderer:
+    """Rendert die Snapshots beliebig vieler Coordinators als eine OpenMetrics-Seite"""
+
+    def __init__(self) -> None:
+        # (host, port) -> Label-Sätze; Miner, die verschwinden, fallen beim nächsten Rendern raus
+        self._labels: Dict[Tuple[str, int], _MinerLabels] = {}
+
+    def render(self, coordinators: Iterable[Any]) -> str:
+        samples: Dict[str, List[str]] = {name: [] for name in _FAMILIES}
+        # Ein Miner kann in mehreren Config-Entries stehen -> je (host, port) ein Coordinator,
+        # bevorzugt einer mit erfolgreichem letzten Poll
+        miners: Dict[Tuple[str, int], Any] = {}
+        for coordinator in coordinators:
+            key = (coordinator.api.host, coordinator.api.port)
+            chosen = miners.get(key)
+            if chosen is None or (coordinator.last_update_success and not chosen.last_update_success):
+                miners[key] = coordinator
+        seen: Dict[Tuple[str, int], _MinerLabels] = {}
+        for key, coordinator in miners.items():
+            labels = self._labels.get(key) or _MinerLabels(*key)
+            seen[key] = labels
+            self._render_miner(coordinator, labels, samples)
+        self._labels = seen
+
+        out: List[str] = []
+        for name, lines in samples.items():
+            if lines:
+                out.append(_HEADERS[name])
+                out.extend(lines)
+        out.append("# EOF\n")
+        return "".join(out)
+
+    @staticmethod
+    def _render_miner(coordinator: Any, labels: _MinerLabels, samples: Dict[str, List[str]]) -> None:
+        data = coordinator.data or {}
+        for section, render in _SECTION_RENDERERS.items():
+            current = data.get(section)
+            cached = labels.sections.get(section)
+            if cached is None or cached[0] is not current:
+                cached = labels.sections[section] = (current, render(current, labels))
+            for name, lines in cached[1].items():
+                samples[name].extend(lines)
+
+        prefixes = labels.scalar
+        samples["avalon_up"].append(f"{prefixes['avalon_up']}{int(coordinator.last_update_success)}\n")
+        samples["avalon_stale_sections"].append(
+            f"{prefixes['avalon_stale_sections']}{len(coordinator.stale_sections)}\n"
+        )
+        for quantile, prefix in labels.quantiles.items():
+            value = coordinator.poll_latency.percentile(quantile)
+            if value is not None:
+                samples["avalon_poll_latency_seconds"].append(f"{prefix}{value!r}\n")
+        failure_rate = coordinator.poll_failure_rate()
+        if failure_rate is not None:
+            samples["avalon_poll_failure_ratio"].append(
+                f"{prefixes['avalon_poll_failure_ratio']}{failure_rate / 100!r}\n"
+            )
+
+
+def _render_scalars(section: str, data: Any, labels: _MinerLabels, lines: Dict[str, List[str]]) -> None:
+    for name, (_, _, path, factor) in SCALAR_METRICS.items():
+        if path[0] != section:
+            continue
+        value = _lookup(data, path[1:])
+        if factor != 1 and isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = value * factor
+        text = _number(value)
+        if text is not None:
+            lines[name] = [f"{labels.scalar[name]}{text}\n"]
+
+
+def _render_summary(data: Any, labels: _MinerLabels) -> Dict[str, List[str]]:
+    lines: Dict[str, List[str]] = {}
+    _render_scalars("summary", data, labels, lines)
+    return lines
+
+
+def _render_estats(data: Any, labels: _MinerLabels) -> Dict[str, List[str]]:
+    lines: Dict[str, List[str]] = {}
+    _render_scalars("estats", data, labels, lines)
+    for name, (_, _, path, _, skip) in KEYED_METRICS.items():
+        section = _lookup(data, path[1:])
+        if not isinstance(section, dict):
+            continue
+        keyed = []
+        for key, value in section.items():
+            # bools sind Fehler-Marker (parse_error, too_few_fields), keine Werte
+            text = None if isinstance(value, bool) else _number(value)
+            if text is not None and key not in skip:
+                keyed.append(f"{labels.key(name, key)}{text}\n")
+        lines[name] = keyed
+    return lines
+
+
+def _render_pools(data: Any, labels: _MinerLabels) -> Dict[str, List[str]]:
+    lines: Dict[str, List[str]] = {name: [] for name in POOL_METRICS}
+    if not isinstance(data, dict):
+        return lines
+    for pool_id in POOL_IDS:
+        pool = data.get(pool_id)
+        if not isinstance(pool, dict) or not pool.get("URL"):
+            continue
+        prefixes = labels.pool(pool_id, pool["URL"])
+        for name, (_, _, key, convert) in POOL_METRICS.items():
+            value = pool.get(key)
+            if value is None:
+                continue
+            text = _number(convert(value) if convert is not None else value)
+            if text is not None:
+                lines[name].append(f"{prefixes[name]}{text}\n")
+    return lines
+
+
+# Section in coordinator.data -> Renderer ihrer Zeilen
+_SECTION_RENDERERS: Dict[str, Callable[[Any, _MinerLabels], Dict[str, List[str]]]] = {
+    "summary": _render_summary,
+    "estats": _render_estats,
+    "pools": _render_pools,
+}
@@ -0,0 +1,228 @@
+"""CGMiner-kompatibler TCP-Proxy: andere Tools teilen sich die Polls der Integration."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .avalon_api import (
+    BATCH_COMMANDS,
+    DERIVED_COMMANDS,
+    PRIORITY_CONTROL,
+    PRIORITY_SLOW,
+    RESPONSE_TERMINATOR,
+    AsyncAvalonAPI,
+    MinerUnavailable,
+    _decode_json,
+)
+from .const import DEFAULT_PROXY_MAX_AGE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Größte Anfrage eines Clients, Zeit bis sie vollständig sein muss
+MAX_REQUEST_SIZE = 65536
+REQUEST_TIMEOUT = 5
+
+
+def _parse_request(request: str) -> Tuple[str, str, bool]:
+    """(command, parameter, json) aus ``summary``, ``ascset|0,fan-spd,60`` oder ``{"command": ...}``"""
+    if request.startswith("{"):
+        decoded = json.loads(request)
+        if not isinstance(decoded, dict):
+            raise ValueError("JSON request is not an object")
+        return str(decoded.get("command", "")), str(decoded.get("parameter", "") or ""), True
+    command, _, parameter = request.partition("|")
+    return command, parameter, False
+
+
+def _text_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    # CGMiner escapet im Textmodus Trennzeichen mit Backslash
+    return str(value).replace("\\", "\\\\").replace(",", "\\,").replace("|", "\\|").replace("=", "\\=")
+
+
+def _text_from_json(reply: Dict[str, Any]) -> str:
+    """JSON-Antwort als CGMiner-Text (``STATUS=S,...|SUMMARY,Elapsed=...|``).
+
+    Wie bei ``_sections_from_json``: Sections mit führender ID ("POOL",
+    "STATS", "ASC") beginnen direkt mit ihrem ersten Key, alle anderen mit
+    dem Listen-Namen. Die Werte sind dieselben, nur Zahlen können anders
+    formatiert sein als beim Miner (``1.5`` statt ``1.50``).
+    """
+    parts: List[str] = []
+    for list_name, items in reply.items():
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            fields = ",".join(f"{key}={_text_value(value)}" for key, value in item.items())
+            first = next(iter(item), "")
+            if list_name == "STATUS" or (first.isupper() and type(item[first]) is int):
+                parts.append(f"{fields}|")
+            else:
+                parts.append(f"{list_name},{fields}|")
+    return "".join(parts)
+
+
+def _error_reply(is_json: bool, message: str) -> str:
+    status = {"STATUS": "E", "When": int(time.time()), "Code": 0, "Msg": message, "Description": "proxy"}
+    if is_json:
+        return json.dumps({"STATUS": [status], "id": 1})
+    return "STATUS=E,When={When},Code={Code},Msg={Msg},Description={Description}|".format(**status)
+
+
+class CGMinerProxy:
+    """Lokaler API-Port für einen Miner.
+
+    - Lese-Befehle (``summary``, ``stats``, ``estats``, ``pools``, ...,
+      auch gejoint) kommen aus den Rohantworten des letzten Polls
+      (``api.replies``), solange sie höchstens ``max_age`` s alt sind und
+      im Format des Clients (Text oder JSON) vorliegen
+    - alles andere (``ascset``, ``switchpool``, ...) und zu alte Lese-Befehle
+      gehen über ``api`` - also über dieselbe HostQueue und denselben
+      Circuit Breaker wie die Integration; der Miner sieht nur einen Client
+    - nach einem weitergeleiteten Steuerbefehl wird ``on_write`` aufgerufen
+      (z.B. Coordinator-Refresh)
+    """
+
+    def __init__(
+        self,
+        api: AsyncAvalonAPI,
+        max_age: float = DEFAULT_PROXY_MAX_AGE,
+        on_write: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.api = api
+        self.max_age = max_age
+        self.on_write = on_write
+        self.server: Optional[asyncio.AbstractServer] = None
+        # Zähler: aus dem Snapshot beantwortet, weitergeleitete Lese-/Steuerbefehle, Fehler
+        self.hits = 0
+        self.forwarded = 0
+        self.writes = 0
+        self.errors = 0
+        # Rohantworten mitschreiben (kostet Speicher, deshalb nur mit Proxy)
+        if api.replies is None:
+            api.replies = {}
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "forwarded": self.forwarded,
+            "writes": self.writes,
+            "errors": self.errors,
+            "max_age": self.max_age,
+        }
+
+    def _cached(self, commands: List[str], is_json: bool) -> Optional[str]:
+        """Antwort aus den gemerkten Rohantworten, None wenn etwas fehlt, zu alt ist oder im falschen Format vorliegt.
+
+        Abgeleitete Befehle (estats) kommen nie aus dem Snapshot: gemerkt ist
+        nur die Antwort ihrer Quelle (stats), nicht die echte Antwort des
+        Miners. Text-Clients bekommen JSON-Antworten der Integration als Text.
+        """
+        replies = self.api.replies or {}
+        now = time.monotonic()
+        parts: List[Any] = []
+        for cmd in commands:
+            stored = None if cmd in DERIVED_COMMANDS else replies.get(cmd)
+            if stored is None or now - stored[0] > self.max_age:
+                return None
+            reply = stored[1]
+            if is_json and isinstance(reply, str) and not reply.startswith("{"):
+                return None
+            parts.append(reply)
+
+        if not is_json:
+            texts = []
+            for part in parts:
+                decoded = _decode_json(part) if isinstance(part, str) else part
+                if decoded is None:
+                    texts.append(part)
+                    continue
+                texts.append(_text_from_json(decoded))
+            return "".join(texts)
+        if len(parts) == 1:
+            return parts[0] if isinstance(parts[0], str) else json.dumps(parts[0])
+        joined: Dict[str, Any] = {}
+        for cmd, part in zip(commands, parts):
+            decoded = _decode_json(part) if isinstance(part, str) else part
+            if decoded is None:
+                return None
+            joined[cmd] = [decoded]
+        joined["id"] = 1
+        return json.dumps(joined)
+
+    async def _answer(self, request: str) -> str:
+        try:
+            command, parameter, is_json = _parse_request(request)
+        except ValueError:
+            self.errors += 1
+            return _error_reply(False, "Invalid JSON")
+        commands = command.split("+")
+        read = not parameter and all(cmd in BATCH_COMMANDS for cmd in commands)
+        if read:
+            reply = self._cached(commands, is_json)
+            if reply is not None:
+                self.hits += 1
+                return reply
+
+        try:
+            raw = await self.api._send_raw(request, PRIORITY_SLOW if read else PRIORITY_CONTROL)
+        except MinerUnavailable:
+            raw = None
+        if raw is None:
+            self.errors += 1
+            return _error_reply(is_json, "Miner unavailable")
+
+        if read:
+            self.forwarded += 1
+            # Einzelne Lese-Antwort gleich für die nächsten Clients merken
+            if len(commands) == 1 and command not in DERIVED_COMMANDS and self.api.replies is not None:
+                self.api.replies[command] = (time.monotonic(), raw)
+        else:
+            self.writes += 1
+            _LOGGER.debug("Proxy forwarded '%s' to %s", command, self.api.host)
+            if self.on_write is not None:
+                self.on_write()
+        return raw
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> str:
+        data = await reader.read(MAX_REQUEST_SIZE)
+        # JSON kann in mehreren Segmenten kommen -> lesen, bis es vollständig ist
+        while data.lstrip().startswith(b"{") and len(data) < MAX_REQUEST_SIZE:
+            try:
+                json.loads(data.rstrip(RESPONSE_TERMINATOR))
+                break
+            except ValueError:
+                more = await reader.read(MAX_REQUEST_SIZE - len(data))
+                if not more:
+                    break
+                data += more
+        return data.decode("utf-8", errors="ignore").strip("\x00\r\n ")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(self._read_request(reader), REQUEST_TIMEOUT)
+            if request:
+                reply = await self._answer(request)
+                writer.write(reply.encode("utf-8") + RESPONSE_TERMINATOR)
+                await writer.drain()
+        except (ConnectionError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Proxy client for %s failed: %s", self.api.host, err)
+        finally:
+            writer.close()
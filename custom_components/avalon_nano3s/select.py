@@ -9,9 +9,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import AvalonMinerCoordinator
+from . import AvalonMinerCoordinator, async_add_miner_entities
 from .avalon_api import AsyncAvalonAPI
-from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,19 +54,18 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    data = hass.data[DOMAIN][entry.entry_id]
-
-    coordinator: AvalonMinerCoordinator = data["coordinator"]
-    api: AsyncAvalonAPI = data["api"]
-    device_info = data["device_info"]
-
-    async_add_entities(
-        [
-            AvalonWorkModeSelect(coordinator, api, entry.entry_id, device_info),
-            AvalonLedEffectSelect(coordinator, api, entry.entry_id, device_info),
-            AvalonPoolSelect(coordinator, api, entry.entry_id, device_info),
+    def create_selects(miner: dict) -> list:
+        coordinator: AvalonMinerCoordinator = miner["coordinator"]
+        api: AsyncAvalonAPI = miner["api"]
+        device_info = miner["device_info"]
+        unique_prefix = miner["unique_prefix"]
+        return [
+            AvalonWorkModeSelect(coordinator, api, unique_prefix, device_info),
+            AvalonLedEffectSelect(coordinator, api, unique_prefix, device_info),
+            AvalonPoolSelect(coordinator, api, unique_prefix, device_info),
         ]
-    )
+
+    async_add_miner_entities(hass, entry, async_add_entities, create_selects)
 
 # =========================
 # Workmode Select
@@ -86,7 +84,7 @@ class AvalonWorkModeSelect(CoordinatorEntity, SelectEntity):
         entry_id: str,
         device_info: dict,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("estats", "WORKMODE"))
         self.api = api
 
         self._attr_unique_id = f"{entry_id}_workmode"
@@ -108,7 +106,14 @@ class AvalonWorkModeSelect(CoordinatorEntity, SelectEntity):
             return
 
         await self.api.set_workmode(level)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_read_back(
+            "workmode", lambda data: int(data["estats"]["WORKMODE"]) == level
+        )
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.read_backs.get("workmode")
 
 
 # =========================
@@ -128,7 +133,7 @@ class AvalonLedEffectSelect(CoordinatorEntity, SelectEntity):
         entry_id: str,
         device_info: dict,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("estats", "led"))
         self.api = api
 
         self._attr_unique_id = f"{entry_id}_led_effect"
@@ -155,7 +160,14 @@ class AvalonLedEffectSelect(CoordinatorEntity, SelectEntity):
         b = led_user.get("B", 255)
 
         await self.api.set_led(effect_id, brightness, color_temp, r, g, b)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_read_back(
+            "led_effect", lambda data: data["estats"]["led"]["LEDUser"]["Effect"] == effect_id
+        )
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.read_backs.get("led_effect")
 
 # =========================
 # Pool-Switch Select
@@ -168,7 +180,7 @@ class AvalonPoolSelect(CoordinatorEntity, SelectEntity):
     _attr_translation_key = "pool"
 
     def __init__(self, coordinator, api, entry_id, device_info):
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("pools",))
         self.api = api
         self._attr_unique_id = f"{entry_id}_pool_select"
         self._attr_device_info = device_info
@@ -216,8 +228,23 @@ class AvalonPoolSelect(CoordinatorEntity, SelectEntity):
             if idx is None:
                 return
 
-            await self.api.switch_pool(idx)
-            await self.coordinator.async_request_refresh()
+            result = await self.api.switch_pool(idx)
+            if not result.get("success"):
+                _LOGGER.warning("Switching %s to %s failed: %s", self.api.host, option, result.get("message"))
+                return
+
+            def verify(data):
+                return any(
+                    int(pool.get("POOL", -1)) == idx and str(pool.get("Stratum Active", "")).lower() == "true"
+                    for pool in data["pools"].values()
+                )
+
+            await self.coordinator.async_read_back("pool_select", verify)
+            self.async_write_ha_state()
 
         except Exception:
             pass
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.read_backs.get("pool_select")
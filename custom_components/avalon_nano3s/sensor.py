@@ -11,7 +11,8 @@ from homeassistant.components.sensor import (
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from .const import DOMAIN
+from . import async_add_miner_entities
+from .const import CONF_RECORD_POLL_ATTRIBUTES, DEFAULT_RECORD_POLL_ATTRIBUTES, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 PERCENTAGE = "%"
@@ -109,6 +110,129 @@ SENSOR_CONFIG = {
     "MEMFREE": (None, "KiB", SensorStateClass.MEASUREMENT, lambda v: int(float(v))),
 }
 
+# ===============================
+# Konverter & Werte-Tabelle
+# ===============================
+# Konverter: Rohwert -> (State, Zusatz-Attribute oder None)
+
+def _convert_ps_ping(value):
+    return round(float(str(value).strip()), 1), None
+
+
+def _convert_last_share_time(value):
+    # Timestamp → Datum/Uhrzeit
+    try:
+        seconds = int(float(value))
+    except (ValueError, TypeError, OverflowError) as e:
+        _LOGGER.debug("Ungültiger Timestamp in Last Share Time: %s (%s)", value, e)
+        return f"Ungültig ({value})", None
+    attrs = {"raw_seconds": seconds}
+    if seconds <= 0:
+        return "no connection", attrs
+    try:
+        dt = datetime.fromtimestamp(seconds, tz=timezone.utc).astimezone()
+    except (ValueError, OverflowError, OSError) as e:
+        _LOGGER.debug("Ungültiger Timestamp in Last Share Time: %s (%s)", value, e)
+        return f"Ungültig ({value})", attrs
+    attrs["last_share_iso"] = dt.isoformat()
+    return dt.strftime("%H:%M – %d.%m.%Y"), attrs
+
+
+def _convert_elapsed(value):
+    try:
+        total_seconds = int(float(value))
+    except (ValueError, TypeError, OverflowError) as e:
+        _LOGGER.debug("Fehler beim Formatieren von Elapsed: %s", e)
+        return str(value), None
+    formatted = f"{total_seconds // 3600}h {(total_seconds % 3600) // 60:02d}m {total_seconds % 60:02d}s"
+    return formatted, {"formatted": formatted, "total_seconds": total_seconds}
+
+
+def _convert_default(value):
+    try:
+        return float(value), None
+    except (ValueError, TypeError):
+        return str(value), None
+
+
+def _resolve_converter(key):
+    """Konverter für einen Key - einmal beim Anlegen des Sensors"""
+    if key == "PS_Ping":
+        return _convert_ps_ping
+    if key == "Last Share Time":
+        return _convert_last_share_time
+    if key.lower() == "elapsed":
+        return _convert_elapsed
+    config = SENSOR_CONFIG.get(key)
+    if config:
+        converter = config[3]
+        return lambda value: (converter(value), None)
+    return _convert_default
+
+
+class SensorValueTable:
+    """Konvertierte Sensorwerte eines Miners, einmal pro Poll berechnet.
+
+    Jeder Sensor registriert beim Anlegen Pfad und Konverter und liest
+    danach nur noch per Index. Die Tabelle wird beim ersten Zugriff nach
+    einem Poll aktualisiert (neues ``coordinator.data``); konvertiert
+    werden dabei nur Einträge, deren Rohwert sich geändert hat.
+    """
+
+    def __init__(self, coordinator) -> None:
+        self._coordinator = coordinator
+        self._data = None
+        self._paths = []
+        self._converters = []
+        self._raw = []
+        self._values = []
+        self._attrs = []
+        # ISO-Zeit des Polls, zu dem die Werte gehören
+        self.polled = None
+
+    def register(self, path, converter) -> int:
+        self._paths.append(path)
+        self._converters.append(converter)
+        self._raw.append(None)
+        self._values.append(None)
+        self._attrs.append(None)
+        # Tabelle beim nächsten Zugriff neu aufbauen
+        self._data = None
+        return len(self._paths) - 1
+
+    def _refresh(self) -> None:
+        data = self._coordinator.data
+        if data is self._data:
+            return
+        self._data = data
+        self.polled = datetime.now().isoformat()
+        data = data or {}
+        raw_values, values, attrs = self._raw, self._values, self._attrs
+        for index, (api_type, section_name, key) in enumerate(self._paths):
+            section = data.get(api_type)
+            section = section.get(section_name) if isinstance(section, dict) else None
+            raw = section.get(key) if isinstance(section, dict) else None
+            if raw == raw_values[index] and values[index] is not None:
+                continue
+            raw_values[index] = raw
+            if raw is None:
+                values[index], attrs[index] = None, None
+                continue
+            try:
+                values[index], attrs[index] = self._converters[index](raw)
+            except Exception as e:
+                _LOGGER.debug("Fehler beim Konvertieren von %s: %s (raw=%s)", key, e, raw)
+                values[index], attrs[index] = None, None
+
+    def value(self, index):
+        self._refresh()
+        return self._values[index]
+
+    def attributes(self, index):
+        self._refresh()
+        return self._attrs[index]
+
+
 # ===============================
 # Sensor-Klasse
 # ===============================
@@ -124,8 +248,10 @@ class AvalonSensor(CoordinatorEntity, SensorEntity):
         enabled_default,
         category,
         device_info,
+        table,
     ):
-        super().__init__(coordinator)
+        # Kontext = Pfad in coordinator.data -> nur bei Änderung dieses Werts benachrichtigt
+        super().__init__(coordinator, context=(api_type, section_name, key))
 
         # WICHTIG: speichern für native_value
         self._api_type = api_type
@@ -161,100 +287,232 @@ class AvalonSensor(CoordinatorEntity, SensorEntity):
             if state_class:
                 self._attr_state_class = state_class
 
+        # Konverter einmalig auflösen, Wert pro Poll nur einmal in der Tabelle berechnen
+        self._table = table
+        self._index = table.register((api_type, section_name, self._key), _resolve_converter(self._key))
 
     @property
     def native_value(self):
-        try:
-            data = self.coordinator.data.get(self._api_type, {})
-            section = data.get(self._section_name, {})
-            value = section.get(self._key)
-            if value is None:
-                return None
-
-            raw_value = value
-
-            # -----------------------------
-            # PING aktualisierung
-            # -----------------------------
-            if self._key == "PS_Ping":
-                try:
-                    return round(float(str(value).strip()), 1)
-                except Exception as e:
-                    _LOGGER.debug("PS_Ping konnte nicht konvertiert werden: %s (raw=%s)", e, value)
-                    return None
-
-            # Spezieller Fall: Last Share Time → Timestamp → Datum/Uhrzeit
-            if self._key == "Last Share Time":
-                try:
-                    seconds = int(float(raw_value))
-                    if seconds <= 0:
-                        return "no connection"
-
-                    dt = datetime.fromtimestamp(seconds, tz=timezone.utc).astimezone()
-                    return dt.strftime("%H:%M – %d.%m.%Y")
-                except (ValueError, TypeError, OverflowError) as e:
-                    _LOGGER.debug("Ungültiger Timestamp in Last Share Time: %s (%s)", raw_value, e)
-                    return f"Ungültig ({raw_value})"
-
-            # Spezieller Fall Elapsed
-            if self._key.lower() == "elapsed":
-                try:
-                    total_seconds = int(float(raw_value))
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    seconds = total_seconds % 60
-                    return f"{hours}h {minutes:02d}m {seconds:02d}s"
-                except Exception as e:
-                    _LOGGER.debug("Fehler beim Formatieren von Elapsed: %s", e)
-                    return str(raw_value)
-
-            # Standard-Konverter
-            config = SENSOR_CONFIG.get(self._key)
-            if config:
-                _, _, _, converter = config
-                return converter(raw_value)
+        return self._table.value(self._index)
 
-            try:
-                return float(raw_value)
-            except:
-                return str(raw_value)
+    @property
+    def extra_state_attributes(self):
+        table = self._table
+        attrs = {"last_polled": table.polled}
+
+        # Section wurde im letzten Poll nicht rechtzeitig geliefert
+        if self._api_type in self.coordinator.stale_sections:
+            attrs["stale_seconds"] = self.coordinator.stale_sections[self._api_type]
+
+        extra = table.attributes(self._index)
+        if extra:
+            attrs.update(extra)
+        return attrs
+
+
+class AvalonUnrecordedSensor(AvalonSensor):
+    """AvalonSensor, dessen Poll-Attribute nicht im Recorder landen"""
+
+    _unrecorded_attributes = frozenset({"last_polled", "stale_seconds"})
+
+
+# ===============================
+# Verbindung (Circuit Breaker)
+# ===============================
+
+class AvalonConnectionSensor(CoordinatorEntity, SensorEntity):
+    """Zustand des Circuit Breakers (closed/open/half_open), Zeit bis zur nächsten Probe, Timeouts je Phase"""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "connection_state"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = ["closed", "open", "half_open"]
+    _unrecorded_attributes = frozenset({"time_to_next_probe"})
+
+    def __init__(self, coordinator, api, entry_id, device_info):
+        super().__init__(coordinator, context=("connection",))
+        self._api = api
+        self._breaker = api.breaker
+        self._attr_unique_id = f"{entry_id}_connection_state"
+        self._attr_device_info = device_info
 
-        except Exception as e:
-            _LOGGER.debug("Fehler in native_value für Sensor %s: %s", self._attr_unique_id, e)
-            return None
+    @property
+    def available(self) -> bool:
+        # Gerade wenn der Miner nicht erreichbar ist, soll der Zustand sichtbar sein
+        return True
+
+    @property
+    def native_value(self):
+        return self._breaker.state
 
     @property
     def extra_state_attributes(self):
-        attrs = {"last_polled": datetime.now().isoformat()}
-
-        try:
-            data = self.coordinator.data.get(self._api_type, {})
-            section = data.get(self._section_name, {})
-            raw_value = section.get(self._key)
-
-            if self._key == "Last Share Time" and raw_value is not None:
-                try:
-                    seconds = int(float(raw_value))
-                    attrs["raw_seconds"] = seconds
-                    if seconds > 0:
-                        dt = datetime.fromtimestamp(seconds, tz=timezone.utc).astimezone()
-                        attrs["last_share_iso"] = dt.isoformat()
-                except Exception as e:
-                    _LOGGER.debug("Fehler beim Parsen raw_seconds für Last Share Time: %s", e)
-
-            if self._key.lower() == "elapsed":
-                try:
-                    s = int(float(raw_value or 0))
-                    attrs["formatted"] = f"{s//3600}h {(s%3600)//60:02d}m {s%60:02d}s"
-                    attrs["total_seconds"] = s
-                except Exception as e:
-                    _LOGGER.debug("Fehler beim Formatieren Elapsed-Attribute: %s", e)
-
-            return attrs
-
-        except Exception as e:
-            _LOGGER.debug("Fehler in extra_state_attributes für Sensor %s: %s", self._attr_unique_id, e)
-            return attrs
+        attrs = self._breaker.as_dict()
+        del attrs["state"]
+        for phase, count in self._api.timeouts.items():
+            attrs[f"timeouts_{phase}"] = count
+        return attrs
+
+
+# ===============================
+# Poll-Metriken (opt-in)
+# ===============================
+# Metrik -> (Einheit, Nachkommastellen)
+POLL_METRICS = {
+    "poll_latency_p95": ("ms", 0),
+    "poll_failure_rate": (PERCENTAGE, 1),
+    "parse_time_p95": ("ms", 2),
+}
+
+
+class AvalonPollMetricSensor(CoordinatorEntity, SensorEntity):
+    """p95 der Poll-Latenz / Parse-Zeit und Fehlerquote über die letzten Polls (standardmäßig deaktiviert)"""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, api, entry_id, device_info, metric):
+        super().__init__(coordinator, context=("metrics",))
+        self._api = api
+        self._metric = metric
+        unit, precision = POLL_METRICS[metric]
+        self._attr_translation_key = metric
+        self._attr_unique_id = f"{entry_id}_{metric}"
+        self._attr_device_info = device_info
+        self._attr_native_unit_of_measurement = unit
+        self._attr_suggested_display_precision = precision
+        if unit == "ms":
+            self._attr_device_class = SensorDeviceClass.DURATION
+
+    @property
+    def available(self) -> bool:
+        # Fehlerquote gerade dann, wenn Polls fehlschlagen
+        return True
+
+    @property
+    def native_value(self):
+        if self._metric == "poll_failure_rate":
+            return self.coordinator.poll_failure_rate()
+        if self._metric == "poll_latency_p95":
+            value = self.coordinator.poll_latency.percentile(0.95)
+        else:
+            value = self._api.metrics.parse_p95()
+        return round(value * 1000, 3) if value is not None else None
+
+
+# ===============================
+# Verlauf (aus coordinator.history)
+# ===============================
+# unique_id-Suffix -> (Ansicht, Spalte, Zusammenfassung, Faktor, Device-Class, Einheit, Nachkommastellen, aktiv)
+HISTORY_SENSORS = {
+    "hashrate_1h_avg": ("1h", "hashrate", "mean", 1e-6, None, "TH/s", 3, True),
+    "power_24h_avg": ("24h", "power", "mean", 1, SensorDeviceClass.POWER, "W", 0, False),
+    "temperature_max_24h": ("24h", "temp_max", "max", 1, SensorDeviceClass.TEMPERATURE, "°C", 1, False),
+}
+
+
+class AvalonHistorySensor(CoordinatorEntity, SensorEntity):
+    """Kennzahl aus dem Verlauf im Speicher (z.B. Hashrate-Mittel der letzten Stunde)"""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, entry_id, device_info, key):
+        super().__init__(coordinator, context=("history",))
+        self._view, self._column, self._how, self._factor, device_class, unit, precision, enabled = HISTORY_SENSORS[key]
+        self._attr_translation_key = key
+        self._attr_unique_id = f"{entry_id}_{key}"
+        self._attr_device_info = device_info
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_suggested_display_precision = precision
+        self._attr_entity_registry_enabled_default = enabled
+
+    @property
+    def native_value(self):
+        value = self.coordinator.history.aggregate(self._view, self._column, self._how)
+        return round(value * self._factor, 3) if value is not None else None
+
+
+# ===============================
+# Abgeleitete Kennzahlen (aus coordinator.derived)
+# ===============================
+# unique_id-Suffix -> (Schlüssel in DerivedMetrics.as_dict, Device-Class, Einheit, Nachkommastellen, aktiv)
+DERIVED_SENSORS = {
+    "efficiency": ("efficiency_j_per_th", None, "J/TH", 1, True),
+    "hashrate_effective": ("hashrate_effective_ths", None, "TH/s", 3, True),
+    "hashrate_effective_ratio": ("hashrate_effective_ratio", None, PERCENTAGE, 1, False),
+    "reject_rate": ("reject_rate_per_min", None, "1/min", 3, False),
+    "stale_rate": ("stale_rate_per_min", None, "1/min", 3, False),
+    "uptime_fraction": ("uptime_fraction", None, PERCENTAGE, 2, True),
+}
+
+
+class AvalonDerivedSensor(CoordinatorEntity, SensorEntity):
+    """Laufend geglättete Kennzahl: J/TH, effektive Hashrate, Reject-/Stale-Rate, Uptime-Anteil"""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, entry_id, device_info, key):
+        super().__init__(coordinator, context=("derived",))
+        self._value_key, device_class, unit, precision, enabled = DERIVED_SENSORS[key]
+        self._attr_translation_key = key
+        self._attr_unique_id = f"{entry_id}_{key}"
+        self._attr_device_info = device_info
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_suggested_display_precision = precision
+        self._attr_entity_registry_enabled_default = enabled
+
+    @property
+    def native_value(self):
+        return self.coordinator.derived.as_dict()[self._value_key]
+
+
+# ===============================
+# Hub: Scheduler-Metriken
+# ===============================
+# Metrik -> (Einheit, Nachkommastellen)
+FLEET_METRICS = {
+    "queue_depth": (None, 0),
+    "lateness_avg": ("s", 3),
+    "lateness_max": ("s", 3),
+    "miners_per_second": ("1/s", 2),
+    "skipped_polls": (None, 0),
+}
+
+
+class FleetMetricSensor(SensorEntity):
+    """Kennzahl des gemeinsamen Fleet-Schedulers (Warteschlange, Verspätung, Durchsatz)"""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, scheduler, entry_id, device_info, metric):
+        self._scheduler = scheduler
+        self._metric = metric
+        unit, precision = FLEET_METRICS[metric]
+        self._attr_translation_key = f"fleet_{metric}"
+        self._attr_unique_id = f"{entry_id}_fleet_{metric}"
+        self._attr_device_info = device_info
+        self._attr_native_unit_of_measurement = unit
+        self._attr_suggested_display_precision = precision
+        self._attr_state_class = (
+            SensorStateClass.TOTAL_INCREASING if metric == "skipped_polls" else SensorStateClass.MEASUREMENT
+        )
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(self._scheduler.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self):
+        return self._scheduler.metrics()[self._metric]
+
 
 # ===============================
 # Setup Entry
@@ -262,62 +520,91 @@ class AvalonSensor(CoordinatorEntity, SensorEntity):
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
 
-    coordinator = data["coordinator"]
-    device_info = data["device_info"]
+    record_poll_attributes = entry.options.get(CONF_RECORD_POLL_ATTRIBUTES, DEFAULT_RECORD_POLL_ATTRIBUTES)
+    sensor_cls = AvalonSensor if record_poll_attributes else AvalonUnrecordedSensor
+
+    def create_sensors(miner):
+        coordinator = miner["coordinator"]
+        device_info = miner["device_info"]
+        unique_prefix = miner["unique_prefix"]
+
+        sensors = []
+        table = SensorValueTable(coordinator)
+
+        def add_sensors(api_type, visible_keys, category=None):
+            api_data = coordinator.data.get(api_type, {})
+            for section_name, section_values in api_data.items():
+                if not isinstance(section_values, dict):
+                    continue
+
+                for key in section_values.keys():
+                    enabled = key in visible_keys
+
+                    sensors.append(
+                        sensor_cls(
+                            coordinator,
+                            unique_prefix,
+                            api_type,
+                            section_name,
+                            key,
+                            enabled,
+                            category,
+                            device_info,
+                            table,
+                        )
+                    )
 
-    sensors = []
+        add_sensors("version", VISIBLE_VERSION_KEYS, EntityCategory.DIAGNOSTIC)
+        add_sensors("summary", VISIBLE_SUMMARY_KEYS)
+        add_sensors("estats", VISIBLE_ESTATS_KEYS)
 
-    def add_sensors(api_type, visible_keys, category=None):
-        api_data = coordinator.data.get(api_type, {})
-        for section_name, section_values in api_data.items():
-            if not isinstance(section_values, dict):
+        pools = coordinator.data.get("pools", {})
+        for pool_id in ("p1", "p2", "p3"):
+            pool_data = pools.get(pool_id, {})
+            if not pool_data:
                 continue
 
-            for key in section_values.keys():
-                enabled = key in visible_keys
+            for key in pool_data.keys():
+                if pool_id == "p1":
+                    enabled_default = key in (VISIBLE_POOLS_KEYS | VISIBLE_POOLS_DIAG)
+                else:
+                    enabled_default = key in VISIBLE_POOLS_DIAG
+
+                category = EntityCategory.DIAGNOSTIC if key in VISIBLE_POOLS_DIAG else None
 
                 sensors.append(
-                    AvalonSensor(
+                    sensor_cls(
                         coordinator,
-                        entry.entry_id,
-                        api_type,
-                        section_name,
+                        unique_prefix,
+                        "pools",
+                        pool_id,
                         key,
-                        enabled,
+                        enabled_default,
                         category,
                         device_info,
+                        table,
                     )
                 )
 
-    add_sensors("version", VISIBLE_VERSION_KEYS, EntityCategory.DIAGNOSTIC)
-    add_sensors("summary", VISIBLE_SUMMARY_KEYS)
-    add_sensors("estats", VISIBLE_ESTATS_KEYS)
-
-    pools = coordinator.data.get("pools", {})
-    for pool_id in ("p1", "p2", "p3"):
-        pool_data = pools.get(pool_id, {})
-        if not pool_data:
-            continue
-
-        for key in pool_data.keys():
-            if pool_id == "p1":
-                enabled_default = key in (VISIBLE_POOLS_KEYS | VISIBLE_POOLS_DIAG)
-            else:
-                enabled_default = key in VISIBLE_POOLS_DIAG
-
-            category = EntityCategory.DIAGNOSTIC if key in VISIBLE_POOLS_DIAG else None
-
-            sensors.append(
-                AvalonSensor(
-                    coordinator,
-                    entry.entry_id,
-                    "pools",
-                    pool_id,
-                    key,
-                    enabled_default,
-                    category,
-                    device_info,
-                )
+        sensors.append(AvalonConnectionSensor(coordinator, miner["api"], unique_prefix, device_info))
+        sensors.extend(
+            AvalonPollMetricSensor(coordinator, miner["api"], unique_prefix, device_info, metric)
+            for metric in POLL_METRICS
+        )
+        sensors.extend(
+            AvalonDerivedSensor(coordinator, unique_prefix, device_info, key) for key in DERIVED_SENSORS
+        )
+        if coordinator.history is not None:
+            sensors.extend(
+                AvalonHistorySensor(coordinator, unique_prefix, device_info, key) for key in HISTORY_SENSORS
             )
+        return sensors
 
-    async_add_entities(sensors)
+    async_add_miner_entities(hass, entry, async_add_entities, create_sensors)
+
+    # Hub: Scheduler-Metriken am Hub-Gerät
+    if "scheduler" in data:
+        async_add_entities(
+            FleetMetricSensor(data["scheduler"], entry.entry_id, data["hub_device_info"], metric)
+            for metric in FLEET_METRICS
+        )
@@ -0,0 +1,63 @@
+"""Service ``avalon_nano3s.get_history``: Verlauf der Miner aus dem Speicher (ohne Recorder)."""
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import DOMAIN
+from .timeseries import COLUMNS, VIEWS
+
+SERVICE_GET_HISTORY = "get_history"
+ATTR_DEVICE_ID = "device_id"
+ATTR_VIEW = "view"
+ATTR_COLUMNS = "columns"
+
+GET_HISTORY_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_VIEW, default="1h"): vol.In(VIEWS),
+    vol.Optional(ATTR_COLUMNS): vol.All(cv.ensure_list, [vol.In(list(COLUMNS))]),
+})
+
+
+def _miners(hass: HomeAssistant):
+    # wie entry_miners, über alle geladenen Entries
+    for data in hass.data.get(DOMAIN, {}).values():
+        yield from data["miners"].values() if "miners" in data else (data,)
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Services einmal je HA-Instanz registrieren"""
+    if hass.services.has_service(DOMAIN, SERVICE_GET_HISTORY):
+        return
+
+    async def _async_get_history(call: ServiceCall) -> ServiceResponse:
+        hosts = None
+        if ATTR_DEVICE_ID in call.data:
+            registry = dr.async_get(hass)
+            hosts = set()
+            for device_id in call.data[ATTR_DEVICE_ID]:
+                device = registry.async_get(device_id)
+                if device is None:
+                    raise ServiceValidationError(f"Unknown device: {device_id}")
+                hosts.update(identifier for domain, identifier in device.identifiers if domain == DOMAIN)
+
+        miners = {}
+        for miner in _miners(hass):
+            api = miner["api"]
+            history = miner["coordinator"].history
+            if history is None or (hosts is not None and api.host not in hosts):
+                continue
+            miners[api.host] = history.view(call.data[ATTR_VIEW], call.data.get(ATTR_COLUMNS))
+        return {"miners": miners}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
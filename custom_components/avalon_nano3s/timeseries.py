@@ -0,0 +1,221 @@
+"""Kompakte Zeitreihen je Miner: Ringpuffer aus ``array``-Spalten, heruntergerechnet auf 1 h / 24 h / 7 d."""
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Spalte -> (Pfad in coordinator.data, Zusammenfassung je Bucket: mean, max oder delta = Summe der Zuwächse)
+COLUMNS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "hashrate": (("summary", "SUMMARY", "MHS 5s"), "mean"),
+    "temp_avg": (("estats", "temperatures", "TAvg"), "mean"),
+    "temp_max": (("estats", "temperatures", "TMax"), "max"),
+    "fan_rpm": (("estats", "fans", "Fan1"), "mean"),
+    "power": (("estats", "PS", "PS_Power"), "mean"),
+    "accepted": (("summary", "SUMMARY", "Accepted"), "delta"),
+    "rejected": (("summary", "SUMMARY", "Rejected"), "delta"),
+}
+_NAMES = tuple(COLUMNS)
+_MODES = tuple(mode for _, mode in COLUMNS.values())
+
+# Heruntergerechnete Ansichten: Name -> (Zeitraum s, Bucket-Breite s)
+TIERS: Dict[str, Tuple[int, int]] = {
+    "1h": (3600, 10),
+    "24h": (86400, 120),
+    "7d": (604800, 900),
+}
+# "raw": alle Samples im konfigurierten Fenster
+VIEWS = ("raw", *TIERS)
+
+_NAN = math.nan
+
+
+def _lookup(data: Any, path: Tuple[str, ...]) -> Optional[float]:
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    if isinstance(data, bool) or data is None:
+        return None
+    try:
+        return float(data)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Ring:
+    """Feste Anzahl Zeilen: Zeit (float64) plus eine float32-Spalte je Wert; append überschreibt die älteste Zeile"""
+
+    __slots__ = ("capacity", "times", "columns", "next", "count")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.times = array("d", [_NAN]) * capacity
+        self.columns = [array("f", [_NAN]) * capacity for _ in _NAMES]
+        self.next = 0
+        self.count = 0
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        index = self.next
+        self.times[index] = timestamp
+        for column, value in zip(self.columns, values):
+            column[index] = value
+        self.next = (index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def indexes(self) -> Iterator[int]:
+        """Zeilen von alt nach neu"""
+        start = (self.next - self.count) % self.capacity
+        for offset in range(self.count):
+            yield (start + offset) % self.capacity
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.itemsize * self.capacity + sum(column.itemsize * self.capacity for column in self.columns)
+
+
+class _Tier:
+    """Ring aus Buckets fester Breite; der laufende Bucket wird inkrementell aufsummiert"""
+
+    __slots__ = ("span", "width", "ring", "start", "sums", "counts", "maxima")
+
+    def __init__(self, span: int, width: int) -> None:
+        self.span = span
+        self.width = width
+        self.ring = _Ring(span // width)
+        self.start: Optional[float] = None
+        self.sums = [0.0] * len(_NAMES)
+        self.counts = [0] * len(_NAMES)
+        self.maxima = [-math.inf] * len(_NAMES)
+
+    def current(self) -> List[float]:
+        """Werte des laufenden Buckets"""
+        values = []
+        for mode, total, count, maximum in zip(_MODES, self.sums, self.counts, self.maxima):
+            if not count:
+                values.append(_NAN)
+            elif mode == "max":
+                values.append(maximum)
+            elif mode == "mean":
+                values.append(total / count)
+            else:
+                values.append(total)
+        return values
+
+    def add(self, timestamp: float, values: Sequence[float]) -> None:
+        start = timestamp - timestamp % self.width
+        if start != self.start:
+            if self.start is not None and any(self.counts):
+                self.ring.append(self.start, self.current())
+            self.start = start
+            self.sums = [0.0] * len(_NAMES)
+            self.counts = [0] * len(_NAMES)
+            self.maxima = [-math.inf] * len(_NAMES)
+        sums, counts, maxima = self.sums, self.counts, self.maxima
+        for index, value in enumerate(values):
+            if value == value:  # NaN = kein Wert in diesem Poll
+                sums[index] += value
+                counts[index] += 1
+                if value > maxima[index]:
+                    maxima[index] = value
+
+
+class TimeSeries:
+    """Verlauf eines Miners aus den Polls des Coordinators.
+
+    - Rohwerte im konfigurierten Fenster (``window`` s bei ``interval`` s je Poll)
+    - Ansichten 1h/24h/7d mit festen Buckets, die bei jedem append in O(1)
+      fortgeschrieben werden (Mittelwert, Maximum bzw. Summe der Zuwächse)
+    - Spalten ohne Wert im Poll (Section nicht abgefragt) sind NaN und zählen nicht mit
+    """
+
+    def __init__(self, window: float, interval: float) -> None:
+        self.raw = _Ring(max(1, math.ceil(window / max(interval, 1))))
+        self.tiers = {name: _Tier(span, width) for name, (span, width) in TIERS.items()}
+        # letzte Zählerstände für delta-Spalten
+        self._counters: Dict[int, float] = {}
+
+    def record(self, timestamp: float, data: Dict[str, Any], fresh: Iterable[str]) -> None:
+        """Sample aus einem Coordinator-Snapshot; nur Sections aus ``fresh`` liefern Werte"""
+        fresh = set(fresh)
+        values: List[float] = []
+        for index, (path, mode) in enumerate(COLUMNS.values()):
+            value = _lookup(data, path) if path[0] in fresh else None
+            if value is None:
+                values.append(_NAN)
+                continue
+            if mode == "delta":
+                previous = self._counters.get(index)
+                self._counters[index] = value
+                if previous is None:
+                    value = _NAN
+                elif value < previous:
+                    # Zähler zurückgesetzt (Neustart): alles seitdem ist Zuwachs
+                    pass
+                else:
+                    value -= previous
+            values.append(value)
+        self.append(timestamp, values)
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        self.raw.append(timestamp, values)
+        for tier in self.tiers.values():
+            tier.add(timestamp, values)
+
+    def _rows(self, view: str) -> Tuple[List[float], List[List[float]]]:
+        if view == "raw":
+            ring = self.raw
+            indexes = list(ring.indexes())
+            return [ring.times[i] for i in indexes], [[column[i] for i in indexes] for column in ring.columns]
+        tier = self.tiers[view]
+        ring = tier.ring
+        indexes = list(ring.indexes())
+        times = [ring.times[i] for i in indexes]
+        columns = [[column[i] for i in indexes] for column in ring.columns]
+        if tier.start is not None and any(tier.counts):
+            times.append(tier.start)
+            for column, value in zip(columns, tier.current()):
+                column.append(value)
+        # Buckets außerhalb des Zeitraums (z.B. nach einer Pause) weglassen
+        if times:
+            cutoff = times[-1] - tier.span
+            first = next((i for i, t in enumerate(times) if t > cutoff), len(times))
+            if first:
+                times = times[first:]
+                columns = [column[first:] for column in columns]
+        return times, columns
+
+    def view(self, view: str = "1h", columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Zeitstempel (Unix-Zeit) und Spalten als Listen, NaN als None"""
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view: {view}")
+        names = list(columns) if columns else list(_NAMES)
+        unknown = [name for name in names if name not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        times, values = self._rows(view)
+        result: Dict[str, Any] = {
+            "view": view,
+            "bucket_seconds": TIERS[view][1] if view in TIERS else None,
+            "time": [round(t, 1) for t in times],
+        }
+        for name in names:
+            result[name] = [round(v, 3) if v == v else None for v in values[_NAMES.index(name)]]
+        return result
+
+    def aggregate(self, view: str, column: str, how: str = "mean") -> Optional[float]:
+        """Mittelwert, Maximum oder Summe einer Spalte über eine Ansicht (für abgeleitete Sensoren)"""
+        _, values = self._rows(view)
+        present = [v for v in values[_NAMES.index(column)] if v == v]
+        if not present:
+            return None
+        if how == "max":
+            return max(present)
+        if how == "sum":
+            return sum(present)
+        return sum(present) / len(present)
+
+    @property
+    def nbytes(self) -> int:
+        return self.raw.nbytes + sum(tier.ring.nbytes for tier in self.tiers.values())
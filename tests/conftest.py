@@ -0,0 +1,92 @@
+"""Tests ohne Home Assistant: Module über ``tools/_loader``, Miner über ``tools/simulator``."""
+from __future__ import annotations
+
+import asyncio
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "tools"))
+# custom_components für die Tests mit Home Assistant (pytest-homeassistant-custom-component)
+sys.path.insert(0, str(ROOT))
+
+import simulator  # noqa: E402
+from _loader import load  # noqa: E402
+
+
+def pytest_configure(config):
+    # HA-Fixtures (hass) sind async -> pytest-asyncio im auto-Modus, wie in Home Assistant selbst
+    if config.pluginmanager.hasplugin("asyncio"):
+        config.option.asyncio_mode = "auto"
+
+
+@pytest.fixture(autouse=True)
+def _clean_registries():
+    """Registries der API sind pro Prozess -> jeder Test beginnt ohne Queues, Breaker und Messwerte"""
+    # über _loader geladen und, in den HA-Tests, als custom_components.avalon_nano3s
+    modules = [load("avalon_api")]
+    if "custom_components.avalon_nano3s.avalon_api" in sys.modules:
+        modules.append(sys.modules["custom_components.avalon_nano3s.avalon_api"])
+    registries = [
+        registry
+        for api in modules
+        for registry in (
+            api._HOST_QUEUES,
+            api._BREAKERS,
+            api._METRICS,
+            api._JSON_SUPPORT,
+            api._JOIN_SUPPORT,
+            api._REPLY_CACHE,
+            api._REPLY_DIGESTS,
+        )
+    ]
+    for registry in registries:
+        registry.clear()
+    yield
+    for registry in registries:
+        registry.clear()
+
+
+@pytest.fixture(autouse=True)
+def _loopback_sockets(request):
+    """pytest-homeassistant-custom-component sperrt Sockets; Simulatoren laufen auf 127.0.0.1 und 127.1.0.0/29"""
+    if not request.config.pluginmanager.hasplugin("socket"):
+        return
+    import pytest_socket
+
+    pytest_socket.enable_socket()
+    pytest_socket.socket_allow_hosts(["127.0.0.1", *(f"127.1.0.{i}" for i in range(8))])
+
+
+@pytest.fixture
+def free_port() -> int:
+    """Freier TCP-Port (für Simulatoren auf mehreren Loopback-Adressen mit gleichem Port)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def with_miner(free_port):
+    """``with_miner(test, **options)``: ``await test(miner, port)`` gegen einen simulierten Miner auf 127.0.0.1.
+
+    ``options`` gehen an ``SimulatedMiner`` (latency, drop, stall, ...);
+    ``miner_class`` ersetzt die Klasse (z.B. mit eigenem ``handle``).
+    """
+
+    def run(test, miner_class=simulator.SimulatedMiner, **options):
+        async def main():
+            miner = miner_class(simulator.Templates(), **options)
+            server = await miner.start("127.0.0.1", free_port)
+            try:
+                return await test(miner, free_port)
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,235 @@
+"""AsyncAvalonAPI gegen den Simulator."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import simulator
+from _loader import fixture, load
+from bench_parser import polls
+
+api_module = load("avalon_api")
+
+
+def _api(port: int, **options) -> "api_module.AsyncAvalonAPI":
+    options.setdefault("timeout", 1)
+    options.setdefault("transport", "text")
+    return api_module.AsyncAvalonAPI("127.0.0.1", port, **options)
+
+
+# =========================
+# Batch
+# =========================
+class _SlowPoolsMiner(simulator.SimulatedMiner):
+    """Antwortet auf alles mit ``pools`` erst nach 2 s"""
+
+    async def handle(self, reader, writer):
+        try:
+            request = (await reader.read(4096)).decode()
+            if "pools" in request:
+                await asyncio.sleep(2)
+            writer.write(self.reply(request).encode() + b"\x00")
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def test_batch_joined_matches_single_reads(with_miner):
+    async def test(miner, port):
+        api = _api(port)
+        batch = await api.batch(["summary", "estats", "pools", "version"])
+        assert miner.served == 1
+        single = _api(port)
+        for cmd in ("summary", "estats", "pools", "version"):
+            assert set(batch[cmd]) == set(await getattr(single, cmd)())
+        assert batch["estats"]["fans"]["FanR"] == miner.templates.base_fan
+
+    with_miner(test)
+
+
+def test_batch_deadline_returns_finished_sections(with_miner):
+    async def test(miner, port):
+        api = _api(port, timeout=5)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await api.batch(["summary", "estats", "pools"], deadline=start + 0.5)
+        # pools ist noch unterwegs; summary/estats kamen getrennt davon und werden geliefert
+        assert sorted(result) == ["estats", "summary"]
+        assert loop.time() - start < 1.0
+
+    with_miner(test, miner_class=_SlowPoolsMiner)
+
+
+def test_batch_deadline_without_result_raises(with_miner):
+    async def test(miner, port):
+        api = _api(port, timeout=5)
+        loop = asyncio.get_running_loop()
+        with pytest.raises(asyncio.TimeoutError):
+            await api.batch(["pools"], deadline=loop.time() + 0.2)
+
+    with_miner(test, miner_class=_SlowPoolsMiner)
+
+
+# =========================
+# Circuit Breaker
+# =========================
+def test_breaker_opens_after_threshold_and_recovers(with_miner):
+    async def test(miner, port):
+        api = _api(port, retries=0)
+        api.breaker.base_backoff = 0.2
+        api.breaker.jitter = 0
+        for _ in range(api.breaker.threshold):
+            with pytest.raises(ConnectionError):
+                await api.summary()
+        assert api.breaker.state == "open"
+        dropped = miner.dropped
+
+        # offen: kein Verbindungsversuch
+        with pytest.raises(api_module.MinerUnavailable):
+            await api.summary()
+        assert miner.dropped == dropped
+        assert api.metrics.as_dict()["summary"]["failures"].get("circuit_open") == 1
+
+        # nach dem Backoff geht genau eine Probe durch; Erfolg schließt den Breaker
+        miner.drop = 0.0
+        await asyncio.sleep(0.25)
+        assert api.breaker.state == "half_open"
+        assert "SUMMARY" in await api.summary()
+        assert api.breaker.state == "closed"
+        assert api.breaker.failures == 0
+
+    with_miner(test, drop=1.0)
+
+
+def test_breaker_failed_probe_doubles_backoff(monkeypatch):
+    monkeypatch.setattr(api_module.random, "uniform", lambda low, high: 1.0)
+    breaker = api_module.CircuitBreaker(threshold=1, base_backoff=10, max_backoff=300, jitter=0.2)
+    assert breaker.record_failure()
+    assert breaker.backoff == 10
+    breaker._open_until = 0.0  # Backoff abgelaufen
+    assert breaker.acquire() is True
+    # zweite Probe gleichzeitig -> abgelehnt
+    with pytest.raises(api_module.MinerUnavailable):
+        breaker.acquire()
+    assert breaker.record_failure()
+    assert breaker.backoff == 20
+    assert breaker.state == "open"
+
+
+# =========================
+# HostQueue
+# =========================
+def test_host_queue_serves_control_first_then_by_priority():
+    async def test():
+        queue = api_module.HostQueue(2)
+        order = []
+        peak = 0
+
+        async def job(name, priority, duration):
+            nonlocal peak
+            async with queue.slot(priority):
+                peak = max(peak, queue.active)
+                order.append(name)
+                await asyncio.sleep(duration)
+
+        running = [
+            asyncio.ensure_future(job("fast1", api_module.PRIORITY_FAST, 0.05)),
+            asyncio.ensure_future(job("fast2", api_module.PRIORITY_FAST, 0.1)),
+        ]
+        await asyncio.sleep(0.01)
+        # beide Slots belegt; in Ankunftsreihenfolge: slow, slow, fast, control
+        waiting = [
+            asyncio.ensure_future(job("slow1", api_module.PRIORITY_SLOW, 0.01)),
+            asyncio.ensure_future(job("slow2", api_module.PRIORITY_SLOW, 0.01)),
+            asyncio.ensure_future(job("fast3", api_module.PRIORITY_FAST, 0.01)),
+            asyncio.ensure_future(job("control", api_module.PRIORITY_CONTROL, 0.01)),
+        ]
+        await asyncio.sleep(0)
+        assert queue.waiting == 4
+        await asyncio.gather(*running, *waiting)
+        assert queue.active == 0
+        return order, peak
+
+    order, peak = asyncio.run(test())
+    # ohne wartenden Steuerbefehl laufen zwei Lese-Befehle parallel
+    assert peak == 2
+    assert order == ["fast1", "fast2", "control", "fast3", "slow1", "slow2"]
+
+
+def test_host_queue_cancelled_waiter_releases_its_turn():
+    async def test():
+        queue = api_module.HostQueue(1)
+        order = []
+
+        async def job(name, priority):
+            async with queue.slot(priority):
+                order.append(name)
+                await asyncio.sleep(0.02)
+
+        first = asyncio.ensure_future(job("first", api_module.PRIORITY_SLOW))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(job("cancelled", api_module.PRIORITY_CONTROL))
+        last = asyncio.ensure_future(job("last", api_module.PRIORITY_SLOW))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(first, last)
+        return order, queue.active
+
+    assert asyncio.run(test()) == (["first", "last"], 0)
+
+
+def test_control_commands_report_open_breaker_instead_of_raising(with_miner):
+    async def test(miner, port):
+        api = _api(port, retries=0)
+        for _ in range(api.breaker.threshold):
+            await api.switch_pool(1)
+        assert api.breaker.state == "open"
+        return [
+            await api.set_pool(2, "stratum+tcp://pool.test:3333", "worker", "x"),
+            await api.switch_pool(1),
+            await api.set_fan_speed(50),
+        ]
+
+    for result in with_miner(test, drop=1.0):
+        assert result["success"] is False
+        assert result["error"] == "circuit_open"
+        assert result["raw"] is None
+
+
+# =========================
+# Antwort-Cache
+# =========================
+def test_reply_cache_keeps_repeating_replies_across_a_large_fleet():
+    summaries = polls(fixture("summary.txt"), 1, count=3)
+    stats = polls(fixture("stats.txt"), 1, count=3)
+    pools = fixture("pools.txt")
+    # mehr Miner, als summary+stats+pools zusammen in den Cache passen würden
+    apis = [api_module.AsyncAvalonAPI(f"10.0.{index // 250}.{index % 250}") for index in range(800)]
+    assert len(apis) * 3 > api_module.REPLY_CACHE_SIZE
+
+    results = []
+    for poll in range(3):
+        results.append([])
+        for api in apis:
+            api._parse_cached("summary", summaries[poll])
+            api._parse_cached("stats", stats[poll])
+            results[poll].append(api._parse_cached("pools", pools))
+
+    # summary/stats ändern sich jedes Mal und belegen keinen Platz
+    assert all(key[2] == "pools" for key in api_module._REPLY_CACHE)
+    # ab dem dritten Poll kommt für jeden Miner das gemerkte Objekt
+    assert all(third is second for second, third in zip(results[1], results[2]))
+    assert not any(second is first for first, second in zip(results[0], results[1]))
+
+
+def test_reply_cache_drops_a_changed_reply():
+    api = api_module.AsyncAvalonAPI("cache")
+    first, second = polls(fixture("pools.txt"), 1, count=2)
+    api._parse_cached("pools", first)
+    api._parse_cached("pools", first)
+    assert ("cache", api.port, "pools") in api_module._REPLY_CACHE
+    api._parse_cached("pools", second)
+    assert ("cache", api.port, "pools") not in api_module._REPLY_CACHE
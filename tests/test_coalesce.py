@@ -0,0 +1,81 @@
+"""CoalescingWriter: nur der letzte Wert geht raus, genau ein Refresh danach."""
+from __future__ import annotations
+
+import asyncio
+
+from _loader import load
+
+coalesce = load("coalesce")
+
+
+class _Entry:
+    """Ersatz für ConfigEntry.async_create_background_task"""
+
+    def __init__(self):
+        self.names = []
+
+    def async_create_background_task(self, hass, target, name):
+        self.names.append(name)
+        return asyncio.get_running_loop().create_task(target)
+
+
+def _writer(sent, refreshed, send_delay=0.0, delay=0.02):
+    async def send(value):
+        sent.append(value)
+        await asyncio.sleep(send_delay)
+        return {"success": True}
+
+    async def refresh(value, started):
+        refreshed.append(value)
+
+    entry = _Entry()
+    return coalesce.CoalescingWriter(None, entry, send, refresh, delay=delay, name="fan speed"), entry
+
+
+def test_burst_sends_only_the_last_value():
+    async def test():
+        sent, refreshed = [], []
+        writer, entry = _writer(sent, refreshed)
+        for value in (20, 40, 60, 80):
+            writer.submit(value)
+        assert writer.pending
+        await asyncio.sleep(0.05)
+        assert not writer.pending
+        return sent, refreshed, entry.names
+
+    assert asyncio.run(test()) == ([80], [80], ["avalon_nano3s coalesced fan speed"])
+
+
+def test_value_during_send_gives_one_follow_up_and_one_refresh():
+    async def test():
+        sent, refreshed = [], []
+        writer, _ = _writer(sent, refreshed, send_delay=0.05)
+        writer.submit(20)
+        await asyncio.sleep(0.03)  # 20 wird gerade gesendet
+        for value in (30, 40, 50):
+            writer.submit(value)
+        await asyncio.sleep(0.15)
+        return sent, refreshed
+
+    assert asyncio.run(test()) == ([20, 50], [50])
+
+
+def test_failed_write_still_refreshes_and_cancel_drops_pending_value():
+    async def test():
+        refreshed = []
+
+        async def send(value):
+            raise ConnectionError("offline")
+
+        async def refresh(value, started):
+            refreshed.append(value)
+
+        writer = coalesce.CoalescingWriter(None, _Entry(), send, refresh, delay=0.01)
+        writer.submit(1)
+        await asyncio.sleep(0.05)
+        writer.submit(2)
+        writer.cancel()
+        await asyncio.sleep(0.05)
+        return refreshed, writer.pending
+
+    assert asyncio.run(test()) == ([1], False)
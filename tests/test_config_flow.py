@@ -0,0 +1,114 @@
+"""Config- und Options-Flow in Home Assistant (pytest-homeassistant-custom-component)."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant import config_entries  # noqa: E402
+from homeassistant.data_entry_flow import FlowResultType  # noqa: E402
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from custom_components.avalon_nano3s.const import (  # noqa: E402
+    CONF_COMMAND_INTERVAL,
+    CONF_HOSTS,
+    CONF_MODE,
+    DEFAULT_COMMAND_INTERVALS,
+    DOMAIN,
+    MODE_HUB,
+)
+
+
+@pytest.fixture(autouse=True)
+def _integration(enable_custom_integrations):
+    # Einrichten nach dem Flow würde den Miner abfragen -> hier nur die Flows
+    with (
+        patch("custom_components.avalon_nano3s.async_setup_entry", return_value=True),
+        patch("custom_components.avalon_nano3s.async_unload_entry", return_value=True),
+    ):
+        yield
+
+
+async def test_miner_step(hass):
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    assert result["type"] is FlowResultType.MENU
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"next_step_id": "miner"})
+    assert result["step_id"] == "miner"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"host": "192.0.2.10", "update_interval": 120}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"update_interval": "invalid_interval"}
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"host": "192.0.2.10"})
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "192.0.2.10"
+    assert result["data"]["port"] == 4028
+
+    # derselbe Host ein zweites Mal -> abgebrochen
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"next_step_id": "miner"})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"host": "192.0.2.10"})
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_hub_step(hass):
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {"next_step_id": "hub"})
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {CONF_HOSTS: "192.0.2.0/33"})
+    assert result["errors"] == {CONF_HOSTS: "invalid_hosts"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOSTS: "192.0.2.0/30, 192.0.2.20"}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Avalon Fleet (3)"
+    assert result["data"][CONF_HOSTS] == "192.0.2.0/30 192.0.2.20"
+    assert result["data"][CONF_MODE] == MODE_HUB
+
+
+async def test_options_command_intervals(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"host": "192.0.2.10", "port": 4028, "timeout": 5},
+        options={"update_interval": 5},
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["step_id"] == "init"
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {"action": "command_intervals"})
+    assert result["step_id"] == "command_intervals"
+    # stats folgt estats und steht nicht im Formular
+    assert {str(key) for key in result["data_schema"].schema} == {
+        CONF_COMMAND_INTERVAL.format(cmd) for cmd in DEFAULT_COMMAND_INTERVALS
+    }
+
+    user_input = {CONF_COMMAND_INTERVAL.format(cmd): 30 for cmd in DEFAULT_COMMAND_INTERVALS}
+    result = await hass.config_entries.options.async_configure(result["flow_id"], user_input)
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    # übrige Optionen bleiben erhalten
+    assert entry.options == {"update_interval": 5, **user_input}
+
+
+async def test_options_interval_range(hass):
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "192.0.2.10", "port": 4028, "timeout": 5})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {"action": "interval"})
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {"update_interval": "90"})
+    assert result["errors"] == {"update_interval": "invalid_interval"}
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {"update_interval": "abc"})
+    assert result["errors"] == {"update_interval": "invalid_number"}
+
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {"update_interval": "20"})
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    assert entry.options == {"update_interval": 20}
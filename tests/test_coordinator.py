@@ -0,0 +1,216 @@
+"""AvalonMinerCoordinator in Home Assistant (pytest-homeassistant-custom-component) gegen den Simulator."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+import simulator  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from custom_components.avalon_nano3s import AvalonMinerCoordinator, avalon_api  # noqa: E402
+from custom_components.avalon_nano3s.avalon_api import BATCH_COMMANDS, AsyncAvalonAPI  # noqa: E402
+from custom_components.avalon_nano3s.const import DOMAIN  # noqa: E402
+
+
+class _SnapshotMiner(simulator.SimulatedMiner):
+    """Antwort steht schon beim Eingang der Anfrage fest; Verzögerung je Anfrage aus ``delays``"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delays: list[float] = []
+
+    async def handle(self, reader, writer):
+        try:
+            reply = self.reply((await reader.read(4096)).decode())
+            await asyncio.sleep(self.delays.pop(0) if self.delays else 0)
+            writer.write(reply.encode() + b"\x00")
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+@asynccontextmanager
+async def _coordinator(hass, port, miner_class=simulator.SimulatedMiner, **options):
+    """Coordinator (ohne Timer) für einen simulierten Miner auf 127.0.0.1:``port``"""
+    miner = miner_class(simulator.Templates())
+    server = await miner.start("127.0.0.1", port)
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "127.0.0.1", "port": port, "timeout": 2})
+    entry.add_to_hass(hass)
+    api = AsyncAvalonAPI("127.0.0.1", port, timeout=2, transport="text")
+    coordinator = AvalonMinerCoordinator(hass, entry, api, timedelta(seconds=10), use_timer=False, **options)
+    try:
+        yield miner, coordinator
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def _register(hass, coordinator, domain: str, suffix: str, **kwargs) -> er.RegistryEntry:
+    return er.async_get(hass).async_get_or_create(
+        domain,
+        DOMAIN,
+        f"{coordinator.unique_prefix}_{suffix}",
+        config_entry=coordinator.config_entry,
+        **kwargs,
+    )
+
+
+async def test_plan_polls_everything_until_entities_exist(hass, free_port):
+    async with _coordinator(hass, free_port) as (miner, coordinator):
+        # Hub-Miner, der beim Start offline war: noch keine Entities -> alles pollen
+        coordinator.async_plan_commands()
+        assert coordinator.wanted_sections is None
+        assert set(coordinator._due_commands(0)) == set(BATCH_COMMANDS)
+
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert set(coordinator.data) == set(BATCH_COMMANDS)
+
+        # erste Entities angelegt -> neu geplant; summary bleibt für die Reboot-Erkennung
+        _register(hass, coordinator, "sensor", "pools_p1_URL")
+        coordinator.async_plan_commands()
+        assert coordinator.wanted_sections == {"summary", "pools"}
+        now = coordinator._section_updated["summary"]
+        assert coordinator._due_commands(now) == []
+        assert coordinator._due_commands(now + 10) == ["summary"]
+
+        # neu benötigte Section kommt gleich im nächsten Tick
+        _register(hass, coordinator, "select", "workmode")
+        coordinator.async_plan_commands()
+        assert coordinator.wanted_sections == {"summary", "pools", "estats"}
+        assert coordinator._due_commands(now) == ["estats"]
+
+        # nur deaktivierte Entities: registriert, aber nichts außer summary gebraucht
+        registry = er.async_get(hass)
+        for reg_entry in er.async_entries_for_config_entry(registry, coordinator.config_entry.entry_id):
+            registry.async_update_entity(reg_entry.entity_id, disabled_by=er.RegistryEntryDisabler.USER)
+        coordinator.async_plan_commands()
+        assert coordinator.wanted_sections == {"summary"}
+
+
+async def test_listeners_only_for_changed_paths(hass, free_port):
+    async with _coordinator(hass, free_port, change_driven=True) as (miner, coordinator):
+        await coordinator.async_refresh()
+        calls = {"elapsed": 0, "version": 0, "fan": 0}
+
+        def _listener(name):
+            def _update():
+                calls[name] += 1
+
+            return _update
+
+        unsubs = [
+            coordinator.async_add_listener(_listener("elapsed"), ("summary", "SUMMARY", "Elapsed")),
+            coordinator.async_add_listener(_listener("version"), ("version", "VERSION", "CGMiner")),
+            coordinator.async_add_listener(_listener("fan"), ("estats", "fans", "FanR")),
+        ]
+        try:
+            # Elapsed läuft weiter, version (Intervall 0) wird nicht neu geholt, Lüfter unverändert
+            await asyncio.sleep(1.05)
+            coordinator._forced.update({"summary", "estats"})
+            await coordinator.async_refresh()
+            assert calls == {"elapsed": 1, "version": 0, "fan": 0}
+            assert coordinator._context_changed(("summary", "SUMMARY", "Elapsed"))
+            assert not coordinator._context_changed(("version",))
+
+            # Lüfter geändert -> dessen Entity wird benachrichtigt
+            miner.fan = 60
+            coordinator._forced.add("estats")
+            await coordinator.async_refresh()
+            assert calls["fan"] == 1
+            assert calls["version"] == 0
+        finally:
+            for unsub in unsubs:
+                unsub()
+
+
+async def test_read_back_updates_only_the_control_section(hass, free_port):
+    async with _coordinator(hass, free_port, change_driven=True) as (miner, coordinator):
+        await coordinator.async_refresh()
+        summary = coordinator.data["summary"]
+        calls = {"fan": 0, "elapsed": 0}
+        unsubs = [
+            coordinator.async_add_listener(lambda: calls.__setitem__("fan", calls["fan"] + 1), ("estats", "fans", "FanR")),
+            coordinator.async_add_listener(
+                lambda: calls.__setitem__("elapsed", calls["elapsed"] + 1), ("summary", "SUMMARY", "Elapsed")
+            ),
+        ]
+        try:
+            miner.fan = 60
+            verified = await coordinator.async_read_back("fan_speed", lambda data: data["estats"]["fans"]["FanR"] == 60)
+            assert verified
+            assert coordinator.read_backs["fan_speed"]["verified"] is True
+            assert coordinator.data["estats"]["fans"]["FanR"] == 60
+            # summary wurde nicht neu gelesen
+            assert coordinator.data["summary"] is summary
+            assert calls == {"fan": 1, "elapsed": 0}
+
+            # Befehl hat nicht gegriffen -> nicht bestätigt
+            verified = await coordinator.async_read_back("fan_speed", lambda data: data["estats"]["fans"]["FanR"] == 80)
+            assert not verified
+            assert coordinator.read_backs["fan_speed"]["verified"] is False
+        finally:
+            for unsub in unsubs:
+                unsub()
+
+
+async def test_read_back_is_not_overwritten_by_an_older_poll(hass, free_port):
+    async with _coordinator(hass, free_port, miner_class=_SnapshotMiner) as (miner, coordinator):
+        await coordinator.async_refresh()
+
+        # Poll ist unterwegs (Antwort mit dem alten Lüfterwert), dann greift der Steuerbefehl
+        miner.delays = [0.3]
+        coordinator._forced.add("estats")
+        poll = hass.async_create_task(coordinator.async_refresh())
+        await asyncio.sleep(0.05)
+        miner.fan = 60
+        verified = await coordinator.async_read_back("fan_speed", lambda data: data["estats"]["fans"]["FanR"] == 60)
+        await poll
+
+        assert verified
+        assert coordinator.data["estats"]["fans"]["FanR"] == 60
+
+
+async def test_unload_forgets_the_hosts_of_the_entry(hass, free_port, enable_custom_integrations):
+    miner = simulator.SimulatedMiner(simulator.Templates())
+    server = await miner.start("127.0.0.1", free_port)
+    try:
+        entries = []
+        for title in ("first", "second"):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                title=title,
+                data={"host": "127.0.0.1", "port": free_port, "timeout": 2, "update_interval": 10},
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            entries.append(entry)
+        await hass.async_block_till_done()
+        key = ("127.0.0.1", free_port)
+        assert key in avalon_api._HOST_QUEUES and key in avalon_api._METRICS
+        assert [cache_key for cache_key in avalon_api._REPLY_DIGESTS if cache_key[:2] == key]
+
+        # derselbe Miner steckt noch im zweiten Entry -> Registries bleiben
+        assert await hass.config_entries.async_unload(entries[0].entry_id)
+        assert key in avalon_api._HOST_QUEUES
+
+        assert await hass.config_entries.async_unload(entries[1].entry_id)
+        for registry in (
+            avalon_api._HOST_QUEUES,
+            avalon_api._BREAKERS,
+            avalon_api._METRICS,
+            avalon_api._JSON_SUPPORT,
+            avalon_api._JOIN_SUPPORT,
+        ):
+            assert key not in registry
+        assert not [cache_key for cache_key in avalon_api._REPLY_DIGESTS if cache_key[:2] == key]
+        assert not [cache_key for cache_key in avalon_api._REPLY_CACHE if cache_key[:2] == key]
+    finally:
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,60 @@
+"""DerivedMetrics: Zähler-Zuwächse, auch über einen Neustart des Miners hinweg."""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from _loader import load
+
+derived = load("derived")
+
+
+def _summary(elapsed, rejected, stale=0, mhs=6000.0):
+    return {"SUMMARY": {"Elapsed": elapsed, "Rejected": rejected, "Stale": stale, "MHS 5s": mhs}}
+
+
+def _pools(*diff1):
+    return {f"p{index + 1}": {"Diff1 Shares": value} for index, value in enumerate(diff1)}
+
+
+def test_counter_reset_after_restart_counts_new_values_as_increase():
+    metrics = derived.DerivedMetrics()
+    metrics.update(0, {"summary": _summary(1000, 10), "pools": _pools(100)}, ["summary", "pools"])
+    metrics.update(60, {"summary": _summary(1060, 16), "pools": _pools(160)}, ["summary", "pools"])
+    assert metrics.rejects.value == 6
+    assert metrics.restarts == 0
+    assert metrics.uptime.value == 1.0
+
+    # Neustart: Elapsed und alle Zähler beginnen neu
+    metrics.update(120, {"summary": _summary(30, 2), "pools": _pools(5)}, ["summary", "pools"])
+    assert metrics.restarts == 1
+    alpha = 1 - math.exp(-60 / derived.TAU_SHARES)
+    # 2 Rejects seit dem Start zählen als Zuwachs (2/min), kein negativer Wert
+    assert metrics.rejects.value == pytest.approx(6 + alpha * (2 - 6))
+    # 30 s von 60 s lief CGMiner
+    assert metrics.uptime.value < 1.0
+    # Diff1 der Pools: 5 neue Shares seit dem Neustart, kein Rücksprung
+    before = 60 * derived.DIFF1_HASHES / 60
+    assert metrics.effective.value == pytest.approx(before + alpha * (5 * derived.DIFF1_HASHES / 60 - before))
+
+
+def test_pool_counter_reset_without_summary_restart():
+    metrics = derived.DerivedMetrics()
+    metrics.update(0, {"pools": _pools(100, 50)}, ["pools"])
+    metrics.update(10, {"pools": _pools(120, 50)}, ["pools"])
+    first = metrics.effective.value
+    assert first == 20 * derived.DIFF1_HASHES / 10
+    # Pool-Zähler springt zurück (z.B. Pool neu verbunden) -> neuer Stand ist der Zuwachs
+    metrics.update(20, {"pools": _pools(3, 0)}, ["pools"])
+    assert 0 < metrics.effective.value < first
+
+
+def test_only_fresh_sections_feed_samples():
+    metrics = derived.DerivedMetrics()
+    data = {"summary": _summary(100, 1), "estats": {"PS": {"PS_Power": 140}}}
+    metrics.update(0, data, ["summary", "estats"])
+    # gleicher Snapshot, aber summary nicht frisch (stale) -> kein neues Sample
+    metrics.update(30, {**data, "summary": _summary(50, 0)}, ["estats"])
+    assert metrics.restarts == 0
+    assert metrics.efficiency == 140 / (6000 * 1e6 / 1e12)
@@ -0,0 +1,45 @@
+"""Netzwerksuche gegen simulierte Miner auf Loopback-Adressen."""
+from __future__ import annotations
+
+import asyncio
+
+import simulator
+from _loader import load
+
+api = load("avalon_api")
+discovery = load("discovery")
+
+
+def test_discover_loopback_range(free_port):
+    async def scan():
+        # 127.1.0.1-3 antworten, 127.1.0.4-6 haben keinen offenen Port
+        fleet = await simulator.start_fleet(count=3, network="127.1.0.0/29", port=free_port)
+        try:
+            return await discovery.async_discover("127.1.0.0/29", port=free_port, connect_timeout=0.2)
+        finally:
+            await simulator.close_fleet(fleet)
+
+    found = asyncio.run(scan())
+
+    assert sorted(found) == ["127.1.0.1", "127.1.0.2", "127.1.0.3"]
+    assert all(version["MODEL"] == "Nano3s" for version in found.values())
+    # Gescannte Hosts hinterlassen nichts in den Registries der API
+    assert not api._HOST_QUEUES
+    assert not api._BREAKERS
+    assert not api._METRICS
+    assert not api._JSON_SUPPORT
+
+
+def test_probe_skips_unsupported_model(free_port):
+    async def probe():
+        templates = simulator.Templates()
+        templates.replies["version"] = templates.replies["version"].replace("MODEL=Nano3s", "MODEL=Q")
+        miner = simulator.SimulatedMiner(templates)
+        server = await miner.start("127.0.0.1", free_port)
+        try:
+            return await discovery.probe_miner("127.0.0.1", free_port, timeout=1)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    assert asyncio.run(probe()) is None
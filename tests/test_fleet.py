@@ -0,0 +1,61 @@
+"""FleetScheduler gegen eine simulierte Flotte auf Loopback-Adressen."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+import simulator
+from _loader import load
+
+api_module = load("avalon_api")
+fleet = load("fleet")
+
+
+def test_scheduler_polls_every_host_within_the_concurrency_limit(free_port):
+    async def test():
+        miners = await simulator.start_fleet(count=4, network="127.1.0.0/29", port=free_port, latency=0.03)
+        scheduler = fleet.FleetScheduler(interval=0.2, max_concurrent=2, jitter=0.1)
+        polled = Counter()
+        running = 0
+        peak = 0
+        published = []
+
+        def make_poll(api):
+            async def poll():
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                try:
+                    await api.batch(["summary"])
+                    polled[api.host] += 1
+                finally:
+                    running -= 1
+
+            return poll
+
+        for host, port, _, _ in miners:
+            scheduler.add(host, make_poll(api_module.AsyncAvalonAPI(host, port, transport="text")))
+        scheduler.async_add_listener(lambda: published.append(scheduler.metrics()))
+        task = asyncio.ensure_future(scheduler.async_run())
+        try:
+            await asyncio.sleep(0.7)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await simulator.close_fleet(miners)
+        return polled, peak, published, sum(miner.served for _, _, miner, _ in miners)
+
+    polled, peak, published, served = asyncio.run(test())
+    assert sorted(polled) == ["127.1.0.1", "127.1.0.2", "127.1.0.3", "127.1.0.4"]
+    assert all(count >= 2 for count in polled.values())
+    assert peak <= 2
+    assert served >= sum(polled.values())
+    assert published and published[-1]["miners"] == 4
+
+
+def test_expand_hosts_keeps_order_and_drops_duplicates():
+    assert fleet.expand_hosts("10.0.0.5, 10.0.0.4/31\nminer.local 10.0.0.5") == [
+        "10.0.0.5",
+        "10.0.0.4",
+        "miner.local",
+    ]
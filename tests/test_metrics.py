@@ -0,0 +1,46 @@
+"""Rollierende Messwerte je Befehl, gefüllt von echten Round-Trips zum Simulator."""
+from __future__ import annotations
+
+from _loader import load
+
+api_module = load("avalon_api")
+metrics = load("metrics")
+
+
+def test_rolling_histogram_keeps_the_last_values():
+    histogram = metrics.RollingHistogram(size=4)
+    assert histogram.percentile(0.5) is None
+    assert histogram.summary() == {"count": 0}
+    for value in (100, 1, 2, 3, 4):
+        histogram.add(value)
+    # 100 ist aus dem Fenster gefallen
+    assert len(histogram) == 4
+    assert histogram.percentile(0.0) == 1
+    assert histogram.percentile(1.0) == 4
+    assert histogram.summary(1000, 0) == {"count": 4, "avg": 2500, "p50": 3000, "p95": 4000, "max": 4000}
+
+
+def test_exchanges_and_failures_are_recorded_per_command(with_miner):
+    async def test(miner, port):
+        api = api_module.AsyncAvalonAPI("127.0.0.1", port, retries=0, transport="text")
+        await api.batch(["summary", "estats"])
+        await api.pools()
+        miner.drop = 1.0
+        try:
+            await api.version()
+        except ConnectionError:
+            pass
+        return api.metrics.as_dict(), api.metrics.parse_p95()
+
+    recorded, parse_p95 = with_miner(test)
+    # gejointer Round-Trip steht beim gesendeten Befehl, Parse-Zeit je Abschnitt
+    joined = recorded["summary+stats"]
+    assert joined["requests"] == 1
+    assert joined["failures"] == {}
+    assert joined["bytes"]["count"] == 1
+    assert {"connect_ms", "first_byte_ms", "total_ms"} <= set(joined)
+    assert recorded["summary"]["parse_ms"]["count"] == 1
+    assert recorded["stats"]["parse_ms"]["count"] == 1
+    assert recorded["pools"]["requests"] == 1
+    assert recorded["version"]["failures"] == {"ConnectionError": 1}
+    assert parse_p95 is not None
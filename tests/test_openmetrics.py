@@ -0,0 +1,93 @@
+"""OpenMetrics-Renderer auf Snapshots, die über die API vom Simulator kommen."""
+from __future__ import annotations
+
+import re
+
+from _loader import load
+
+api_module = load("avalon_api")
+metrics = load("metrics")
+openmetrics = load("openmetrics")
+
+
+class _Coordinator:
+    def __init__(self, api, data):
+        self.api = api
+        self.data = data
+        self.last_update_success = True
+        self.stale_sections = {"pools": 12.0}
+        self.poll_latency = metrics.RollingHistogram()
+        self.poll_latency.add(0.05)
+
+    def poll_failure_rate(self):
+        return 25.0
+
+
+def _snapshot(with_miner):
+    async def test(miner, port):
+        api = api_module.AsyncAvalonAPI("127.0.0.1", port, transport="text")
+        return _Coordinator(api, await api.batch(["summary", "estats", "pools"]))
+
+    return with_miner(test)
+
+
+def test_render_is_valid_openmetrics(with_miner):
+    coordinator = _snapshot(with_miner)
+    text = openmetrics.OpenMetricsRenderer().render([coordinator])
+    assert text.endswith("# EOF\n")
+
+    types = dict(re.findall(r"^# TYPE (\S+) (\S+)$", text, re.M))
+    assert types["avalon_poll_latency_seconds"] == "summary"
+    assert types["avalon_shares_accepted"] == "counter"
+    samples = [line for line in text.splitlines() if not line.startswith("#")]
+    for line in samples:
+        name = line.split("{", 1)[0]
+        family = name[: -len("_total")] if name.endswith("_total") else name
+        assert family in types
+        # Counter-Samples mit _total, quantile nur bei summary
+        assert name.endswith("_total") == (types[family] == "counter")
+        assert ('quantile="' in line) == (types[family] == "summary")
+
+    assert 'avalon_poll_latency_seconds{host="127.0.0.1",port="' in text
+    assert re.search(r'^avalon_stale_sections\{[^}]*\} 1$', text, re.M)
+    assert re.search(r'^avalon_poll_failure_ratio\{[^}]*\} 0\.25$', text, re.M)
+    assert re.search(r'^avalon_pool_active\{[^}]*pool="p1"[^}]*\} [01]$', text, re.M)
+
+
+def test_unchanged_sections_reuse_rendered_lines(with_miner):
+    coordinator = _snapshot(with_miner)
+    renderer = openmetrics.OpenMetricsRenderer()
+    first = renderer.render([coordinator])
+    labels = renderer._labels[(coordinator.api.host, coordinator.api.port)]
+    summary_lines = labels.sections["summary"][1]
+    assert renderer.render([coordinator]) == first
+    assert labels.sections["summary"][1] is summary_lines
+
+    # neues summary-Objekt -> nur diese Section wird neu gerendert
+    estats_lines = labels.sections["estats"][1]
+    coordinator.data = {**coordinator.data, "summary": {"SUMMARY": {"Elapsed": 5}}}
+    text = renderer.render([coordinator])
+    assert re.search(r'^avalon_uptime_seconds\{[^}]*\} 5$', text, re.M)
+    assert labels.sections["estats"][1] is estats_lines
+
+    # Miner verschwindet -> Label-Satz fällt raus
+    renderer.render([])
+    assert not renderer._labels
+
+
+def test_ps_flags_and_duplicate_hosts(with_miner):
+    coordinator = _snapshot(with_miner)
+    text = openmetrics.OpenMetricsRenderer().render([coordinator])
+    fields = set(re.findall(r'^avalon_ps\{[^}]*field="([^"]+)"\}', text, re.M))
+    assert "PS_HashboardVoltage" in fields
+    assert not fields & {"PS_Status", "PS_Reserved", "PS_Power"}
+
+    broken = _Coordinator(coordinator.api, {"estats": {"PS": {"raw": "x", "parse_error": True}}})
+    assert "avalon_ps{" not in openmetrics.OpenMetricsRenderer().render([broken])
+
+    # derselbe Miner in zwei Config-Entries -> eine Serie, vom erfolgreichen Coordinator
+    failed = _Coordinator(coordinator.api, {})
+    failed.last_update_success = False
+    text = openmetrics.OpenMetricsRenderer().render([failed, coordinator])
+    assert len(re.findall(r"^avalon_up\{", text, re.M)) == 1
+    assert re.search(r"^avalon_up\{[^}]*\} 1$", text, re.M)
@@ -0,0 +1,79 @@
+"""Text-Parser: Gleichheit mit dem bisherigen Parser auf Simulator-Antworten, plus die bewussten Abweichungen."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from _loader import fixture, load
+from bench_parser import legacy_parse_generic, polls
+
+api_module = load("avalon_api")
+
+_MASK = "\x00"
+
+
+def _restore(value):
+    if isinstance(value, dict):
+        return {key: _restore(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_restore(item) for item in value]
+    if isinstance(value, str):
+        return value.replace(_MASK, ",")
+    return value
+
+
+def _legacy(raw: str):
+    """Bisheriger Parser; escapete Kommas (``\\,``) konnte er nicht und bekommt sie maskiert"""
+    return _restore(legacy_parse_generic(raw.replace("\\,", _MASK)))
+
+
+@pytest.mark.parametrize("command", ["version", "summary", "stats", "devs", "pools"])
+def test_matches_legacy_on_simulator_polls(with_miner, command):
+    async def test(miner, port):
+        api = api_module.AsyncAvalonAPI("127.0.0.1", port, transport="text")
+        for _ in range(5):
+            raw = await api._fetch(command)
+            # gleiche Instanz -> ab dem zweiten Poll über den gemerkten Layout-Stand
+            assert api._parse_generic(raw) == _legacy(raw)
+            await asyncio.sleep(0.01)
+        return api
+
+    with_miner(test)
+
+
+@pytest.mark.parametrize("name", ["summary", "stats", "pools", "version"])
+@pytest.mark.parametrize("every", [1, 4])
+def test_matches_legacy_on_changing_values(name, every):
+    api = api_module.AsyncAvalonAPI("parser")
+    for raw in polls(fixture(f"{name}.txt"), every, count=20):
+        assert api._parse_generic(raw) == _legacy(raw)
+
+
+def test_unchanged_reply_keeps_values_and_changed_token_is_updated():
+    api = api_module.AsyncAvalonAPI("parser")
+    first = api._parse_generic("STATUS=S,When=1|SUMMARY,Elapsed=10,MHS av=1.5,Accepted=3|")
+    second = api._parse_generic("STATUS=S,When=2|SUMMARY,Elapsed=11,MHS av=1.5,Accepted=3|")
+    assert second["SUMMARY"] == {"Elapsed": 11, "MHS av": 1.5, "Accepted": 3}
+    # der zuvor gelieferte Stand wird nicht verändert
+    assert first["SUMMARY"]["Elapsed"] == 10
+
+
+def test_numbers_and_escapes_beyond_legacy():
+    api = api_module.AsyncAvalonAPI("parser")
+    parsed = api._parse_generic(
+        "STATUS=S,When=1|STATS=0,Temp=-3,Rate=1.5e+05,DNA=0132e5,Msg=a\\,b\\|c\\=d\\\\e,Ver=4.11.1|"
+    )["STATS"]
+    assert parsed["Temp"] == -3
+    assert parsed["Rate"] == 1.5e5
+    # Hex bleibt Text, Versionsnummern auch
+    assert parsed["DNA"] == "0132e5"
+    assert parsed["Ver"] == "4.11.1"
+    assert parsed["Msg"] == "a,b|c=d\\e"
+
+
+def test_pool_sections_become_a_list():
+    api = api_module.AsyncAvalonAPI("parser")
+    parsed = api._parse_generic("STATUS=S|POOL=0,URL=a,Accepted=1|POOL=1,URL=b,Accepted=2|")
+    assert [pool["URL"] for pool in parsed["POOL"]] == ["a", "b"]
+    assert [pool["POOL"] for pool in parsed["POOL"]] == ["0", "1"]
@@ -0,0 +1,119 @@
+"""CGMinerProxy zwischen Client und Simulator: Antworten aus dem Snapshot, Steuerbefehle durchgereicht."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+from _loader import fixture, load
+
+api_module = load("avalon_api")
+proxy_module = load("proxy")
+
+
+async def _ask(port: int, request: str) -> str:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request.encode())
+    await writer.drain()
+    reply = await reader.read()
+    writer.close()
+    return reply.rstrip(b"\x00").decode()
+
+
+def test_reads_from_snapshot_and_forwards_writes(with_miner):
+    async def test(miner, port):
+        api = api_module.AsyncAvalonAPI("127.0.0.1", port, transport="text")
+        writes = []
+        proxy = proxy_module.CGMinerProxy(api, max_age=60, on_write=lambda: writes.append(True))
+        server = await proxy.start("127.0.0.1", 0)
+        proxy_port = server.sockets[0].getsockname()[1]
+        try:
+            await api.batch(["summary", "stats"])
+            served = miner.served
+
+            # aus den gemerkten Rohantworten, auch gejoint
+            summary = await _ask(proxy_port, "summary")
+            joined = await _ask(proxy_port, "summary+stats")
+            assert summary.startswith("STATUS=S") and "SUMMARY," in summary
+            assert joined.count("STATUS=") == 2
+            assert miner.served == served
+            assert proxy.hits == 2
+
+            # estats ist nur aus stats abgeleitet -> echte Antwort vom Miner
+            await _ask(proxy_port, "summary+estats")
+            assert proxy.forwarded == 1
+            assert miner.served == served + 1
+
+            # pools war nicht im Snapshot -> weitergeleitet und danach gemerkt
+            await _ask(proxy_port, "pools")
+            await _ask(proxy_port, "pools")
+            assert proxy.forwarded == 2
+            assert miner.served == served + 2
+
+            # JSON-Client bekommt Textantworten nicht aus dem Snapshot
+            await _ask(proxy_port, json.dumps({"command": "summary"}))
+            assert proxy.forwarded == 3
+
+            reply = await _ask(proxy_port, "ascset|0,fan-spd,60")
+            assert "ASC 0 set OK" in reply
+            assert miner.fan == 60
+            assert proxy.writes == 1
+            assert writes == [True]
+        finally:
+            await proxy.close()
+
+    with_miner(test)
+
+
+def test_text_client_from_json_snapshot(with_miner):
+    async def test(miner, port):
+        api = api_module.AsyncAvalonAPI("127.0.0.1", port, transport="json")
+        proxy = proxy_module.CGMinerProxy(api, max_age=60)
+        server = await proxy.start("127.0.0.1", 0)
+        proxy_port = server.sockets[0].getsockname()[1]
+        try:
+            # Snapshot wie nach einem JSON-Poll: Rohtext bzw. Teil einer gejointen Antwort
+            now = time.monotonic()
+            api.replies.update(summary=(now, fixture("summary.json")), pools=(now, json.loads(fixture("pools.json"))))
+
+            reply = await _ask(proxy_port, "summary+pools")
+            assert (proxy.hits, proxy.forwarded) == (1, 0)
+            assert miner.served == 0
+            assert reply.startswith("STATUS=S,") and "|SUMMARY,Elapsed=" in reply
+            # POOL-Abschnitte ohne Listen-Namen, wie beim Miner
+            assert "|POOL=0," in reply
+            assert "POOLS," not in reply
+
+            # der Text-Parser liest daraus dieselben Werte wie aus dem JSON
+            summary, pools = reply.split("|STATUS=")
+            expected = api._parse_reply("summary", fixture("summary.json"))
+            assert api._parse_reply("summary", summary)["SUMMARY"] == expected["SUMMARY"]
+            text_pools = api._parse_reply("pools", "STATUS=" + pools)
+            json_pools = api._parse_reply("pools", fixture("pools.json"))
+            assert [pool["URL"] for pool in text_pools.values()] == [pool["URL"] for pool in json_pools.values()]
+        finally:
+            await proxy.close()
+
+    with_miner(test)
+
+
+def test_stale_snapshot_and_unreachable_miner(with_miner):
+    async def test(miner, port):
+        api = api_module.AsyncAvalonAPI("127.0.0.1", port, timeout=0.5, retries=0, transport="text")
+        proxy = proxy_module.CGMinerProxy(api, max_age=0)
+        server = await proxy.start("127.0.0.1", 0)
+        proxy_port = server.sockets[0].getsockname()[1]
+        try:
+            await api.batch(["summary"])
+            await asyncio.sleep(0.01)
+            await _ask(proxy_port, "summary")
+            assert (proxy.hits, proxy.forwarded) == (0, 1)
+
+            miner.drop = 1.0
+            reply = await _ask(proxy_port, "summary")
+            assert reply.startswith("STATUS=E") and "Miner unavailable" in reply
+            assert proxy.errors == 1
+        finally:
+            await proxy.close()
+
+    with_miner(test)
@@ -0,0 +1,55 @@
+"""Der Simulator selbst: Antworten folgen dem Zustand des simulierten Miners."""
+from __future__ import annotations
+
+import asyncio
+
+import simulator
+from _loader import load
+
+api_module = load("avalon_api")
+
+
+def _miner(**options) -> simulator.SimulatedMiner:
+    return simulator.SimulatedMiner(simulator.Templates(), **options)
+
+
+def test_replies_follow_control_commands():
+    miner = _miner()
+    assert "ASC 0 set OK" in miner.reply("ascset|0,workmode,set,2")
+    assert "ASC 0 set OK" in miner.reply("ascset|0,fan-spd,5")
+    assert "success set info" in miner.reply("setpool|root,admin,1,stratum+tcp://pool.test:3333,worker,x")
+    assert "Switching to pool 1" in miner.reply("switchpool|1")
+    assert "Access denied" in miner.reply("setpool|root,wrong,1,url,user,x")
+    assert miner.reply("ascset|0,unknown,1").startswith("STATUS=E")
+
+    api = api_module.AsyncAvalonAPI("simulator")
+    estats = api._parse_estats(api._parse_generic(miner.reply("stats")))
+    pools = api._parse_pools(api._parse_generic(miner.reply("pools")))
+    assert estats["WORKMODE"] == 2
+    # fan-spd wird wie von der Firmware auf 15..100 begrenzt
+    assert estats["fans"]["FanR"] == 15
+    assert pools["p2"]["URL"] == "stratum+tcp://pool.test:3333"
+    assert pools["p2"]["Stratum Active"] == "true"
+
+
+def test_joined_and_json_requests():
+    miner = _miner()
+    joined = miner.reply("summary+pools")
+    assert joined.count("STATUS=S") == 2
+    # JSON versteht der Simulator nicht -> Textantwort wie ältere Firmware
+    assert miner.reply('{"command": "version"}').startswith("STATUS=S")
+    assert "Invalid command" in miner.reply("bogus")
+
+
+def test_each_miner_of_a_fleet_has_its_own_identity(free_port):
+    async def test():
+        fleet = await simulator.start_fleet(count=3, base_port=free_port, seed=1)
+        try:
+            apis = [api_module.AsyncAvalonAPI(host, port, transport="text") for host, port, _, _ in fleet]
+            versions = await asyncio.gather(*(api.version() for api in apis))
+        finally:
+            await simulator.close_fleet(fleet)
+        return [version["VERSION"]["MAC"] for version in versions]
+
+    macs = asyncio.run(test())
+    assert len(set(macs)) == 3
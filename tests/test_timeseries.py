@@ -0,0 +1,55 @@
+"""TimeSeries: Ringpuffer, Buckets und Zähler-Rücksprünge."""
+from __future__ import annotations
+
+import math
+
+from _loader import load
+
+timeseries = load("timeseries")
+
+
+def _data(mhs, accepted, temp=60.0):
+    return {
+        "summary": {"SUMMARY": {"MHS 5s": mhs, "Accepted": accepted, "Rejected": 0}},
+        "estats": {"temperatures": {"TAvg": temp, "TMax": temp + 5}},
+    }
+
+
+def test_raw_ring_keeps_only_the_window():
+    series = timeseries.TimeSeries(window=30, interval=10)
+    for step in range(5):
+        series.record(step * 10.0, _data(step, step), ["summary", "estats"])
+    view = series.view("raw", ["hashrate"])
+    assert view["time"] == [20.0, 30.0, 40.0]
+    assert view["hashrate"] == [2.0, 3.0, 4.0]
+
+
+def test_delta_column_survives_counter_reset():
+    series = timeseries.TimeSeries(window=100, interval=10)
+    for timestamp, accepted in ((0, 100), (10, 110), (20, 5), (30, 9)):
+        series.record(float(timestamp), _data(1, accepted), ["summary"])
+    # erster Wert ohne Vorgänger -> kein Zuwachs; nach dem Reset zählt der neue Stand
+    assert series.view("raw", ["accepted"])["accepted"] == [None, 10.0, 5.0, 4.0]
+    assert series.aggregate("raw", "accepted", "sum") == 19.0
+
+
+def test_buckets_aggregate_mean_max_and_sum():
+    series = timeseries.TimeSeries(window=60, interval=5)
+    # zwei Samples im selben 10-s-Bucket der 1h-Ansicht, dann ein neuer Bucket
+    series.record(0.0, _data(10, 0, temp=50), ["summary", "estats"])
+    series.record(5.0, _data(20, 4, temp=70), ["summary", "estats"])
+    series.record(10.0, _data(30, 6, temp=40), ["summary", "estats"])
+    view = series.view("1h", ["hashrate", "temp_max", "accepted"])
+    assert view["bucket_seconds"] == 10
+    assert view["time"] == [0.0, 10.0]
+    assert view["hashrate"] == [15.0, 30.0]
+    assert view["temp_max"] == [75.0, 45.0]
+    assert view["accepted"] == [4.0, 2.0]
+
+
+def test_missing_sections_are_nan_and_do_not_count():
+    series = timeseries.TimeSeries(window=60, interval=10)
+    series.record(0.0, _data(10, 0), ["summary"])
+    row = [column[0] for column in series.raw.columns]
+    assert math.isnan(row[list(timeseries.COLUMNS).index("temp_avg")])
+    assert series.aggregate("raw", "temp_avg") is None
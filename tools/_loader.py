@@ -0,0 +1,36 @@
+"""Lädt Module der Integration ohne Home Assistant (nur für die Tools)."""
+from __future__ import annotations
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+COMPONENT_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "avalon_nano3s"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+_PACKAGE = "avalon_nano3s"
+
+
+def load(name: str) -> types.ModuleType:
+    """Modul ``name`` aus custom_components/avalon_nano3s laden.
+
+    Das Paket-``__init__`` importiert Home Assistant; für API, Parser und
+    Simulator wird es nicht gebraucht, deshalb wird nur ein leeres Paket
+    registriert, damit relative Imports (``from .const import ...``) greifen.
+    """
+    if _PACKAGE not in sys.modules:
+        package = types.ModuleType(_PACKAGE)
+        package.__path__ = [str(COMPONENT_DIR)]
+        sys.modules[_PACKAGE] = package
+    full_name = f"{_PACKAGE}.{name}"
+    if full_name in sys.modules:
+        return sys.modules[full_name]
+    spec = importlib.util.spec_from_file_location(full_name, COMPONENT_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[full_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
@@ -0,0 +1,241 @@
+"""End-to-End-Benchmark: AsyncAvalonAPI gegen simulierte Miner.
+
+Startet ``tools/simulator.py`` als eigenen Prozess (die CPU-Zeit des
+Simulators zählt so nicht mit) und pollt je Flottengröße alle Miner in
+``--rounds`` Runden mit dem Befehlssatz eines normalen Ticks
+(``AsyncAvalonAPI.batch``, wie im Coordinator-Refresh), höchstens
+``--concurrency`` gleichzeitig. Gemessen werden:
+
+- Poll-Latenz p50/p99/max und Polls pro Sekunde
+- CPU-Zeit des Benchmark-Prozesses pro Poll
+- Event-Loop-Verzögerung (p50/p99/max) während der Polls
+- Speicher pro Miner (tracemalloc, API-Instanz samt gemerkter Antworten)
+- Parse-Zeit je Befehl (kalt, unveränderte Antwort) und estats-Ableitung
+
+Das Ergebnis geht als JSON nach ``--output``, damit Änderungen an Parser,
+estats oder Refresh-Pfad als Zahlen vergleichbar sind.
+
+    python tools/bench_e2e.py [--sizes 1,100,1000] [--output bench_e2e.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+from _loader import fixture, load
+
+TOOLS_DIR = Path(__file__).resolve().parent
+FIXTURE_COMMANDS = ("summary", "stats", "pools", "devs", "version")
+# Abtastintervall für die Event-Loop-Verzögerung
+LAG_INTERVAL = 0.005
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(values: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    """p50/p99/max (Standard: in ms)"""
+    return {
+        "p50": round(percentile(values, 0.5) * scale, 3),
+        "p99": round(percentile(values, 0.99) * scale, 3),
+        "max": round(max(values, default=0.0) * scale, 3),
+    }
+
+
+def measure_parsing(api_module: Any, number: int) -> Dict[str, Dict[str, float]]:
+    """Parse-Zeit je Befehl in µs: kalt (ohne gemerkten Stand) und bei unveränderter Antwort"""
+    results: Dict[str, Dict[str, float]] = {}
+    api = api_module.AsyncAvalonAPI("bench-parse")
+    for cmd in FIXTURE_COMMANDS:
+        text = fixture(f"{cmd}.txt")
+
+        def cold() -> None:
+            api._sections.clear()
+            api._parse_reply(cmd, text)
+
+        api._parse_reply(cmd, text)
+        results[cmd] = {
+            "cold_us": round(min(timeit.repeat(cold, number=number, repeat=3)) * 1e6 / number, 2),
+            "same_us": round(
+                min(timeit.repeat(lambda: api._parse_reply(cmd, text), number=number, repeat=3)) * 1e6 / number, 2
+            ),
+        }
+    stats = api._parse_reply("stats", fixture("stats.txt"))
+    results["estats"] = {
+        "derive_us": round(
+            min(timeit.repeat(lambda: api._parse_estats(stats), number=number, repeat=3)) * 1e6 / number, 2
+        ),
+    }
+    return results
+
+
+class LoopLagMonitor:
+    """Misst, wie viel später als geplant ein ``sleep(LAG_INTERVAL)`` zurückkehrt"""
+
+    def __init__(self) -> None:
+        self.lags: List[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.lags.append(max(0.0, loop.time() - start - LAG_INTERVAL))
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+def start_simulator(args: argparse.Namespace, network: str, count: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(TOOLS_DIR / "simulator.py"),
+            "--network", network,
+            "--count", str(count),
+            "--port", str(args.port),
+            "--latency", str(args.latency),
+            "--jitter", str(args.jitter),
+            "--seed", "1",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    # erste Zeile erst, wenn alle Miner lauschen
+    line = process.stdout.readline()
+    if not line:
+        raise RuntimeError("Simulator did not start")
+    return process
+
+
+async def run_size(api_module: Any, args: argparse.Namespace, size: int) -> Dict[str, Any]:
+    network = ipaddress.ip_network(args.network)
+    hosts = [str(address) for address in network.hosts()][:size]
+    if len(hosts) < size:
+        raise ValueError(f"{args.network} has fewer than {size} hosts")
+    commands = args.commands.split(",")
+
+    # Speicher: API-Instanzen und eine Runde gemerkter Antworten
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    apis = [api_module.AsyncAvalonAPI(host, args.port, args.timeout, transport=args.transport) for host in hosts]
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def poll(api: Any, latencies: List[float], errors: List[str]) -> None:
+        async with limit:
+            start = time.perf_counter()
+            try:
+                await api.batch(commands)
+            except Exception as err:  # Fehler zählen, Benchmark läuft weiter
+                errors.append(type(err).__name__)
+                return
+            latencies.append(time.perf_counter() - start)
+
+    warmup_errors: List[str] = []
+    await asyncio.gather(*(poll(api, [], warmup_errors) for api in apis))
+    memory_per_miner = (tracemalloc.get_traced_memory()[0] - before) / size
+    tracemalloc.stop()
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    monitor = LoopLagMonitor()
+    monitor.start()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for _ in range(args.rounds):
+        await asyncio.gather(*(poll(api, latencies, errors) for api in apis))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    await monitor.stop()
+
+    polls = len(latencies)
+    return {
+        "miners": size,
+        "polls": polls,
+        "errors": len(errors) + len(warmup_errors),
+        "latency_ms": summarize(latencies),
+        "polls_per_second": round(polls / wall, 1) if wall else 0.0,
+        "cpu_ms_per_poll": round(cpu / polls * 1000, 4) if polls else 0.0,
+        "loop_lag_ms": summarize(monitor.lags),
+        "memory_kb_per_miner": round(memory_per_miner / 1024, 2),
+    }
+
+
+async def run(args: argparse.Namespace, api_module: Any) -> List[Dict[str, Any]]:
+    results = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        process = start_simulator(args, args.network, size)
+        try:
+            result = await run_size(api_module, args, size)
+        finally:
+            process.terminate()
+            process.wait()
+        print(
+            f"{size:>5} miners: p50 {result['latency_ms']['p50']:.2f} ms, p99 {result['latency_ms']['p99']:.2f} ms, "
+            f"{result['polls_per_second']:.0f} polls/s, {result['cpu_ms_per_poll']:.3f} ms CPU/poll, "
+            f"loop lag p99 {result['loop_lag_ms']['p99']:.2f} ms, {result['memory_kb_per_miner']:.1f} kB/miner, "
+            f"errors {result['errors']}"
+        )
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,100,1000", help="Flottengrößen, kommagetrennt")
+    parser.add_argument("--rounds", type=int, default=20, help="Poll-Runden je Größe")
+    parser.add_argument("--commands", default="summary,estats", help="Befehle je Poll (Standard: normaler Tick)")
+    parser.add_argument("--concurrency", type=int, default=32, help="gleichzeitige Polls (wie der Hub)")
+    parser.add_argument("--network", default="127.2.0.0/22", help="Loopback-Netz für die simulierten Miner")
+    parser.add_argument("--port", type=int, default=14028)
+    parser.add_argument("--timeout", type=float, default=5)
+    parser.add_argument("--transport", default="text", choices=("text", "json", "auto"))
+    parser.add_argument("--latency", type=float, default=0.002, help="Simulator-Antwortzeit in s")
+    parser.add_argument("--jitter", type=float, default=0.001, help="± Zufallsanteil in s")
+    parser.add_argument("--number", type=int, default=500, help="Aufrufe je Parse-Messung")
+    parser.add_argument("--output", default="bench_e2e.json", help="JSON-Ergebnisdatei")
+    args = parser.parse_args()
+
+    api_module = load("avalon_api")
+    parsing = measure_parsing(api_module, args.number)
+    for cmd, values in parsing.items():
+        print(f"parse {cmd:<8}" + "".join(f"  {key} {value:>8.1f}" for key, value in values.items()))
+
+    fleet = asyncio.run(run(args, api_module))
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "parse": parsing,
+        "fleet": fleet,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
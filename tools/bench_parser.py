@@ -0,0 +1,160 @@
+"""Microbenchmark für AsyncAvalonAPI._parse_generic.
+
+Vergleicht den bisherigen Parser (split + isdigit je Token, unten als
+``legacy_parse_generic`` festgehalten) mit dem aktuellen Parser auf den
+Antworten in ``tools/fixtures``. Gemessen wird der aktuelle Parser
+ohne gemerkten Stand (cold), bei Folge-Polls in denen jeder vierte
+Zahlenwert (25%) bzw. jeder Zahlenwert (100%) neu ist, und bei
+unveränderter Antwort (same); der bisherige Parser auf der Antwort
+(legacy) und auf denselben Folge-Polls wie bei 100% (legacy 100%).
+Zwischen zwei Polls ändern sich real vor allem Zähler, Temperaturen und
+Hashraten; Backup-Pools und Version bleiben meist gleich.
+
+    python tools/bench_parser.py [--number 20] [--repeat 200]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import timeit
+from itertools import cycle
+from typing import Any, Callable, Dict, List, Optional
+
+from _loader import fixture, load
+
+PAYLOADS = ("summary", "stats", "pools", "version")
+_VALUE_NUMBER = re.compile(r"(?<==)(\d+)(?=[,|.])")
+
+
+def polls(raw: str, every: int, count: int = 200) -> List[str]:
+    """Folge-Antworten, in denen jeder ``every``-te Zahlenwert pro Poll weiterzählt.
+
+    Section-Köpfe (``STATS=0``, ``POOL=1``) bleiben wie beim echten Miner gleich.
+    """
+    result = []
+    for step in range(1, count + 1):
+        seen = [0]
+
+        def bump(match: "re.Match[str]") -> str:
+            start = match.start()
+            if raw.rfind("|", 0, start) >= raw.rfind(",", 0, start):
+                return match.group(1)
+            seen[0] += 1
+            if seen[0] % every:
+                return match.group(1)
+            return str(int(match.group(1)) + step)
+
+        result.append(_VALUE_NUMBER.sub(bump, raw))
+    return result
+
+
+def legacy_parse_generic(data: Optional[str]) -> Dict[str, Any]:
+    """Parser-Stand vor dem Umbau (nur als Referenz für den Vergleich)."""
+    if not data or "|" not in data:
+        return {}
+    sections: Dict[str, Any] = {}
+    parts = data.split("|")
+    status_part = parts[0].strip()
+    if status_part:
+        status_values = {}
+        for token in status_part.split(","):
+            token = token.strip()
+            if "=" in token:
+                k, v = token.split("=", 1)
+                k = k.strip()
+                v = v.strip()
+                if v.isdigit():
+                    status_values[k] = int(v)
+                elif '.' in v and v.replace('.', '', 1).isdigit():
+                    status_values[k] = float(v)
+                else:
+                    status_values[k] = v
+        sections["STATUS"] = status_values
+    for part in parts[1:]:
+        part = part.strip()
+        if not part:
+            continue
+        values = {}
+        section_name = None
+        tokens = part.split(",")
+        first_token = tokens[0].strip()
+        if "=" in first_token:
+            name_key, name_val = first_token.split("=", 1)
+            if name_key == "POOL":
+                section_name = "POOL"
+                values["POOL"] = name_val.strip()
+                tokens = tokens[1:]
+        else:
+            section_name = first_token
+        for token in tokens:
+            token = token.strip()
+            if "=" not in token:
+                continue
+            k, v = token.split("=", 1)
+            k = k.strip()
+            v = v.strip()
+            if v.isdigit():
+                values[k] = int(v)
+            elif '.' in v and v.replace('.', '', 1).isdigit():
+                values[k] = float(v)
+            else:
+                values[k] = v
+        if not section_name and values:
+            section_name = next(iter(values))
+        if section_name:
+            if section_name in sections:
+                if isinstance(sections[section_name], list):
+                    sections[section_name].append(values)
+                else:
+                    sections[section_name] = [sections[section_name], values]
+            else:
+                sections[section_name] = values
+    return sections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20, help="Aufrufe je Messung")
+    parser.add_argument("--repeat", type=int, default=200, help="Messungen, das Minimum zählt")
+    args = parser.parse_args()
+
+    module = load("avalon_api")
+
+    print(
+        f"{'payload':<10}{'bytes':>7}{'legacy µs':>11}{'legacy 100%':>13}{'cold µs':>9}"
+        f"{'25% µs':>9}{'100% µs':>9}{'same µs':>9}"
+    )
+    for name in PAYLOADS:
+        raw = fixture(f"{name}.txt")
+        # je Fall eine eigene API-Instanz, damit sich die gemerkten Sections nicht stören
+        apis = [module.AsyncAvalonAPI(f"bench{i}") for i in range(4)]
+        quarter = cycle(polls(raw, 4))
+        every = cycle(polls(raw, 1))
+        legacy_every = cycle(polls(raw, 1))
+        apis[3]._parse_generic(raw)
+
+        def run_cold() -> None:
+            apis[0]._sections.clear()
+            apis[0]._parse_generic(raw)
+
+        cases: Dict[str, Callable[[], Any]] = {
+            "legacy": lambda: legacy_parse_generic(raw),
+            "legacy_all": lambda: legacy_parse_generic(next(legacy_every)),
+            "cold": run_cold,
+            "quarter": lambda: apis[1]._parse_generic(next(quarter)),
+            "all": lambda: apis[2]._parse_generic(next(every)),
+            "same": lambda: apis[3]._parse_generic(raw),
+        }
+        # Fälle abwechselnd messen, damit Lastschwankungen der Maschine alle gleich treffen
+        best = {case: float("inf") for case in cases}
+        for _ in range(args.repeat):
+            for case, func in cases.items():
+                best[case] = min(best[case], timeit.timeit(func, number=args.number) * 1e6 / args.number)
+        print(
+            f"{name:<10}{len(raw):>7}{best['legacy']:>11.1f}{best['legacy_all']:>13.1f}{best['cold']:>9.1f}"
+            f"{best['quarter']:>9.1f}{best['all']:>9.1f}{best['same']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
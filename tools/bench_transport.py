@@ -0,0 +1,61 @@
+"""Vergleich Text- vs. JSON-Transport der CGMiner-API.
+
+Misst für die Antworten in ``tools/fixtures`` (``<cmd>.txt`` und
+``<cmd>.json``) die Payload-Größe und die Zeit von der dekodierten
+Antwort bis zur Struktur, die die Plattformen nutzen
+(``AsyncAvalonAPI._parse_reply``). Für Text wird sowohl der erste Poll
+(cold) als auch eine unveränderte Folge-Antwort (same) gemessen.
+
+    python tools/bench_transport.py [--number 200]
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Any, Callable
+
+from _loader import fixture, load
+
+COMMANDS = ("summary", "stats", "pools", "devs", "version")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200, help="Aufrufe je Messung")
+    parser.add_argument("--repeat", type=int, default=5, help="Messungen, das Minimum zählt")
+    args = parser.parse_args()
+
+    api_module = load("avalon_api")
+    api = api_module.AsyncAvalonAPI("bench")
+
+    def measure(func: Callable[[], Any]) -> float:
+        return min(timeit.repeat(func, number=args.number, repeat=args.repeat)) * 1e6 / args.number
+
+    print(
+        f"{'command':<9}{'text B':>8}{'json B':>8}"
+        f"{'text cold µs':>14}{'text same µs':>14}{'json µs':>9}{'same shape':>12}"
+    )
+    for cmd in COMMANDS:
+        text = fixture(f"{cmd}.txt")
+        raw_json = fixture(f"{cmd}.json")
+
+        def run_text_cold() -> None:
+            api._sections.clear()
+            api._parse_reply(cmd, text)
+
+        # JSON inkl. Dekodieren, Text ohne: beide starten beim decodierten str aus _send_raw
+        run_json = lambda: api._parse_reply(cmd, api_module._decode_json(raw_json))  # noqa: E731
+
+        same = api._parse_reply(cmd, text) == run_json()
+        text_cold = measure(run_text_cold)
+        api._parse_reply(cmd, text)
+        text_cached = measure(lambda: api._parse_reply(cmd, text))
+        json_time = measure(run_json)
+        print(
+            f"{cmd:<9}{len(text):>8}{len(raw_json):>8}"
+            f"{text_cold:>14.1f}{text_cached:>14.1f}{json_time:>9.1f}{str(same):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
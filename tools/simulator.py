@@ -0,0 +1,360 @@
+"""CGMiner-Simulator für den Avalon Nano 3S (Text-API, ein bis tausende Miner).
+
+Beantwortet version, summary, stats, estats, devs, pools (auch gejoint,
+``summary+stats``) sowie ascset (workmode, fan-spd, ledset, reboot),
+setpool und switchpool. Die Antworten kommen aus ``tools/fixtures``
+(oder ``--fixtures``) und werden als Vorlage genutzt: When, Elapsed,
+Accepted, Hashraten, WORKMODE, Lüfter, LED und Pools folgen dem Zustand
+des simulierten Miners. JSON-Anfragen werden wie von älterer Firmware
+mit Text beantwortet.
+
+Latenz, Jitter, verworfene Verbindungen (drop) und hängende Antworten
+(stall) sind einstellbar. Für eine Flotte bekommt jeder Miner eine eigene
+Loopback-Adresse (``--network 127.1.0.0/22``, alle auf ``--port``) oder
+einen eigenen Port (``--count 1000 --base-port 14028``).
+
+    python tools/simulator.py --network 127.1.0.0/24 --latency 0.02 --jitter 0.01 --drop 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import ipaddress
+import random
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from _loader import FIXTURES_DIR, load
+
+READ_COMMANDS = ("version", "summary", "stats", "estats", "devs", "pools")
+# Hashrate relativ zu den Fixtures je Workmode (Low/Mid/High)
+WORKMODE_FACTOR = {0: 0.75, 1: 1.0, 2: 1.2}
+# Shares pro Sekunde Laufzeit (Accepted zählt mit)
+SHARE_RATE = 0.05
+DESCRIPTION = "cgminer 4.11.1"
+
+# Dynamische Felder der Fixtures -> Platzhalter der Vorlage
+_PLACEHOLDERS = (
+    (re.compile(r"When=\d+"), "When={when}"),
+    (re.compile(r"Elapsed=\d+"), "Elapsed={elapsed}"),
+    (re.compile(r"Elapsed\[\d+\]"), "Elapsed[{elapsed}]"),
+    (re.compile(r"Accepted=\d+"), "Accepted={accepted}"),
+    (re.compile(r"(MHS (?:av|5s|30s|1m|5m|15m))=[\d.]+"), r"\1={mhs}"),
+    (re.compile(r"(GHS(?:spd|avg|mm))\[[\d.]+\]"), r"\1[{ghs}]"),
+    (re.compile(r"MGHS\[[\d.]+\]"), "MGHS[{ghs}]"),
+    (re.compile(r"WORKMODE\[\d+\]"), "WORKMODE[{workmode}]"),
+    (re.compile(r"FanR\[\d+%\]"), "FanR[{fan}%]"),
+    (re.compile(r"Fan1\[\d+\]"), "Fan1[{fan_rpm}]"),
+    (re.compile(r"LEDUser\[[^\]]*\]"), "LEDUser[{led}]"),
+    (re.compile(r"(?<![\w])LED\[\d+\]"), "LED[{led_on}]"),
+    (re.compile(r"MAC=\w+"), "MAC={mac}"),
+    (re.compile(r"DNA=\w+"), "DNA={dna}"),
+    (re.compile(r"DNA\[\w+\]"), "DNA[{dna}]"),
+)
+# Je Pool-Section (POOL=<n>) eigene Platzhalter
+_POOL_FIELDS = (
+    (re.compile(r"URL=[^,|]*"), "URL={{url{n}}}"),
+    (re.compile(r"User=[^,|]*"), "User={{user{n}}}"),
+    (re.compile(r"Stratum Active=\w+"), "Stratum Active={{active{n}}}"),
+)
+_MHS_BASE = re.compile(r"MHS av=([\d.]+)")
+_FAN_BASE = re.compile(r"FanR\[(\d+)%\]")
+_LED_BASE = re.compile(r"LEDUser\[([^\]]*)\]")
+_POOL_VALUES = re.compile(r"POOL=(\d+),URL=([^,|]*).*?User=([^,|]*)")
+
+
+def _template(text: str) -> str:
+    template = text.strip().rstrip("\x00").replace("{", "{{").replace("}", "}}")
+    for pattern, replacement in _PLACEHOLDERS:
+        template = pattern.sub(replacement, template)
+    if "|POOL=" in template:
+        parts = template.split("|")
+        for index, part in enumerate(parts):
+            match = re.match(r"POOL=(\d+)", part)
+            if match:
+                for pattern, replacement in _POOL_FIELDS:
+                    part = pattern.sub(replacement.format(n=match.group(1)), part)
+                parts[index] = part
+        template = "|".join(parts)
+    return template
+
+
+class Templates:
+    """Vorlagen aus einem Fixture-Verzeichnis (``<cmd>.txt``), geteilt von allen Minern."""
+
+    def __init__(self, directory: Path = FIXTURES_DIR) -> None:
+        texts = {cmd: (directory / f"{cmd}.txt").read_text(encoding="utf-8") for cmd in READ_COMMANDS if cmd != "estats"}
+        self.replies = {cmd: _template(text) for cmd, text in texts.items()}
+        # estats liefert denselben MM-ID-Block wie stats
+        self.replies["estats"] = self.replies["stats"]
+        self.base_mhs = float(_MHS_BASE.search(texts["summary"]).group(1))
+        self.base_fan = int(_FAN_BASE.search(texts["stats"]).group(1))
+        self.base_led = _LED_BASE.search(texts["stats"]).group(1)
+        self.pools = [
+            (int(number), url, user) for number, url, user in _POOL_VALUES.findall(texts["pools"])
+        ]
+
+
+class SimulatedMiner:
+    """Zustand und Verhalten eines simulierten Nano 3S.
+
+    ``latency`` + gleichverteilter ``jitter`` verzögern jede Antwort;
+    mit Wahrscheinlichkeit ``drop`` wird die Verbindung ohne Antwort
+    geschlossen, mit ``stall`` wird nie geantwortet (bis der Client
+    aufgibt). ``served``/``dropped``/``stalled`` zählen mit.
+    """
+
+    def __init__(
+        self,
+        templates: Templates,
+        index: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop: float = 0.0,
+        stall: float = 0.0,
+        seed: Optional[int] = None,
+        web_password: str = "admin",
+    ) -> None:
+        self.templates = templates
+        self.latency = latency
+        self.jitter = jitter
+        self.drop = drop
+        self.stall = stall
+        self.web_password = web_password
+        self._random = random.Random(index if seed is None else seed + index)
+        self.mac = f"e0e1a9{index:06x}"
+        self.dna = f"02010000{index:08x}"
+        self.workmode = 1
+        self.fan = -1
+        self.led = templates.base_led
+        self.pools = {number: [url, user] for number, url, user in templates.pools}
+        self.active_pool = 0
+        self.booted = time.monotonic() - self._random.uniform(3600, 200000)
+        self.served = 0
+        self.dropped = 0
+        self.stalled = 0
+
+    # =========================
+    # Antworten
+    # =========================
+    def _status(self, ok: bool, code: int, msg: str) -> str:
+        return f"STATUS={'S' if ok else 'E'},When={int(time.time())},Code={code},Msg={msg},Description={DESCRIPTION}|"
+
+    def _values(self) -> Dict[str, object]:
+        elapsed = int(time.monotonic() - self.booted)
+        mhs = self.templates.base_mhs * WORKMODE_FACTOR.get(self.workmode, 1.0)
+        mhs *= 1 + self._random.uniform(-0.01, 0.01)
+        fan = self.templates.base_fan if self.fan < 0 else self.fan
+        values: Dict[str, object] = {
+            "when": int(time.time()),
+            "elapsed": elapsed,
+            "accepted": int(elapsed * SHARE_RATE),
+            "mhs": f"{mhs:.2f}",
+            "ghs": f"{mhs / 1000:.2f}",
+            "workmode": self.workmode,
+            "fan": fan,
+            "fan_rpm": fan * 46,
+            "led": self.led,
+            "led_on": 0 if self.led.startswith("0-") else 1,
+            "mac": self.mac,
+            "dna": self.dna,
+        }
+        for number, (url, user) in self.pools.items():
+            values[f"url{number}"] = url
+            values[f"user{number}"] = user
+            values[f"active{number}"] = "true" if number == self.active_pool else "false"
+        return values
+
+    def _ascset(self, param: str) -> str:
+        parts = param.split(",")
+        if len(parts) < 3:
+            return self._status(False, 120, "Missing ascset parameter")
+        option, args = parts[1], parts[2:]
+        try:
+            if option == "workmode" and args[0] == "set" and int(args[1]) in WORKMODE_FACTOR:
+                self.workmode = int(args[1])
+            elif option == "fan-spd":
+                speed = int(args[0])
+                self.fan = -1 if speed == -1 else max(15, min(100, speed))
+            elif option == "ledset" and len(args[0].split("-")) == 6:
+                self.led = "-".join(str(int(value)) for value in args[0].split("-"))
+            elif option == "reboot":
+                self.booted = time.monotonic()
+            else:
+                return self._status(False, 120, f"Invalid ascset option {option}")
+        except (IndexError, ValueError):
+            return self._status(False, 120, f"Invalid ascset value for {option}")
+        return self._status(True, 119, "ASC 0 set OK")
+
+    def _setpool(self, param: str) -> str:
+        parts = param.split(",")
+        if len(parts) != 6:
+            return self._status(False, 120, "Invalid setpool parameter")
+        _, password, number, url, user, _ = parts
+        if password != self.web_password:
+            return self._status(False, 45, "Access denied")
+        if not number.isdigit() or int(number) not in self.pools:
+            return self._status(False, 120, f"Invalid pool {number}")
+        self.pools[int(number)] = [url, user]
+        return self._status(True, 119, "success set info")
+
+    def _switchpool(self, param: str) -> str:
+        if not param.isdigit() or int(param) not in self.pools:
+            return self._status(False, 53, f"Invalid pool id {param}")
+        self.active_pool = int(param)
+        return self._status(True, 27, f"Switching to pool {param}")
+
+    def reply(self, request: str) -> str:
+        """Antwort auf eine Anfrage (ohne NUL-Terminator)"""
+        request = request.strip().rstrip("\x00")
+        if request.startswith("{"):
+            # JSON versteht der Simulator nicht -> Textantwort wie ältere Firmware
+            match = re.search(r'"command"\s*:\s*"([^"]*)"', request)
+            request = match.group(1) if match else ""
+        command, _, param = request.partition("|")
+        if command == "ascset":
+            return self._ascset(param)
+        if command == "setpool":
+            return self._setpool(param)
+        if command == "switchpool":
+            return self._switchpool(param)
+        commands = command.split("+")
+        if not all(cmd in self.templates.replies for cmd in commands):
+            return self._status(False, 14, "Invalid command")
+        values = self._values()
+        return "".join(self.templates.replies[cmd].format(**values) for cmd in commands)
+
+    # =========================
+    # Netzwerk
+    # =========================
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.read(4096)
+            roll = self._random.random()
+            if roll < self.drop:
+                self.dropped += 1
+                writer.transport.abort()
+                return
+            if roll < self.drop + self.stall:
+                self.stalled += 1
+                # nie antworten; der Client muss per Deadline abbrechen
+                await reader.read()
+                return
+            delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            writer.write(self.reply(request.decode("utf-8", errors="ignore")).encode() + b"\x00")
+            await writer.drain()
+            self.served += 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 4028) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def start_fleet(
+    count: int = 1,
+    network: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: int = 4028,
+    base_port: Optional[int] = None,
+    templates: Optional[Templates] = None,
+    **options,
+) -> List[Tuple[str, int, SimulatedMiner, asyncio.AbstractServer]]:
+    """Miner starten: je Adresse aus ``network`` auf ``port``, sonst auf ``host`` ab ``base_port``.
+
+    ``options`` gehen an ``SimulatedMiner`` (latency, jitter, drop, stall,
+    seed). Gibt ``(host, port, miner, server)`` je Miner zurück.
+    """
+    templates = templates or Templates()
+    if network is not None:
+        addresses = [(str(address), port) for address in ipaddress.ip_network(network).hosts()][:count or None]
+    else:
+        first = port if base_port is None else base_port
+        addresses = [(host, first + index) for index in range(count)]
+    fleet = []
+    for index, (address, address_port) in enumerate(addresses):
+        miner = SimulatedMiner(templates, index, **options)
+        server = await miner.start(address, address_port)
+        fleet.append((address, address_port, miner, server))
+    return fleet
+
+
+async def close_fleet(fleet: List[Tuple[str, int, SimulatedMiner, asyncio.AbstractServer]]) -> None:
+    for _, _, _, server in fleet:
+        server.close()
+    await asyncio.gather(*(server.wait_closed() for _, _, _, server in fleet))
+
+
+def _raise_fd_limit() -> None:
+    """Ein Listen-Socket je Miner -> Datei-Limit auf das Maximum anheben (wo möglich)"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    _raise_fd_limit()
+    templates = Templates(Path(args.fixtures))
+    fleet = await start_fleet(
+        args.count,
+        network=args.network,
+        host=args.host,
+        port=args.port,
+        base_port=args.base_port,
+        templates=templates,
+        latency=args.latency,
+        jitter=args.jitter,
+        drop=args.drop,
+        stall=args.stall,
+        seed=args.seed,
+        web_password=load("const").DEFAULT_WEB_PASSWORD,
+    )
+    first, last = fleet[0], fleet[-1]
+    print(f"{len(fleet)} miner(s) from {first[0]}:{first[1]} to {last[0]}:{last[1]}")
+    try:
+        while True:
+            await asyncio.sleep(args.report or 3600)
+            if args.report:
+                served = sum(miner.served for _, _, miner, _ in fleet)
+                dropped = sum(miner.dropped for _, _, miner, _ in fleet)
+                stalled = sum(miner.stalled for _, _, miner, _ in fleet)
+                print(f"served={served} dropped={dropped} stalled={stalled}")
+    finally:
+        await close_fleet(fleet)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1, help="Anzahl Miner (bei --network: höchstens)")
+    parser.add_argument("--network", help="je Miner eine Adresse aus diesem Netz, z.B. 127.1.0.0/22")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse ohne --network")
+    parser.add_argument("--port", type=int, default=4028, help="Port (mit --network für alle Miner)")
+    parser.add_argument("--base-port", type=int, help="erster Port ohne --network (je Miner +1)")
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR), help="Verzeichnis mit <cmd>.txt")
+    parser.add_argument("--latency", type=float, default=0.0, help="Antwortverzögerung in s")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± Zufallsanteil der Verzögerung in s")
+    parser.add_argument("--drop", type=float, default=0.0, help="Anteil verworfener Verbindungen (0..1)")
+    parser.add_argument("--stall", type=float, default=0.0, help="Anteil nie beantworteter Anfragen (0..1)")
+    parser.add_argument("--seed", type=int, help="Zufalls-Seed für reproduzierbare Läufe")
+    parser.add_argument("--report", type=float, default=0.0, help="Zähler alle N s ausgeben")
+    args = parser.parse_args()
+    if args.network is not None and args.count == 1:
+        args.count = 0  # ganzes Netz
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()